@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('area', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AreaSnapshot',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('lang', models.CharField(max_length=5)),
+                ('name', models.TextField(blank=True, null=True, default=None)),
+                ('code', models.TextField(blank=True, null=True, default=None)),
+                ('geoname', models.TextField(blank=True, null=True, default=None)),
+                ('object_ref', models.ForeignKey(to='area.Area', related_name='snapshots')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='areasnapshot',
+            unique_together=set([('object_ref', 'lang')]),
+        ),
+    ]
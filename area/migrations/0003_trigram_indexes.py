@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from sfm_pc.indexes import trigram_extension, trigram_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('area', '0002_areasnapshot'),
+    ]
+
+    operations = [
+        trigram_extension(),
+        trigram_index('area_areaname'),
+    ]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+from sfm_pc.indexes import geography_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('area', '0003_trigram_indexes'),
+        ('association', '0002_associationsnapshot'),
+        ('organization', '0003_trigram_indexes'),
+        ('membershipperson', '0002_membershippersonsnapshot'),
+        ('person', '0003_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AreaLink',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('area', models.ForeignKey(to='area.Area', related_name='links')),
+                ('association', models.ForeignKey(to='association.Association', related_name='+')),
+                ('organization', models.ForeignKey(to='organization.Organization', related_name='+')),
+                ('membership', models.ForeignKey(to='membershipperson.MembershipPerson', null=True, related_name='+')),
+                ('person', models.ForeignKey(to='person.Person', null=True, related_name='+')),
+            ],
+        ),
+        geography_index('area_areageometry'),
+    ]
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.contrib.gis.db.models.fields
+
+from sfm_pc.indexes import geography_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('area', '0004_arealink'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AreaShape',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('bbox', django.contrib.gis.db.models.fields.PolygonField(srid=4326)),
+                ('low', django.contrib.gis.db.models.fields.GeometryField(srid=4326, null=True)),
+                ('medium', django.contrib.gis.db.models.fields.GeometryField(srid=4326, null=True)),
+                ('high', django.contrib.gis.db.models.fields.GeometryField(srid=4326, null=True)),
+                ('area', models.OneToOneField(to='area.Area', related_name='shape')),
+                ('geometry', models.ForeignKey(to='area.AreaGeometry', related_name='+')),
+            ],
+        ),
+        geography_index('area_areashape', 'bbox'),
+    ]
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('area', '0005_areashape'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='areasnapshot',
+            name='sortkey_name',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='areasnapshot',
+            name='sortkey_code',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='areasnapshot',
+            index_together=set([('lang', 'sortkey_name', 'object_ref'), ('lang', 'sortkey_code', 'object_ref')]),
+        ),
+    ]
@@ -1,15 +1,33 @@
 from django.contrib.gis.db import models
 from django.utils.translation import ugettext as _
 from django.contrib.gis import geos
-from django.db.models import Max
 
 from complex_fields.model_decorators import (versioned, translated, sourced,
                                              sourced_optional)
 from complex_fields.models import ComplexField, ComplexFieldContainer
 from complex_fields.base_models import BaseModel
+from sfm_pc.managers import ComplexFieldQuerySet
+from sfm_pc.search import Search, SearchMixin, Location, Sort, Term
+from sfm_pc.snapshots import Snapshot, SnapshotMixin
+from sfm_pc.spatial import near_areas
+
+
+class Area(SearchMixin, SnapshotMixin, models.Model, BaseModel):
+    objects = ComplexFieldQuerySet.as_manager()
+
+    search_spec = Search(
+        default_order='name',
+        orderings={
+            'name': Sort('name'),
+            'classification': Sort('code'),
+        },
+        filters=[
+            Term('name', 'areaname__value__icontains'),
+            Term('classification', 'areacode__value'),
+            Location(near_areas),
+        ]
+    )
 
-
-class Area(models.Model, BaseModel):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.name = ComplexFieldContainer(self, AreaName)
@@ -58,61 +76,6 @@ class Area(models.Model, BaseModel):
 
         return (errors, values)
 
-    @classmethod
-    def search(cls, terms):
-        order_by = terms.get('orderby')
-        if not order_by:
-            order_by = 'areaname__value'
-        elif order_by in ['name']:
-            order_by = 'area' + order_by + '__value'
-
-        direction = terms.get('direction')
-        if not direction:
-            direction = 'ASC'
-
-        dirsym = ''
-        if direction == 'DESC':
-            dirsym = '-'
-
-        area_query = (Area.objects
-                      .annotate(Max(order_by))
-                      .order_by(dirsym + order_by + "__max"))
-
-        name = terms.get('name')
-        if name:
-            area_query = area_query.filter(areaname__value__icontains=name)
-
-        code = terms.get('classification')
-        if code:
-            area_query = area_query.filter(areacode__value=code)
-
-        latitude = terms.get('latitude')
-        longitude = terms.get('longitude')
-        if latitude and longitude:
-            try:
-                latitude = float(latitude)
-                longitude = float(longitude)
-            except ValueError:
-                latitude = 0
-                longitude = 0
-
-            point = geos.Point(latitude, longitude)
-            radius = terms.get('radius')
-            if radius:
-                try:
-                    radius = float(radius)
-                except ValueError:
-                    radius = 0
-                area_query = area_query.filter(
-                    areageometry__value__dwithin=(point, radius)
-                )
-            else:
-                area_query = area_query.filter(
-                    areageometry__value__bbcontains=point
-                )
-
-        return area_query
-
 
 @translated
 @versioned
@@ -161,3 +124,53 @@ class Code(models.Model):
 
     def __str__(self):
         return self.value
+
+
+class AreaSnapshot(Snapshot):
+    object_ref = models.ForeignKey('Area', related_name='snapshots')
+    name = models.TextField(default=None, blank=True, null=True)
+    code = models.TextField(default=None, blank=True, null=True)
+    geoname = models.TextField(default=None, blank=True, null=True)
+
+    sortkey_name = models.CharField(max_length=255, null=True)
+    sortkey_code = models.CharField(max_length=255, null=True)
+
+    class Meta:
+        unique_together = ('object_ref', 'lang')
+        index_together = [
+            ('lang', 'sortkey_name', 'object_ref'),
+            ('lang', 'sortkey_code', 'object_ref'),
+        ]
+
+
+class AreaLink(models.Model):
+    """
+    Precomputed Association chain from an area to the organizations active
+    in it and to their members: one row per association without
+    `membership`, plus one per membership of the associated organization.
+    Kept up to date by sfm_pc.spatial; location filters on organizations
+    and persons join this table instead of walking the whole chain.
+    """
+    area = models.ForeignKey('Area', related_name='links')
+    association = models.ForeignKey('association.Association', related_name='+')
+    organization = models.ForeignKey('organization.Organization', related_name='+')
+    membership = models.ForeignKey('membershipperson.MembershipPerson', null=True,
+                                   related_name='+')
+    person = models.ForeignKey('person.Person', null=True, related_name='+')
+
+
+class AreaShape(models.Model):
+    """
+    Bounding box and simplified versions of the current geometry of an
+    area, rebuilt by sfm_pc.spatial whenever the area changes. Maps draw
+    the version matching their zoom (see sfm_pc.spatial.SHAPE_LEVELS) and
+    location filters test the bounding box before the exact geometry.
+    """
+    area = models.OneToOneField('Area', related_name='shape')
+    geometry = models.ForeignKey('AreaGeometry', related_name='+')
+    bbox = models.PolygonField()
+    low = models.GeometryField(null=True)
+    medium = models.GeometryField(null=True)
+    high = models.GeometryField(null=True)
+
+    objects = models.GeoManager()
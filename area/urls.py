@@ -1,13 +1,16 @@
 from django.conf.urls import patterns, url
 
 from .views import (AreaCreate, AreaUpdate, AreaView, area_search,
-                    area_autocomplete, code_autocomplete, area_csv, AreaDelete)
+                    area_autocomplete, code_autocomplete, area_csv, area_tiles,
+                    AreaDelete)
 
 urlpatterns = patterns(
     '',
     url(r'add/$', AreaCreate.as_view(), name='add_area'),
     url(r'search/', area_search, name='area_search'),
     url(r'csv/', area_csv, name='area_csv'),
+    url(r'tiles/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)/$', area_tiles,
+        name='area_tiles'),
     url(r'delete/(?P<pk>\d+)/$',
         AreaDelete.as_view(success_url="/area/"),
         name='delete_area'),
@@ -1,8 +1,5 @@
 import json
-import csv
 
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from django.template.loader import render_to_string
 from django.contrib.admin.util import NestedObjects
 from django.views.generic.edit import DeleteView
 from django.views.generic.base import TemplateView
@@ -13,6 +10,14 @@ from django.db import DEFAULT_DB_ALIAS
 from .models import Area, Code
 from .forms import ZoneForm
 from sfm_pc.utils import deleted_in_str
+from sfm_pc.snapshots import get_snapshots
+from sfm_pc.export import stream_csv
+from sfm_pc.counts import search_count
+from sfm_pc.results import cached_search
+from sfm_pc.pagination import paginate
+from sfm_pc.autocomplete import autocomplete, entity_matches, containing, ranked
+from sfm_pc.vocabulary import vocabulary
+from sfm_pc.tiles import tile_response, area_shapes
 
 
 class AreaDelete(DeleteView):
@@ -39,72 +44,57 @@ class AreaView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super(AreaView, self).get_context_data(**kwargs)
 
-        context['codes'] = Code.objects.all()
+        context['codes'] = vocabulary(Code)
 
         return context
 
 
 def area_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="areas.csv"'
-
     terms = request.GET.dict()
     area_query = Area.search(terms)
 
-    writer = csv.writer(response)
-    for area in area_query:
-        writer.writerow([
-            area.id,
-            area.name.get_value(),
-            area.code.get_value(),
-            area.geoname.get_value(),
-            str(area.geometry.get_value()),
-        ])
+    return stream_csv(area_query, 'areas.csv', [
+        'id', 'name', 'code', 'geoname', 'geometry'
+    ])
+
 
-    return response
+def area_tiles(request, z, x, y):
+    return tile_response(request, Area, area_shapes, z, x, y)
 
 
+@cached_search(Area)
 def area_search(request):
     terms = request.GET.dict()
 
-    page = int(terms.get('page', 1))
     area_query = Area.search(terms)
 
     keys = ['name', 'code']
 
-    paginator = Paginator(area_query, 15)
-    try:
-        area_page = paginator.page(page)
-    except PageNotAnInteger:
-        area_page = paginator.page(1)
-        page = 1
-    except EmptyPage:
-        area_page = paginator.page(paginator.num_pages)
-        page = paginator.num_pages
-
-    areas = [
-        {
+    result_number, estimated = search_count(Area, terms)
+
+    area_page, paging = paginate(area_query, terms, result_number)
+
+    snapshots = get_snapshots(area_page)
+
+    areas = []
+    for area in area_page:
+        snapshot = snapshots[area.id].as_dict()
+        areas.append({
             "id": area.id,
-            "name": str(area.name),
-            "code": str(area.code.get_value()),
-        }
-        for area in area_page
-    ]
-
-    html_paginator = render_to_string(
-        'paginator.html',
-        {'actual': page, 'min': page - 5, 'max': page + 5,
-         'paginator': area_page,
-         'pages': range(1, paginator.num_pages + 1)}
-    )
-
-    return HttpResponse(json.dumps({
+            "name": snapshot['name'],
+            "code": snapshot['code'],
+        })
+
+    response = {
         'success': True,
         'keys': keys,
         'objects': areas,
-        'paginator': html_paginator,
-        'result_number': len(area_query)
-    }))
+        'result_number': result_number,
+        'result_number_estimated': estimated,
+    }
+    response.update(paging)
+
+    return HttpResponse(json.dumps(response))
 
 
 class AreaUpdate(TemplateView):
@@ -173,30 +163,21 @@ class AreaCreate(TemplateView):
 
 
 def area_autocomplete(request):
-    data = request.GET.dict()['term']
-
-    areas = Area.objects.filter(
-        areaname__value__icontains=data
-    )
-
-    areas = [
-        {"value": area.id, "label": _(area.name.get_value())}
-        for area in areas
-    ]
+    def complete(term, limit):
+        return [
+            {"value": snapshot.object_ref_id, "label": snapshot.name or ""}
+            for snapshot in entity_matches(Area, 'name', term, limit)
+        ]
 
-    return HttpResponse(json.dumps(areas))
+    return autocomplete(request, 'area', complete)
 
 
 def code_autocomplete(request):
-    data = request.GET.dict()['term']
-
-    codes = Code.objects.filter(
-        value__icontains=data
-    )
-
-    codes = [
-        {"value": code.id, "label": _(code.value)}
-        for code in codes
-    ]
-
-    return HttpResponse(json.dumps(codes))
+    def complete(term, limit):
+        codes = containing(Code.objects.all(), ['value'], term)
+        return [
+            {"value": code.id, "label": _(code.value)}
+            for code in ranked(codes, 'value', term, limit)
+        ]
+
+    return autocomplete(request, 'code', complete, 'vocabulary')
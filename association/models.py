@@ -1,18 +1,38 @@
 from django.db import models
 from django.utils.translation import ugettext as _
 from django.utils.translation import get_language
-from django.db.models import Max
 
 from django_date_extensions.fields import ApproximateDateField
 
 from complex_fields.model_decorators import versioned, sourced
 from complex_fields.models import ComplexField, ComplexFieldContainer
 from complex_fields.base_models import BaseModel
+from sfm_pc.managers import ComplexFieldQuerySet
+from sfm_pc.dates import NormalizedDate
+from sfm_pc.search import Search, SearchMixin, Dates, Sort, Term
+from sfm_pc.snapshots import Snapshot, SnapshotMixin
 from organization.models import Organization
 from area.models import Area
 
 
-class Association(models.Model, BaseModel):
+class Association(SearchMixin, SnapshotMixin, models.Model, BaseModel):
+    objects = ComplexFieldQuerySet.as_manager()
+
+    search_spec = Search(
+        default_order='startdate',
+        orderings={
+            'startdate': Sort('startdate'),
+            'enddate': Sort('enddate'),
+        },
+        filters=[
+            Dates('startdate', 'associationstartdate'),
+            Dates('enddate', 'associationenddate'),
+            Term('organization', 'associationorganization__value__'
+                                 'organizationname__value__icontains'),
+            Term('area', 'associationarea__value__areaname__value__icontains'),
+        ]
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.startdate = ComplexFieldContainer(self, AssociationStartDate)
@@ -45,80 +65,10 @@ class Association(models.Model, BaseModel):
 
         return (errors, values)
 
-    @classmethod
-    def search(cls, terms):
-        order_by = terms.get('orderby')
-        if not order_by:
-            order_by = 'associationstartdate__value'
-        elif order_by in ['startdate']:
-            order_by = 'association' + order_by + '__value'
-
-        direction = terms.get('direction')
-        if not direction:
-            direction = 'ASC'
-
-        dirsym = ''
-        if direction == 'DESC':
-            dirsym = '-'
-
-        association_query = (Association.objects
-                             .annotate(Max(order_by))
-                             .order_by(dirsym + order_by + "__max"))
-
-        startdate_year = terms.get('startdate_year')
-        if startdate_year:
-            association_query = association_query.filter(
-                associationstartdate__value__startswith=startdate_year
-            )
-
-        startdate_month = terms.get('startdate_month')
-        if startdate_month:
-            association_query = association_query.filter(
-                associationstartdate__value__contains="-" + startdate_month + "-"
-            )
-
-        startdate_day = terms.get('startdate_day')
-        if startdate_day:
-            association_query = association_query.filter(
-                associationstartdate__value__endswith=startdate_day
-            )
-
-        enddate_year = terms.get('enddate_year')
-        if enddate_year:
-            association_query = association_query.filter(
-                associationenddate__value__startswith=enddate_year
-            )
-
-        enddate_month = terms.get('enddate_month')
-        if enddate_month:
-            association_query = association_query.filter(
-                associationenddate__value__contains="-" + enddate_month + "-"
-            )
-
-        enddate_day = terms.get('enddate_day')
-        if enddate_day:
-            association_query = association_query.filter(
-                associationenddate__value__endswith=enddate_day
-            )
-
-        organization = terms.get('organization')
-        if organization:
-            association_query = association_query.filter(
-                associationorganization__value__organizationname__value__icontains=organization
-            )
-
-        area = terms.get('area')
-        if area:
-            association_query = association_query.filter(
-                associationarea__value__areaname__value__icontains=area
-            )
-
-        return association_query
-
 
 @versioned
 @sourced
-class AssociationStartDate(ComplexField):
+class AssociationStartDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey('Association')
     value = ApproximateDateField()
     field_name = _("Start date")
@@ -126,7 +76,7 @@ class AssociationStartDate(ComplexField):
 
 @versioned
 @sourced
-class AssociationEndDate(ComplexField):
+class AssociationEndDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey('Association')
     value = ApproximateDateField(default=None, blank=True, null=True)
     field_name = _("End date")
@@ -145,3 +95,21 @@ class AssociationArea(ComplexField):
     object_ref = models.ForeignKey('Association')
     value = models.ForeignKey(Area)
     field_name = _("Area")
+
+
+class AssociationSnapshot(Snapshot):
+    object_ref = models.ForeignKey('Association', related_name='snapshots')
+    startdate = models.TextField(default=None, blank=True, null=True)
+    enddate = models.TextField(default=None, blank=True, null=True)
+    organization = models.TextField(default=None, blank=True, null=True)
+    area = models.TextField(default=None, blank=True, null=True)
+
+    sortkey_startdate = models.DateField(null=True)
+    sortkey_enddate = models.DateField(null=True)
+
+    class Meta:
+        unique_together = ('object_ref', 'lang')
+        index_together = [
+            ('lang', 'sortkey_startdate', 'object_ref'),
+            ('lang', 'sortkey_enddate', 'object_ref'),
+        ]
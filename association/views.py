@@ -1,17 +1,19 @@
 import json
-import csv
 from datetime import date
 
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.contrib.admin.util import NestedObjects
 from django.views.generic.edit import DeleteView
 from django.views.generic.base import TemplateView
-from django.template.loader import render_to_string
 from django.http import HttpResponse
 from django.db import DEFAULT_DB_ALIAS
 
 from .models import Association
 from sfm_pc.utils import deleted_in_str
+from sfm_pc.snapshots import get_snapshots
+from sfm_pc.export import stream_csv
+from sfm_pc.counts import search_count
+from sfm_pc.results import cached_search
+from sfm_pc.pagination import paginate
 
 
 class AssociationDelete(DeleteView):
@@ -45,69 +47,49 @@ class AssociationView(TemplateView):
 
 
 def association_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="associations.csv"'
-
     terms = request.GET.dict()
     association_query = Association.search(terms)
 
-    writer = csv.writer(response)
-    for association in association_query:
-        writer.writerow([
-            association.id,
-            association.organization.get_value(),
-            association.area.get_value(),
-            repr(association.startdate.get_value()),
-            repr(association.enddate.get_value()),
-        ])
-
-    return response
+    return stream_csv(association_query, 'associations.csv', [
+        'id', 'organization', 'area', 'startdate', 'enddate'
+    ])
 
 
+@cached_search(Association)
 def association_search(request):
     terms = request.GET.dict()
 
-    page = int(terms.get('page', 1))
-
     association_query = Association.search(terms)
 
     keys = ['startdate', 'enddate', 'organization', 'area']
 
-    paginator = Paginator(association_query, 15)
-    try:
-        association_page = paginator.page(page)
-    except PageNotAnInteger:
-        association_page = paginator.page(1)
-        page = 1
-    except EmptyPage:
-        association_page = paginator.page(paginator.num_pages)
-        page = paginator.num_pages
-
-    associations = [
-        {
+    result_number, estimated = search_count(Association, terms)
+
+    association_page, paging = paginate(association_query, terms, result_number)
+
+    snapshots = get_snapshots(association_page)
+
+    associations = []
+    for association in association_page:
+        snapshot = snapshots[association.id].as_dict()
+        associations.append({
             "id": association.id,
-            "organization": str(association.organization),
-            "area": str(association.area),
-            "startdate": str(association.startdate),
-            "enddate": str(association.enddate),
-        }
-        for association in association_page
-    ]
-
-    html_paginator = render_to_string(
-        'paginator.html',
-        {'actual': page, 'min': page - 5, 'max': page + 5,
-         'paginator': association_page,
-         'pages': range(1, paginator.num_pages + 1)}
-    )
-
-    return HttpResponse(json.dumps({
+            "organization": snapshot['organization'],
+            "area": snapshot['area'],
+            "startdate": snapshot['startdate'],
+            "enddate": snapshot['enddate'],
+        })
+
+    response = {
         'success': True,
         'keys': keys,
         'objects': associations,
-        'paginator': html_paginator,
-        'result_number': len(association_query)
-    }))
+        'result_number': result_number,
+        'result_number_estimated': estimated,
+    }
+    response.update(paging)
+
+    return HttpResponse(json.dumps(response))
 
 
 class AssociationUpdate(TemplateView):
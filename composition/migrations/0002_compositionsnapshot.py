@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('composition', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompositionSnapshot',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('lang', models.CharField(max_length=5)),
+                ('parent', models.TextField(blank=True, null=True, default=None)),
+                ('child', models.TextField(blank=True, null=True, default=None)),
+                ('startdate', models.TextField(blank=True, null=True, default=None)),
+                ('enddate', models.TextField(blank=True, null=True, default=None)),
+                ('classification', models.TextField(blank=True, null=True, default=None)),
+                ('object_ref', models.ForeignKey(to='composition.Composition', related_name='snapshots')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='compositionsnapshot',
+            unique_together=set([('object_ref', 'lang')]),
+        ),
+    ]
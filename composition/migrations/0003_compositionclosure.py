@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.contrib.postgres.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('composition', '0002_compositionsnapshot'),
+        ('organization', '0003_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompositionClosure',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('depth', models.PositiveIntegerField()),
+                ('startdate', models.DateField(null=True)),
+                ('enddate', models.DateField(null=True)),
+                ('path', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None)),
+                ('ancestor', models.ForeignKey(to='organization.Organization', related_name='+')),
+                ('descendant', models.ForeignKey(to='organization.Organization', related_name='+')),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='compositionclosure',
+            index_together=set([('ancestor', 'depth'), ('descendant', 'depth')]),
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX composition_compositionclosure_path_gin '
+            'ON composition_compositionclosure USING gin (path)',
+            'DROP INDEX IF EXISTS composition_compositionclosure_path_gin'
+        ),
+    ]
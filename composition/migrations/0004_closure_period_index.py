@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from sfm_pc.indexes import period_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('composition', '0003_compositionclosure'),
+    ]
+
+    operations = [
+        period_index('composition_compositionclosure'),
+    ]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('composition', '0004_closure_period_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='compositionstartdate',
+            name='value_year',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='compositionstartdate',
+            name='value_month',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='compositionstartdate',
+            name='value_day',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='compositionstartdate',
+            name='value_lower',
+            field=models.DateField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='compositionstartdate',
+            name='value_upper',
+            field=models.DateField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='compositionenddate',
+            name='value_year',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='compositionenddate',
+            name='value_month',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='compositionenddate',
+            name='value_day',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='compositionenddate',
+            name='value_lower',
+            field=models.DateField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='compositionenddate',
+            name='value_upper',
+            field=models.DateField(null=True, db_index=True),
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.db import models
+from django.contrib.postgres.fields import ArrayField
 from django.utils.translation import ugettext as _
 from django.utils.translation import get_language
-from django.db.models import Max
 
 from django_date_extensions.fields import ApproximateDateField
 
@@ -9,9 +9,32 @@ from organization.models import Organization, Classification
 from complex_fields.model_decorators import versioned, sourced
 from complex_fields.models import ComplexField, ComplexFieldContainer
 from complex_fields.base_models import BaseModel
+from sfm_pc.managers import ComplexFieldQuerySet
+from sfm_pc.dates import NormalizedDate
+from sfm_pc.search import Search, SearchMixin, Dates, Sort, Term
+from sfm_pc.snapshots import Snapshot, SnapshotMixin
+
+
+class Composition(SearchMixin, SnapshotMixin, models.Model, BaseModel):
+    objects = ComplexFieldQuerySet.as_manager()
+
+    search_spec = Search(
+        default_order='startdate',
+        orderings={
+            'startdate': Sort('startdate'),
+            'enddate': Sort('enddate'),
+        },
+        filters=[
+            Dates('startdate', 'compositionstartdate'),
+            Dates('enddate', 'compositionenddate'),
+            Term('classification', 'compositionclassification__value'),
+            Term('parent', 'compositionparent__value__'
+                           'organizationname__value__icontains'),
+            Term('child', 'compositionchild__value__'
+                          'organizationname__value__icontains'),
+        ]
+    )
 
-
-class Composition(models.Model, BaseModel):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.parent = ComplexFieldContainer(self, CompositionParent)
@@ -50,82 +73,6 @@ class Composition(models.Model, BaseModel):
 
         return (errors, values)
 
-    @classmethod
-    def search(cls, terms):
-        order_by = terms.get('orderby')
-        if not order_by:
-            order_by = 'compositionstartdate__value'
-        elif order_by in ['startdate']:
-            order_by = 'composition' + order_by + '__value'
-
-        direction = terms.get('direction')
-        if not direction:
-            direction = 'ASC'
-
-        dirsym = ''
-        if direction == 'DESC':
-            dirsym = '-'
-
-        composition_query = (Composition.objects
-                             .annotate(Max(order_by))
-                             .order_by(dirsym + order_by + "__max"))
-
-        startdate_year = terms.get('startdate_year')
-        if startdate_year:
-            composition_query = composition_query.filter(
-                compositionstartdate__value__startswith=startdate_year
-            )
-
-        startdate_month = terms.get('startdate_month')
-        if startdate_month:
-            composition_query = composition_query.filter(
-                compositionstartdate__value__contains="-" + startdate_month + "-"
-            )
-
-        startdate_day = terms.get('startdate_day')
-        if startdate_day:
-            composition_query = composition_query.filter(
-                compositionstartdate__value__endswith=startdate_day
-            )
-
-        enddate_year = terms.get('enddate_year')
-        if enddate_year:
-            composition_query = composition_query.filter(
-                compositionenddate__value__startswith=enddate_year
-            )
-
-        enddate_month = terms.get('enddate_month')
-        if enddate_month:
-            composition_query = composition_query.filter(
-                compositionenddate__value__contains="-" + enddate_month + "-"
-            )
-
-        enddate_day = terms.get('enddate_day')
-        if enddate_day:
-            composition_query = composition_query.filter(
-                compositionenddate__value__endswith=enddate_day
-            )
-
-        classification = terms.get('classification')
-        if classification:
-            composition_query = composition_query.filter(
-                compositionclassification__value_id=classification
-            )
-
-        parent = terms.get('parent')
-        if parent:
-            composition_query = composition_query.filter(
-                compositionparent__value__organizationname__value__icontains=parent
-            )
-
-        child = terms.get('child')
-        if child:
-            composition_query = composition_query.filter(
-                compositionchild__value__organizationname__value__icontains=child
-            )
-
-        return composition_query
-
 
 @versioned
 @sourced
@@ -145,7 +92,7 @@ class CompositionChild(ComplexField):
 
 @versioned
 @sourced
-class CompositionStartDate(ComplexField):
+class CompositionStartDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey(Composition)
     value = ApproximateDateField(default=None, blank=True, null=True)
     field_name = _("Start date")
@@ -153,7 +100,7 @@ class CompositionStartDate(ComplexField):
 
 @versioned
 @sourced
-class CompositionEndDate(ComplexField):
+class CompositionEndDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey(Composition)
     value = ApproximateDateField(default=None, blank=True, null=True)
     field_name = _("End date")
@@ -166,3 +113,42 @@ class CompositionClassification(ComplexField):
     value = models.ForeignKey(Classification, default=None, blank=True,
                               null=True)
     field_name = _("Classification")
+
+
+class CompositionSnapshot(Snapshot):
+    object_ref = models.ForeignKey('Composition', related_name='snapshots')
+    parent = models.TextField(default=None, blank=True, null=True)
+    child = models.TextField(default=None, blank=True, null=True)
+    startdate = models.TextField(default=None, blank=True, null=True)
+    enddate = models.TextField(default=None, blank=True, null=True)
+    classification = models.TextField(default=None, blank=True, null=True)
+
+    sortkey_startdate = models.DateField(null=True)
+    sortkey_enddate = models.DateField(null=True)
+
+    class Meta:
+        unique_together = ('object_ref', 'lang')
+        index_together = [
+            ('lang', 'sortkey_startdate', 'object_ref'),
+            ('lang', 'sortkey_enddate', 'object_ref'),
+        ]
+
+
+class CompositionClosure(models.Model):
+    """
+    Transitive closure of the Composition parent -> child links: one row per
+    path from `ancestor` down to `descendant`, `depth` links long, valid
+    from `startdate` to `enddate` (the overlap of the links' approximate
+    dates, None when open). `path` holds the ids of the compositions on the
+    path so a changed composition only rewrites the rows going through it.
+    Kept up to date by sfm_pc.hierarchy.
+    """
+    ancestor = models.ForeignKey(Organization, related_name='+')
+    descendant = models.ForeignKey(Organization, related_name='+')
+    depth = models.PositiveIntegerField()
+    startdate = models.DateField(null=True)
+    enddate = models.DateField(null=True)
+    path = ArrayField(models.IntegerField())
+
+    class Meta:
+        index_together = [('ancestor', 'depth'), ('descendant', 'depth')]
@@ -1,9 +1,6 @@
 import json
-import csv
 from datetime import date
 
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from django.template.loader import render_to_string
 from django.contrib.admin.util import NestedObjects
 from django.views.generic.edit import DeleteView
 from django.views.generic.base import TemplateView
@@ -13,6 +10,12 @@ from django.db import DEFAULT_DB_ALIAS
 from organization.models import Classification
 from composition.models import Composition
 from sfm_pc.utils import deleted_in_str
+from sfm_pc.snapshots import get_snapshots
+from sfm_pc.export import stream_csv
+from sfm_pc.counts import search_count
+from sfm_pc.results import cached_search
+from sfm_pc.pagination import paginate
+from sfm_pc.vocabulary import vocabulary
 
 
 class CompositionDelete(DeleteView):
@@ -39,7 +42,7 @@ class CompositionView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super(CompositionView, self).get_context_data(**kwargs)
 
-        context['classifications'] = Classification.objects.all()
+        context['classifications'] = vocabulary(Classification)
         context['year_range'] = range(1950, date.today().year + 1)
         context['day_range'] = range(1, 32)
 
@@ -47,71 +50,50 @@ class CompositionView(TemplateView):
 
 
 def composition_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="compositions.csv"'
-
     terms = request.GET.dict()
     composition_query = Composition.search(terms)
 
-    writer = csv.writer(response)
-    for composition in composition_query:
-        writer.writerow([
-            composition.id,
-            composition.parent.get_value(),
-            composition.child.get_value(),
-            composition.classification.get_value(),
-            repr(composition.startdate.get_value()),
-            repr(composition.enddate.get_value()),
-        ])
-
-    return response
+    return stream_csv(composition_query, 'compositions.csv', [
+        'id', 'parent', 'child', 'classification', 'startdate', 'enddate'
+    ])
 
 
+@cached_search(Composition)
 def composition_search(request):
     terms = request.GET.dict()
 
     composition_query = Composition.search(terms)
 
-    page = int(terms.get('page', 1))
-
     keys = ['parent', 'child', 'classification', 'startdate', 'enddate']
 
-    paginator = Paginator(composition_query, 15)
-    try:
-        composition_page = paginator.page(page)
-    except PageNotAnInteger:
-        composition_page = paginator.page(1)
-        page = 1
-    except EmptyPage:
-        composition_page = paginator.page(paginator.num_pages)
-        page = paginator.num_pages
-
-    compositions = [
-        {
+    result_number, estimated = search_count(Composition, terms)
+
+    composition_page, paging = paginate(composition_query, terms, result_number)
+
+    snapshots = get_snapshots(composition_page)
+
+    compositions = []
+    for composition in composition_page:
+        snapshot = snapshots[composition.id].as_dict()
+        compositions.append({
             "id": composition.id,
-            "parent": str(composition.parent.get_value()),
-            "child": str(composition.child.get_value()),
-            "classification": str(composition.classification.get_value()),
-            "startdate": str(composition.startdate.get_value()),
-            "enddate": str(composition.enddate.get_value()),
-        }
-        for composition in composition_page
-    ]
-
-    html_paginator = render_to_string(
-        'paginator.html',
-        {'actual': page, 'min': page - 5, 'max': page + 5,
-         'paginator': composition_page,
-         'pages': range(1, paginator.num_pages + 1)}
-    )
-
-    return HttpResponse(json.dumps({
+            "parent": snapshot['parent'],
+            "child": snapshot['child'],
+            "classification": snapshot['classification'],
+            "startdate": snapshot['startdate'],
+            "enddate": snapshot['enddate'],
+        })
+
+    response = {
         'success': True,
         'keys': keys,
         'objects': compositions,
-        'paginator': html_paginator,
-        'result_number': len(composition_query)
-    }))
+        'result_number': result_number,
+        'result_number_estimated': estimated,
+    }
+    response.update(paging)
+
+    return HttpResponse(json.dumps(response))
 
 
 class CompositionUpdate(TemplateView):
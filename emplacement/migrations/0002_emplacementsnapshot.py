@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emplacement', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmplacementSnapshot',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('lang', models.CharField(max_length=5)),
+                ('startdate', models.TextField(blank=True, null=True, default=None)),
+                ('enddate', models.TextField(blank=True, null=True, default=None)),
+                ('organization', models.TextField(blank=True, null=True, default=None)),
+                ('site', models.TextField(blank=True, null=True, default=None)),
+                ('object_ref', models.ForeignKey(to='emplacement.Emplacement', related_name='snapshots')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='emplacementsnapshot',
+            unique_together=set([('object_ref', 'lang')]),
+        ),
+    ]
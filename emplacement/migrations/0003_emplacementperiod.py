@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+from sfm_pc.indexes import period_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emplacement', '0002_emplacementsnapshot'),
+        ('geosite', '0004_geography_index'),
+        ('organization', '0003_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmplacementPeriod',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('startdate', models.DateField(null=True)),
+                ('enddate', models.DateField(null=True)),
+                ('emplacement', models.OneToOneField(to='emplacement.Emplacement', related_name='period')),
+                ('organization', models.ForeignKey(to='organization.Organization', related_name='+')),
+                ('site', models.ForeignKey(to='geosite.Geosite', related_name='+')),
+            ],
+        ),
+        period_index('emplacement_emplacementperiod'),
+    ]
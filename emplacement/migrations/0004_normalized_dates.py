@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emplacement', '0003_emplacementperiod'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emplacementstartdate',
+            name='value_year',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='emplacementstartdate',
+            name='value_month',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='emplacementstartdate',
+            name='value_day',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='emplacementstartdate',
+            name='value_lower',
+            field=models.DateField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='emplacementstartdate',
+            name='value_upper',
+            field=models.DateField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='emplacementenddate',
+            name='value_year',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='emplacementenddate',
+            name='value_month',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='emplacementenddate',
+            name='value_day',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='emplacementenddate',
+            name='value_lower',
+            field=models.DateField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='emplacementenddate',
+            name='value_upper',
+            field=models.DateField(null=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emplacement', '0004_normalized_dates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emplacementsnapshot',
+            name='sortkey_startdate',
+            field=models.DateField(null=True),
+        ),
+        migrations.AddField(
+            model_name='emplacementsnapshot',
+            name='sortkey_enddate',
+            field=models.DateField(null=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='emplacementsnapshot',
+            index_together=set([('lang', 'sortkey_startdate', 'object_ref'), ('lang', 'sortkey_enddate', 'object_ref')]),
+        ),
+    ]
@@ -1,18 +1,38 @@
 from django.db import models
 from django.utils.translation import ugettext as _
 from django.utils.translation import get_language
-from django.db.models import Max
 
 from django_date_extensions.fields import ApproximateDateField
 
 from complex_fields.model_decorators import versioned, sourced
 from complex_fields.models import ComplexField, ComplexFieldContainer
 from complex_fields.base_models import BaseModel
+from sfm_pc.managers import ComplexFieldQuerySet
+from sfm_pc.dates import NormalizedDate
+from sfm_pc.search import Search, SearchMixin, Dates, Sort, Term
+from sfm_pc.snapshots import Snapshot, SnapshotMixin
 from organization.models import Organization
 from geosite.models import Geosite
 
 
-class Emplacement(models.Model, BaseModel):
+class Emplacement(SearchMixin, SnapshotMixin, models.Model, BaseModel):
+    objects = ComplexFieldQuerySet.as_manager()
+
+    search_spec = Search(
+        default_order='startdate',
+        orderings={
+            'startdate': Sort('startdate'),
+            'enddate': Sort('enddate'),
+        },
+        filters=[
+            Dates('startdate', 'emplacementstartdate'),
+            Dates('enddate', 'emplacementenddate'),
+            Term('organization', 'emplacementorganization__value__'
+                                 'organizationname__value__icontains'),
+            Term('site', 'emplacementsite__value__geositename__value__icontains'),
+        ]
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.startdate = ComplexFieldContainer(self, EmplacementStartDate)
@@ -45,80 +65,10 @@ class Emplacement(models.Model, BaseModel):
 
         return (errors, values)
 
-    @classmethod
-    def search(cls, terms):
-        order_by = terms.get('orderby')
-        if not order_by:
-            order_by = 'emplacementstartdate__value'
-        elif order_by in ['startdate']:
-            order_by = 'person' + order_by + '__value'
-
-        direction = terms.get('direction')
-        if not direction:
-            direction = 'ASC'
-
-        dirsym = ''
-        if direction == 'DESC':
-            dirsym = '-'
-
-        emplacement_query = (Emplacement.objects
-                             .annotate(Max(order_by))
-                             .order_by(dirsym + order_by + "__max"))
-
-        startdate_year = terms.get('startdate_year')
-        if startdate_year:
-            emplacement_query = emplacement_query.filter(
-                emplacementstartdate__value__startswith=startdate_year
-            )
-
-        startdate_month = terms.get('startdate_month')
-        if startdate_month:
-            emplacement_query = emplacement_query.filter(
-                emplacementstartdate__value__contains="-" + startdate_month + "-"
-            )
-
-        startdate_day = terms.get('startdate_day')
-        if startdate_day:
-            emplacement_query = emplacement_query.filter(
-                emplacementstartdate__value__endswith=startdate_day
-            )
-
-        enddate_year = terms.get('enddate_year')
-        if enddate_year:
-            emplacement_query = emplacement_query.filter(
-                emplacementenddate__value__startswith=enddate_year
-            )
-
-        enddate_month = terms.get('enddate_month')
-        if enddate_month:
-            emplacement_query = emplacement_query.filter(
-                emplacementenddate__value__contains="-" + enddate_month + "-"
-            )
-
-        enddate_day = terms.get('enddate_day')
-        if enddate_day:
-            emplacement_query = emplacement_query.filter(
-                emplacementenddate__value__endswith=enddate_day
-            )
-
-        organization = terms.get('organization')
-        if organization:
-            emplacement_query = emplacement_query.filter(
-                emplacementorganization__value__organizationname__value__icontains=organization
-            )
-
-        site = terms.get('site')
-        if site:
-            emplacement_query = emplacement_query.filter(
-                emplacementsite__value__geositename__value__icontains=site
-            )
-
-        return emplacement_query
-
 
 @versioned
 @sourced
-class EmplacementStartDate(ComplexField):
+class EmplacementStartDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey('Emplacement')
     value = ApproximateDateField(default=None, blank=True, null=True)
     field_name = _("Start date")
@@ -126,7 +76,7 @@ class EmplacementStartDate(ComplexField):
 
 @versioned
 @sourced
-class EmplacementEndDate(ComplexField):
+class EmplacementEndDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey('Emplacement')
     value = ApproximateDateField(default=None, blank=True, null=True)
     field_name = _("End date")
@@ -145,3 +95,33 @@ class EmplacementSite(ComplexField):
     object_ref = models.ForeignKey('Emplacement')
     value = models.ForeignKey(Geosite)
     field_name = _("Site")
+
+
+class EmplacementSnapshot(Snapshot):
+    object_ref = models.ForeignKey('Emplacement', related_name='snapshots')
+    startdate = models.TextField(default=None, blank=True, null=True)
+    enddate = models.TextField(default=None, blank=True, null=True)
+    organization = models.TextField(default=None, blank=True, null=True)
+    site = models.TextField(default=None, blank=True, null=True)
+
+    sortkey_startdate = models.DateField(null=True)
+    sortkey_enddate = models.DateField(null=True)
+
+    class Meta:
+        unique_together = ('object_ref', 'lang')
+        index_together = [
+            ('lang', 'sortkey_startdate', 'object_ref'),
+            ('lang', 'sortkey_enddate', 'object_ref'),
+        ]
+
+
+class EmplacementPeriod(models.Model):
+    """
+    When `organization` was stationed at `site`, None bounds being open.
+    Kept up to date by sfm_pc.periods.
+    """
+    emplacement = models.OneToOneField('Emplacement', related_name='period')
+    organization = models.ForeignKey(Organization, related_name='+')
+    site = models.ForeignKey(Geosite, related_name='+')
+    startdate = models.DateField(null=True)
+    enddate = models.DateField(null=True)
@@ -1,17 +1,19 @@
 import json
-import csv
 from datetime import date
 
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.contrib.admin.util import NestedObjects
 from django.views.generic.edit import DeleteView
 from django.views.generic.base import TemplateView
-from django.template.loader import render_to_string
 from django.http import HttpResponse
 from django.db import DEFAULT_DB_ALIAS
 
 from .models import Emplacement
 from sfm_pc.utils import deleted_in_str
+from sfm_pc.snapshots import get_snapshots
+from sfm_pc.export import stream_csv
+from sfm_pc.counts import search_count
+from sfm_pc.results import cached_search
+from sfm_pc.pagination import paginate
 
 
 class EmplacementDelete(DeleteView):
@@ -45,68 +47,49 @@ class EmplacementView(TemplateView):
 
 
 def emplacement_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="emplacements.csv"'
-
     terms = request.GET.dict()
     emplacement_query = Emplacement.search(terms)
 
-    writer = csv.writer(response)
-    for emplacement in emplacement_query:
-        writer.writerow([
-            emplacement.id,
-            emplacement.organization.get_value(),
-            emplacement.site.get_value(),
-            repr(emplacement.startdate.get_value()),
-            repr(emplacement.enddate.get_value()),
-        ])
-
-    return response
+    return stream_csv(emplacement_query, 'emplacements.csv', [
+        'id', 'organization', 'site', 'startdate', 'enddate'
+    ])
 
 
+@cached_search(Emplacement)
 def emplacement_search(request):
     terms = request.GET.dict()
 
-    page = int(terms.get('page', 1))
     emplacement_query = Emplacement.search(terms)
 
     keys = ['startdate', 'enddate', 'organization', 'site']
 
-    paginator = Paginator(emplacement_query, 15)
-    try:
-        emplacement_page = paginator.page(page)
-    except PageNotAnInteger:
-        emplacement_page = paginator.page(1)
-        page = 1
-    except EmptyPage:
-        emplacement_page = paginator.page(paginator.num_pages)
-        page = paginator.num_pages
-
-    emplacements = [
-        {
+    result_number, estimated = search_count(Emplacement, terms)
+
+    emplacement_page, paging = paginate(emplacement_query, terms, result_number)
+
+    snapshots = get_snapshots(emplacement_page)
+
+    emplacements = []
+    for emplacement in emplacement_page:
+        snapshot = snapshots[emplacement.id].as_dict()
+        emplacements.append({
             "id": emplacement.id,
-            "organization": str(emplacement.organization.get_value()),
-            "site": str(emplacement.site.get_value()),
-            "startdate": str(emplacement.startdate.get_value()),
-            "enddate": str(emplacement.enddate.get_value()),
-        }
-        for emplacement in emplacement_page
-    ]
-
-    html_paginator = render_to_string(
-        'paginator.html',
-        {'actual': page, 'min': page - 5, 'max': page + 5,
-         'paginator': emplacement_page,
-         'pages': range(1, paginator.num_pages + 1)}
-    )
-
-    return HttpResponse(json.dumps({
+            "organization": snapshot['organization'],
+            "site": snapshot['site'],
+            "startdate": snapshot['startdate'],
+            "enddate": snapshot['enddate'],
+        })
+
+    response = {
         'success': True,
         'keys': keys,
         'objects': emplacements,
-        'paginator': html_paginator,
-        'result_number': len(emplacement_query)
-    }))
+        'result_number': result_number,
+        'result_number_estimated': estimated,
+    }
+    response.update(paging)
+
+    return HttpResponse(json.dumps(response))
 
 
 class EmplacementUpdate(TemplateView):
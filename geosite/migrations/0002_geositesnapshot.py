@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geosite', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeositeSnapshot',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('lang', models.CharField(max_length=5)),
+                ('name', models.TextField(blank=True, null=True, default=None)),
+                ('adminlevel1', models.TextField(blank=True, null=True, default=None)),
+                ('adminlevel2', models.TextField(blank=True, null=True, default=None)),
+                ('coordinates', models.TextField(blank=True, null=True, default=None)),
+                ('geoname', models.TextField(blank=True, null=True, default=None)),
+                ('geonameid', models.TextField(blank=True, null=True, default=None)),
+                ('object_ref', models.ForeignKey(to='geosite.Geosite', related_name='snapshots')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='geositesnapshot',
+            unique_together=set([('object_ref', 'lang')]),
+        ),
+    ]
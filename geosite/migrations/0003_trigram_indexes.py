@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from sfm_pc.indexes import trigram_extension, trigram_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geosite', '0002_geositesnapshot'),
+    ]
+
+    operations = [
+        trigram_extension(),
+        trigram_index('geosite_geositename'),
+        trigram_index('geosite_geositeadminlevel1'),
+        trigram_index('geosite_geositeadminlevel2'),
+        trigram_index('geosite_geositegeoname'),
+    ]
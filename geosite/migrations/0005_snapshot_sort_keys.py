@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geosite', '0004_geography_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='geositesnapshot',
+            name='sortkey_name',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='geositesnapshot',
+            name='sortkey_adminlevel1',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='geositesnapshot',
+            name='sortkey_adminlevel2',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='geositesnapshot',
+            index_together=set([('lang', 'sortkey_name', 'object_ref'), ('lang', 'sortkey_adminlevel1', 'object_ref'), ('lang', 'sortkey_adminlevel2', 'object_ref')]),
+        ),
+    ]
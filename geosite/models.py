@@ -3,15 +3,37 @@ import json
 from django.contrib.gis.db import models
 
 from django.utils.translation import ugettext as _
-from django.db.models import Max
 from django.contrib.gis import geos
 
 from complex_fields.model_decorators import versioned, translated, sourced
 from complex_fields.models import ComplexField, ComplexFieldContainer
 from complex_fields.base_models import BaseModel
+from sfm_pc.managers import ComplexFieldQuerySet
+from sfm_pc.search import Search, SearchMixin, Location, Sort, Term
+from sfm_pc.snapshots import Snapshot, SnapshotMixin
+from sfm_pc.spatial import near
+
+
+class Geosite(SearchMixin, SnapshotMixin, models.Model, BaseModel):
+    objects = ComplexFieldQuerySet.as_manager()
+
+    search_spec = Search(
+        default_order='name',
+        orderings={
+            'name': Sort('name'),
+            'adminlevel1': Sort('adminlevel1'),
+            'adminlevel2': Sort('adminlevel2'),
+        },
+        filters=[
+            Term('name', 'geositename__value__icontains'),
+            Term('adminlevel1', 'geositeadminlevel1__value__icontains'),
+            Term('adminlevel2', 'geositeadminlevel2__value__icontains'),
+            Location(lambda location: near(GeositeCoordinates, location)),
+            Term('geoname', 'geositegeoname__value__icontains'),
+            Term('geonameid', 'geositegeonameid__value'),
+        ]
+    )
 
-
-class Geosite(models.Model, BaseModel):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.name = ComplexFieldContainer(self, GeositeName)
@@ -51,73 +73,6 @@ class Geosite(models.Model, BaseModel):
 
         return (errors, values)
 
-    @classmethod
-    def search(cls, terms):
-        order_by = terms.get('orderby')
-        if not order_by:
-            order_by = 'geositename__value'
-        elif order_by in ['name']:
-            order_by = 'geosite' + order_by + '__value'
-
-        direction = terms.get('direction')
-        if not direction:
-            direction = 'ASC'
-
-        dirsym = ''
-        if direction == 'DESC':
-            dirsym = '-'
-
-        geosite_query = (Geosite.objects
-                         .annotate(Max(order_by))
-                         .order_by(dirsym + order_by + "__max"))
-
-        name = terms.get('name')
-        if name:
-            geosite_query = geosite_query.filter(geositename__value__icontains=name)
-
-        admin1 = terms.get('adminlevel1')
-        if admin1:
-            geosite_query = geosite_query.filter(geositeadminlevel1__value__icontains=admin1)
-
-        admin2 = terms.get('adminlevel2')
-        if admin2:
-            geosite_query = geosite_query.filter(geositeadminlevel2__value__icontains=admin2)
-
-        latitude = terms.get('latitude')
-        longitude = terms.get('longitude')
-        if latitude and longitude:
-            try:
-                latitude = float(latitude)
-                longitude = float(longitude)
-            except ValueError:
-                latitude = 0
-                longitude = 0
-
-            point = geos.Point(latitude, longitude)
-            radius = terms.get('radius')
-            if radius:
-                try:
-                    radius = float(radius)
-                except ValueError:
-                    radius = 0
-                geosite_query = geosite_query.filter(
-                    geositecoordinates__value__dwithin=(point, radius)
-                )
-            else:
-                geosite_query = geosite_query.filter(
-                    geositecoordinates__value__bbcontains=point
-                )
-
-        geoname = terms.get('geoname')
-        if geoname:
-            geosite_query = geosite_query.filter(geositegeoname__value__icontains=geoname)
-
-        geonameid = terms.get('geonameid')
-        if geonameid:
-            geosite_query = geosite_query.filter(geositegeonameid__value=geonameid)
-
-        return geosite_query
-
 
 @translated
 @versioned
@@ -167,3 +122,25 @@ class GeositeGeonameId(ComplexField):
     object_ref = models.ForeignKey('Geosite')
     value = models.TextField(default=None, blank=True, null=True)
     field_name = _("GeoName ID")
+
+
+class GeositeSnapshot(Snapshot):
+    object_ref = models.ForeignKey('Geosite', related_name='snapshots')
+    name = models.TextField(default=None, blank=True, null=True)
+    adminlevel1 = models.TextField(default=None, blank=True, null=True)
+    adminlevel2 = models.TextField(default=None, blank=True, null=True)
+    coordinates = models.TextField(default=None, blank=True, null=True)
+    geoname = models.TextField(default=None, blank=True, null=True)
+    geonameid = models.TextField(default=None, blank=True, null=True)
+
+    sortkey_name = models.CharField(max_length=255, null=True)
+    sortkey_adminlevel1 = models.CharField(max_length=255, null=True)
+    sortkey_adminlevel2 = models.CharField(max_length=255, null=True)
+
+    class Meta:
+        unique_together = ('object_ref', 'lang')
+        index_together = [
+            ('lang', 'sortkey_name', 'object_ref'),
+            ('lang', 'sortkey_adminlevel1', 'object_ref'),
+            ('lang', 'sortkey_adminlevel2', 'object_ref'),
+        ]
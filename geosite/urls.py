@@ -1,13 +1,15 @@
 from django.conf.urls import patterns, url
 
 from .views import (SiteCreate, SiteUpdate, SiteView, site_search, site_autocomplete,
-                    geosite_csv, GeositeDelete)
+                    geosite_csv, geosite_tiles, GeositeDelete)
 
 urlpatterns = patterns(
     '',
     url(r'add/$', SiteCreate.as_view(), name='add_site'),
     url(r'search/', site_search, name='site_search'),
     url(r'csv/', geosite_csv, name='geosite_csv'),
+    url(r'tiles/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)/$', geosite_tiles,
+        name='geosite_tiles'),
     url(r'delete/(?P<pk>\d+)/$',
         GeositeDelete.as_view(success_url="/geosite/"),
         name='delete_geosite'),
@@ -1,18 +1,21 @@
 import json
-import csv
 
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.contrib.admin.util import NestedObjects
 from django.views.generic.edit import DeleteView
 from django.views.generic.base import TemplateView
-from django.utils.translation import ugettext as _
-from django.template.loader import render_to_string
 from django.http import HttpResponse
 from django.db import DEFAULT_DB_ALIAS
 
 from .forms import ZoneForm
-from .models import Geosite
+from .models import Geosite, GeositeCoordinates
 from sfm_pc.utils import deleted_in_str
+from sfm_pc.snapshots import get_snapshots
+from sfm_pc.export import stream_csv
+from sfm_pc.counts import search_count
+from sfm_pc.results import cached_search
+from sfm_pc.pagination import paginate
+from sfm_pc.autocomplete import autocomplete, entity_matches
+from sfm_pc.tiles import tile_response, clusters
 
 
 class GeositeDelete(DeleteView):
@@ -41,69 +44,56 @@ class SiteView(TemplateView):
 
 
 def geosite_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="geosites.csv"'
-
     terms = request.GET.dict()
     geosite_query = Geosite.search(terms)
 
-    writer = csv.writer(response)
-    for geosite in geosite_query:
-        writer.writerow([
-            geosite.id,
-            geosite.name.get_value(),
-            geosite.adminlevel1.get_value(),
-            geosite.adminlevel2.get_value(),
-            geosite.geoname.get_value(),
-            geosite.geonameid.get_value(),
-            str(geosite.coordinates.get_value())
-        ])
+    return stream_csv(geosite_query, 'geosites.csv', [
+        'id', 'name', 'adminlevel1', 'adminlevel2', 'geoname', 'geonameid',
+        'coordinates'
+    ])
+
+
+def geosite_tiles(request, z, x, y):
+    def features(object_ids, z, x, y):
+        return clusters(GeositeCoordinates, object_ids, z, x, y)
 
-    return response
+    return tile_response(request, Geosite, features, z, x, y)
 
 
+@cached_search(Geosite)
 def site_search(request):
     terms = request.GET.dict()
 
-    page = int(terms.get('page', 1))
     geosite_query = Geosite.search(terms)
 
     keys = ['name', 'geoname', 'geonameid']
 
-    paginator = Paginator(geosite_query, 15)
-    try:
-        geosite_page = paginator.page(page)
-    except PageNotAnInteger:
-        geosite_page = paginator.page(1)
-        page = 1
-    except EmptyPage:
-        geosite_page = paginator.page(paginator.num_pages)
-        page = paginator.num_pages
-
-    geosites = [
-        {
+    result_number, estimated = search_count(Geosite, terms)
+
+    geosite_page, paging = paginate(geosite_query, terms, result_number)
+
+    snapshots = get_snapshots(geosite_page)
+
+    geosites = []
+    for geosite in geosite_page:
+        snapshot = snapshots[geosite.id].as_dict()
+        geosites.append({
             "id": geosite.id,
-            "name": str(geosite.name.get_value()),
-            "geoname": str(geosite.geoname.get_value()),
-            "geonameid": str(geosite.geonameid.get_value()),
-        }
-        for geosite in geosite_page
-    ]
-
-    html_paginator = render_to_string(
-        'paginator.html',
-        {'actual': page, 'min': page - 5, 'max': page + 5,
-         'paginator': geosite_page,
-         'pages': range(1, paginator.num_pages + 1)}
-    )
-
-    return HttpResponse(json.dumps({
+            "name": snapshot['name'],
+            "geoname": snapshot['geoname'],
+            "geonameid": snapshot['geonameid'],
+        })
+
+    response = {
         'success': True,
         'keys': keys,
         'objects': geosites,
-        'paginator': html_paginator,
-        'result_number': len(geosite_query)
-    }))
+        'result_number': result_number,
+        'result_number_estimated': estimated,
+    }
+    response.update(paging)
+
+    return HttpResponse(json.dumps(response))
 
 
 class SiteUpdate(TemplateView):
@@ -170,15 +160,10 @@ class SiteCreate(TemplateView):
 
 
 def site_autocomplete(request):
-    data = request.GET.dict()['term']
-
-    sites = Geosite.objects.filter(
-        geositename__value__icontains=data
-    )
-
-    sites = [
-        {"value": site.id, "label": _(site.name.get_value())}
-        for site in sites
-    ]
+    def complete(term, limit):
+        return [
+            {"value": snapshot.object_ref_id, "label": snapshot.name or ""}
+            for snapshot in entity_matches(Geosite, 'name', term, limit)
+        ]
 
-    return HttpResponse(json.dumps(sites))
+    return autocomplete(request, 'site', complete)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membershipperson', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MembershipPersonSnapshot',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('lang', models.CharField(max_length=5)),
+                ('member', models.TextField(blank=True, null=True, default=None)),
+                ('organization', models.TextField(blank=True, null=True, default=None)),
+                ('role', models.TextField(blank=True, null=True, default=None)),
+                ('title', models.TextField(blank=True, null=True, default=None)),
+                ('rank', models.TextField(blank=True, null=True, default=None)),
+                ('realstart', models.TextField(blank=True, null=True, default=None)),
+                ('realend', models.TextField(blank=True, null=True, default=None)),
+                ('startcontext', models.TextField(blank=True, null=True, default=None)),
+                ('endcontext', models.TextField(blank=True, null=True, default=None)),
+                ('firstciteddate', models.TextField(blank=True, null=True, default=None)),
+                ('lastciteddate', models.TextField(blank=True, null=True, default=None)),
+                ('object_ref', models.ForeignKey(to='membershipperson.MembershipPerson', related_name='snapshots')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='membershippersonsnapshot',
+            unique_together=set([('object_ref', 'lang')]),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+from sfm_pc.indexes import period_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membershipperson', '0002_membershippersonsnapshot'),
+        ('organization', '0003_trigram_indexes'),
+        ('person', '0003_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MembershipPeriod',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('startdate', models.DateField(null=True)),
+                ('enddate', models.DateField(null=True)),
+                ('membership', models.OneToOneField(to='membershipperson.MembershipPerson', related_name='period')),
+                ('organization', models.ForeignKey(to='organization.Organization', related_name='+')),
+                ('person', models.ForeignKey(to='person.Person', related_name='+')),
+                ('role', models.ForeignKey(to='membershipperson.Role', null=True, related_name='+')),
+            ],
+        ),
+        period_index('membershipperson_membershipperiod'),
+    ]
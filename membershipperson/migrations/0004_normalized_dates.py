@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membershipperson', '0003_membershipperiod'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='membershippersonfirstciteddate',
+            name='value_year',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonfirstciteddate',
+            name='value_month',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonfirstciteddate',
+            name='value_day',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonfirstciteddate',
+            name='value_lower',
+            field=models.DateField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonfirstciteddate',
+            name='value_upper',
+            field=models.DateField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonlastciteddate',
+            name='value_year',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonlastciteddate',
+            name='value_month',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonlastciteddate',
+            name='value_day',
+            field=models.PositiveSmallIntegerField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonlastciteddate',
+            name='value_lower',
+            field=models.DateField(null=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonlastciteddate',
+            name='value_upper',
+            field=models.DateField(null=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membershipperson', '0004_normalized_dates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='membershippersonsnapshot',
+            name='sortkey_role',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonsnapshot',
+            name='sortkey_title',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonsnapshot',
+            name='sortkey_rank',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonsnapshot',
+            name='sortkey_firstciteddate',
+            field=models.DateField(null=True),
+        ),
+        migrations.AddField(
+            model_name='membershippersonsnapshot',
+            name='sortkey_lastciteddate',
+            field=models.DateField(null=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='membershippersonsnapshot',
+            index_together=set([('lang', 'sortkey_role', 'object_ref'), ('lang', 'sortkey_title', 'object_ref'), ('lang', 'sortkey_rank', 'object_ref'), ('lang', 'sortkey_firstciteddate', 'object_ref'), ('lang', 'sortkey_lastciteddate', 'object_ref')]),
+        ),
+    ]
@@ -1,7 +1,6 @@
 from django.db import models
 from django.utils.translation import ugettext as _
 from django.utils.translation import get_language
-from django.db.models import Max
 
 from django_date_extensions.fields import ApproximateDateField
 
@@ -9,11 +8,36 @@ from complex_fields.model_decorators import (versioned, translated, sourced,
                                              sourced_optional)
 from complex_fields.models import ComplexField, ComplexFieldContainer
 from complex_fields.base_models import BaseModel
+from sfm_pc.managers import ComplexFieldQuerySet
+from sfm_pc.dates import NormalizedDate
+from sfm_pc.search import Search, SearchMixin, Dates, Sort, Term
+from sfm_pc.snapshots import Snapshot, SnapshotMixin
+from sfm_pc.vocabulary import vocabulary
 from person.models import Person
 from organization.models import Organization
 
 
-class MembershipPerson(models.Model, BaseModel):
+class MembershipPerson(SearchMixin, SnapshotMixin, models.Model, BaseModel):
+    objects = ComplexFieldQuerySet.as_manager()
+
+    search_spec = Search(
+        default_order='role',
+        orderings={
+            'role': Sort('role'),
+            'title': Sort('title'),
+            'rank': Sort('rank'),
+            'firstciteddate': Sort('firstciteddate'),
+            'lastciteddate': Sort('lastciteddate'),
+        },
+        filters=[
+            Term('role', 'membershippersonrole__value'),
+            Term('rank', 'membershippersonrank__value'),
+            Term('title', 'membershippersontitle__value'),
+            Dates('startdate', 'membershippersonfirstciteddate'),
+            Dates('enddate', 'membershippersonlastciteddate'),
+        ]
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.member = ComplexFieldContainer(self, MembershipPersonMember)
@@ -80,76 +104,6 @@ class MembershipPerson(models.Model, BaseModel):
         membership.update(dict_values, lang)
         return membership
 
-    @classmethod
-    def search(cls, terms):
-        order_by = terms.get('orderby')
-        if not order_by:
-            order_by = 'membershippersonrole__value'
-        elif order_by in ['title']:
-            order_by = 'membershipperson' + order_by + '__value'
-
-        direction = terms.get('direction')
-        if not direction:
-            direction = 'ASC'
-
-        dirsym = ''
-        if direction == 'DESC':
-            dirsym = '-'
-
-        membership_query = (MembershipPerson.objects
-                            .annotate(Max(order_by))
-                            .order_by(dirsym + order_by + "__max"))
-
-        role = terms.get("role")
-        if role:
-            membership_query = membership_query.filter(membershiprole__value=role)
-
-        rank = terms.get("rank")
-        if rank:
-            membership_query = membership_query.filter(membershiprank__value=rank)
-
-        title = terms.get("title")
-        if title:
-            membership_query = membership_query.filter(membershiptitle__value=title)
-
-        startdate_year = terms.get('startdate_year')
-        if startdate_year:
-            membership_query = membership_query.filter(
-                membershipfirstciteddate__value__startswith=startdate_year
-            )
-
-        startdate_month = terms.get('startdate_month')
-        if startdate_month:
-            membership_query = membership_query.filter(
-                membershipfirstciteddate__value__contains="-" + startdate_month + "-"
-            )
-
-        startdate_day = terms.get('startdate_day')
-        if startdate_day:
-            membership_query = membership_query.filter(
-                membershipfirstciteddate__value__endswith=startdate_day
-            )
-
-        enddate_year = terms.get('enddate_year')
-        if enddate_year:
-            membership_query = membership_query.filter(
-                membershiplastciteddate__value__startswith=enddate_year
-            )
-
-        enddate_month = terms.get('enddate_month')
-        if enddate_month:
-            membership_query = membership_query.filter(
-                membershiplastciteddate__value__contains="-" + enddate_month + "-"
-            )
-
-        enddate_day = terms.get('enddate_day')
-        if enddate_day:
-            membership_query = membership_query.filter(
-                membershiplastciteddate__value__endswith=enddate_day
-            )
-
-        return membership_query
-
 
 @versioned
 @sourced
@@ -194,7 +148,7 @@ class MembershipPersonRank(ComplexField):
 
 @versioned
 @sourced
-class MembershipPersonFirstCitedDate(ComplexField):
+class MembershipPersonFirstCitedDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey('MembershipPerson')
     value = ApproximateDateField()
     field_name = _("First cited date")
@@ -202,7 +156,7 @@ class MembershipPersonFirstCitedDate(ComplexField):
 
 @versioned
 @sourced
-class MembershipPersonLastCitedDate(ComplexField):
+class MembershipPersonLastCitedDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey('MembershipPerson')
     value = ApproximateDateField()
     field_name = _("Last cited date")
@@ -245,10 +199,9 @@ class Role(models.Model):
 
     @classmethod
     def get_role_list(cls):
-        roles = cls.objects.all()
         roles = [
             role.value
-            for role in roles
+            for role in vocabulary(cls)
         ]
 
         return roles
@@ -269,3 +222,48 @@ class Context(models.Model):
 
     def __str__(self):
         return self.value
+
+
+class MembershipPersonSnapshot(Snapshot):
+    object_ref = models.ForeignKey('MembershipPerson', related_name='snapshots')
+    member = models.TextField(default=None, blank=True, null=True)
+    organization = models.TextField(default=None, blank=True, null=True)
+    role = models.TextField(default=None, blank=True, null=True)
+    title = models.TextField(default=None, blank=True, null=True)
+    rank = models.TextField(default=None, blank=True, null=True)
+    realstart = models.TextField(default=None, blank=True, null=True)
+    realend = models.TextField(default=None, blank=True, null=True)
+    startcontext = models.TextField(default=None, blank=True, null=True)
+    endcontext = models.TextField(default=None, blank=True, null=True)
+    firstciteddate = models.TextField(default=None, blank=True, null=True)
+    lastciteddate = models.TextField(default=None, blank=True, null=True)
+
+    sortkey_role = models.CharField(max_length=255, null=True)
+    sortkey_title = models.CharField(max_length=255, null=True)
+    sortkey_rank = models.CharField(max_length=255, null=True)
+    sortkey_firstciteddate = models.DateField(null=True)
+    sortkey_lastciteddate = models.DateField(null=True)
+
+    class Meta:
+        unique_together = ('object_ref', 'lang')
+        index_together = [
+            ('lang', 'sortkey_role', 'object_ref'),
+            ('lang', 'sortkey_title', 'object_ref'),
+            ('lang', 'sortkey_rank', 'object_ref'),
+            ('lang', 'sortkey_firstciteddate', 'object_ref'),
+            ('lang', 'sortkey_lastciteddate', 'object_ref'),
+        ]
+
+
+class MembershipPeriod(models.Model):
+    """
+    When `person` was in `organization` (with `role`): from the first day
+    of the first cited date to the last day of the last cited one, None
+    when open. Kept up to date by sfm_pc.periods.
+    """
+    membership = models.OneToOneField('MembershipPerson', related_name='period')
+    person = models.ForeignKey(Person, related_name='+')
+    organization = models.ForeignKey(Organization, related_name='+')
+    role = models.ForeignKey('Role', null=True, related_name='+')
+    startdate = models.DateField(null=True)
+    enddate = models.DateField(null=True)
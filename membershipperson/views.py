@@ -1,19 +1,23 @@
 import json
-import csv
 
 from datetime import date
 
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.views.generic.base import TemplateView
 from django.views.generic.edit import DeleteView
 from django.contrib.admin.util import NestedObjects
 from django.utils.translation import ugettext as _
-from django.template.loader import render_to_string
 from django.http import HttpResponse
 from django.db import DEFAULT_DB_ALIAS
 
 from .models import MembershipPerson, Role, Rank
 from sfm_pc.utils import deleted_in_str
+from sfm_pc.snapshots import get_snapshots
+from sfm_pc.export import stream_csv
+from sfm_pc.counts import search_count
+from sfm_pc.results import cached_search
+from sfm_pc.pagination import paginate
+from sfm_pc.autocomplete import autocomplete, containing, ranked
+from sfm_pc.vocabulary import vocabulary
 
 
 class MembershipPersonDelete(DeleteView):
@@ -40,8 +44,8 @@ class MembershipPersonView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super(MembershipPersonView, self).get_context_data(**kwargs)
 
-        context['roles'] = Role.objects.all()
-        context['ranks'] = Rank.objects.all()
+        context['roles'] = vocabulary(Role)
+        context['ranks'] = vocabulary(Rank)
         context['year_range'] = range(1950, date.today().year + 1)
         context['day_range'] = range(1, 32)
 
@@ -49,73 +53,51 @@ class MembershipPersonView(TemplateView):
 
 
 def membership_person_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="memberships.csv"'
-
     terms = request.GET.dict()
     membership_query = MembershipPerson.search(terms)
 
-    writer = csv.writer(response)
-    for membership in membership_query:
-        writer.writerow([
-            membership.member.get_value(),
-            membership.role.get_value(),
-            membership.rank.get_value(),
-            membership.title.get_value(),
-            repr(membership.firstciteddate.get_value()),
-            repr(membership.lastciteddate.get_value()),
-            membership.realstart.get_value(),
-            membership.realend.get_value(),
-        ])
-
-    return response
+    return stream_csv(membership_query, 'memberships.csv', [
+        'member', 'role', 'rank', 'title', 'firstciteddate', 'lastciteddate',
+        'realstart', 'realend'
+    ])
 
 
+@cached_search(MembershipPerson)
 def membership_person_search(request):
     terms = request.GET.dict()
 
     membership_query = MembershipPerson.search(terms)
 
-    page = int(terms.get('page', 1))
-
     keys = ['role', 'title', 'rank', 'firstciteddate', 'lastciteddate']
 
-    paginator = Paginator(membership_query, 15)
-    try:
-        membership_page = paginator.page(page)
-    except PageNotAnInteger:
-        membership_page = paginator.page(1)
-        page = 1
-    except EmptyPage:
-        membership_page = paginator.page(paginator.num_pages)
-        page = paginator.num_pages
-
-    memberships = [
-        {
+    result_number, estimated = search_count(MembershipPerson, terms)
+
+    membership_page, paging = paginate(membership_query, terms, result_number)
+
+    snapshots = get_snapshots(membership_page)
+
+    memberships = []
+    for membership in membership_page:
+        snapshot = snapshots[membership.id].as_dict()
+        memberships.append({
             "id": membership.id,
-            "role": str(membership.role.get_value()),
-            "title": str(membership.title.get_value()),
-            "rank": str(membership.rank.get_value()),
-            "firstciteddate": str(membership.firstciteddate.get_value()),
-            "lastciteddate": str(membership.lastciteddate.get_value()),
-        }
-        for membership in membership_page
-    ]
-
-    html_paginator = render_to_string(
-        'paginator.html',
-        {'actual': page, 'min': page - 5, 'max': page + 5,
-         'paginator': membership_page,
-         'pages': range(1, paginator.num_pages + 1)}
-    )
-
-    return HttpResponse(json.dumps({
+            "role": snapshot['role'],
+            "title": snapshot['title'],
+            "rank": snapshot['rank'],
+            "firstciteddate": snapshot['firstciteddate'],
+            "lastciteddate": snapshot['lastciteddate'],
+        })
+
+    response = {
         'success': True,
         'keys': keys,
         'objects': memberships,
-        'paginator': html_paginator,
-        'result_number': len(membership_query)
-    }))
+        'result_number': result_number,
+        'result_number_estimated': estimated,
+    }
+    response.update(paging)
+
+    return HttpResponse(json.dumps(response))
 
 
 class MembershipPersonUpdate(TemplateView):
@@ -171,39 +153,35 @@ class MembershipPersonCreate(TemplateView):
     def get_context_data(self, **kwargs):
         context = super(MembershipPersonCreate, self).get_context_data(**kwargs)
         context['membership'] = MembershipPerson()
-        context['roles'] = Role.objects.all()
-        context['ranks'] = Rank.objects.all()
+        context['roles'] = vocabulary(Role)
+        context['ranks'] = vocabulary(Rank)
 
         return context
 
 
 def rank_autocomplete(request):
-    term = request.GET.dict().get('term')
-
-    ranks = Rank.objects.filter(value__icontains=term)
-
-    ranks = [
-        {
-            'label': _(rank.value),
-            'value': str(rank.id)
-        }
-        for rank in ranks
-    ]
+    def complete(term, limit):
+        ranks = containing(Rank.objects.all(), ['value'], term)
+        return [
+            {
+                'label': _(rank.value),
+                'value': str(rank.id)
+            }
+            for rank in ranked(ranks, 'value', term, limit)
+        ]
 
-    return HttpResponse(json.dumps(ranks))
+    return autocomplete(request, 'rank', complete, 'vocabulary')
 
 
 def role_autocomplete(request):
-    term = request.GET.dict().get('term')
-
-    roles = Role.objects.filter(value__icontains=term)
-
-    roles = [
-        {
-            'label': _(role.value),
-            'value': str(role.id)
-        }
-        for role in roles
-    ]
-
-    return HttpResponse(json.dumps(roles))
+    def complete(term, limit):
+        roles = containing(Role.objects.all(), ['value'], term)
+        return [
+            {
+                'label': _(role.value),
+                'value': str(role.id)
+            }
+            for role in ranked(roles, 'value', term, limit)
+        ]
+
+    return autocomplete(request, 'role', complete, 'vocabulary')
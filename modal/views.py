@@ -1,6 +1,7 @@
 from django.views.generic.base import TemplateView
 
 from complex_fields.models import ComplexFieldContainer
+from sfm_pc.history import FieldHistory
 
 
 class SourceView(TemplateView):
@@ -52,7 +53,12 @@ class VersionView(TemplateView):
         )
 
         context['field'] = field
-        context['history'] = field.get_history_for_lang()
-        context['langs'] = field.get_langs_in_history()
+        # The versions themselves are fetched page by page by version.js
+        context['langs'] = FieldHistory(
+            context.get('object_type'),
+            context.get('object_id'),
+            context.get('field_name'),
+            context.get('field_id', None)
+        ).langs()
 
         return context
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationSnapshot',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('lang', models.CharField(max_length=5)),
+                ('name', models.TextField(blank=True, null=True, default=None)),
+                ('alias', models.TextField(blank=True, null=True, default=None)),
+                ('classification', models.TextField(blank=True, null=True, default=None)),
+                ('foundingdate', models.TextField(blank=True, null=True, default=None)),
+                ('dissolutiondate', models.TextField(blank=True, null=True, default=None)),
+                ('realfounding', models.TextField(blank=True, null=True, default=None)),
+                ('realdissolution', models.TextField(blank=True, null=True, default=None)),
+                ('object_ref', models.ForeignKey(to='organization.Organization', related_name='snapshots')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='organizationsnapshot',
+            unique_together=set([('object_ref', 'lang')]),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0004_normalized_dates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organizationsnapshot',
+            name='sortkey_name',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='organizationsnapshot',
+            name='sortkey_alias',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='organizationsnapshot',
+            name='sortkey_classification',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='organizationsnapshot',
+            name='sortkey_foundingdate',
+            field=models.DateField(null=True),
+        ),
+        migrations.AddField(
+            model_name='organizationsnapshot',
+            name='sortkey_dissolutiondate',
+            field=models.DateField(null=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='organizationsnapshot',
+            index_together=set([('lang', 'sortkey_name', 'object_ref'), ('lang', 'sortkey_alias', 'object_ref'), ('lang', 'sortkey_classification', 'object_ref'), ('lang', 'sortkey_foundingdate', 'object_ref'), ('lang', 'sortkey_dissolutiondate', 'object_ref')]),
+        ),
+    ]
@@ -1,16 +1,39 @@
 from django.db import models
-from django.contrib.gis import geos
 from django.utils.translation import ugettext as _
-from django.db.models import Max
 
 from django_date_extensions.fields import ApproximateDateField
 
 from complex_fields.model_decorators import versioned, translated, sourced, sourced_optional
 from complex_fields.models import ComplexField, ComplexFieldContainer
 from complex_fields.base_models import BaseModel
-
-
-class Organization(models.Model, BaseModel):
+from sfm_pc.managers import ComplexFieldQuerySet
+from sfm_pc.dates import NormalizedDate
+from sfm_pc.search import Search, SearchMixin, Dates, Location, Sort, Term
+from sfm_pc.snapshots import Snapshot, SnapshotMixin
+from sfm_pc.spatial import linked_to_areas
+
+
+class Organization(SearchMixin, SnapshotMixin, models.Model, BaseModel):
+    objects = ComplexFieldQuerySet.as_manager()
+
+    search_spec = Search(
+        default_order='name',
+        orderings={
+            'name': Sort('name'),
+            'alias': Sort('alias'),
+            'classification': Sort('classification'),
+            'foundingdate': Sort('foundingdate'),
+            'dissolutiondate': Sort('dissolutiondate'),
+        },
+        filters=[
+            Term('name', 'organizationname__value__icontains'),
+            Term('alias', 'organizationalias__value__icontains'),
+            Dates('founding', 'organizationfoundingdate'),
+            Dates('dissolution', 'organizationdissolutiondate'),
+            Term('classification', 'organizationclassification__value'),
+            Location(lambda location: linked_to_areas(location, 'organization_id')),
+        ]
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -36,99 +59,6 @@ class Organization(models.Model, BaseModel):
     def __str__(self):
         return str(self.name)
 
-    @classmethod
-    def search(cls, terms):
-        order_by = terms.get('orderby')
-        if not order_by:
-            order_by = 'organizationname__value'
-
-        direction = terms.get('direction')
-        if not direction:
-            direction = 'ASC'
-
-        dirsym = ''
-        if direction == 'DESC':
-            dirsym = '-'
-
-        orgs_query = (Organization.objects
-                      .annotate(Max(order_by))
-                      .order_by(dirsym + order_by + "__max"))
-
-        name = terms.get('name')
-        if name:
-            orgs_query = orgs_query.filter(organizationname__value__icontains=name)
-
-        alias_val = terms.get('alias')
-        if alias_val:
-            orgs_query = orgs_query.filter(organizationalias__value__icontains=alias_val)
-
-        foundingdate_year = terms.get('founding_year')
-        if foundingdate_year:
-            orgs_query = orgs_query.filter(
-                organizationfoundingdate__value__startswith=foundingdate_year
-            )
-
-        foundingdate_month = terms.get('founding_month')
-        if foundingdate_month:
-            orgs_query = orgs_query.filter(
-                organizationfoundingdate__value__contains="-" + foundingdate_month + "-"
-            )
-
-        foundingdate_day = terms.get('founding_day')
-        if foundingdate_day:
-            orgs_query = orgs_query.filter(
-                organizationfoundingdate__value__endswith=foundingdate_day
-            )
-
-        dissolutiondate_year = terms.get('dissolution_year')
-        if dissolutiondate_year:
-            orgs_query = orgs_query.filter(
-                organizationdissolutiondate__value__startswith=dissolutiondate_year
-            )
-
-        dissolutiondate_month = terms.get('dissolution_month')
-        if dissolutiondate_month:
-            orgs_query = orgs_query.filter(
-                organizationdissolutiondate__value__contains="-" + dissolutiondate_month + "-"
-            )
-
-        dissolutiondate_day = terms.get('dissolution_day')
-        if dissolutiondate_day:
-            orgs_query = orgs_query.filter(
-                organizationdissolutiondate__value__endswith=dissolutiondate_day
-            )
-
-        classification = terms.get('classification')
-        if classification:
-            orgs_query = orgs_query.filter(organizationclassification__value_id=classification)
-
-        latitude = terms.get('latitude')
-        longitude = terms.get('longitude')
-        if latitude and longitude:
-            try:
-                latitude = float(latitude)
-                longitude = float(longitude)
-            except ValueError:
-                latitude = 0
-                longitude = 0
-
-            point = geos.Point(latitude, longitude)
-            radius = terms.get('radius')
-            if radius:
-                try:
-                    radius = float(radius)
-                except ValueError:
-                    radius = 0
-                orgs_query = orgs_query.filter(
-                    associationorganization__object_ref__associationarea__value__areageometry__value__dwithin=(point, radius)
-                )
-            else:
-                orgs_query = orgs_query.filter(
-                    associationorganization__object_ref__associationarea__value__areageometry__value__bbcontains=point
-                )
-
-        return orgs_query
-
 
 @translated
 @versioned
@@ -159,7 +89,7 @@ class OrganizationClassification(ComplexField):
 
 @versioned
 @sourced
-class OrganizationFoundingDate(ComplexField):
+class OrganizationFoundingDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey('Organization')
     value = ApproximateDateField(default=None, blank=True, null=True)
     field_name = _("Date of creation")
@@ -167,7 +97,7 @@ class OrganizationFoundingDate(ComplexField):
 
 @versioned
 @sourced
-class OrganizationDissolutionDate(ComplexField):
+class OrganizationDissolutionDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey('Organization')
     value = ApproximateDateField(default=None, blank=True, null=True)
     field_name = _("Date of disbandment")
@@ -194,3 +124,30 @@ class Classification(models.Model):
 
     def __str__(self):
         return self.value
+
+
+class OrganizationSnapshot(Snapshot):
+    object_ref = models.ForeignKey('Organization', related_name='snapshots')
+    name = models.TextField(default=None, blank=True, null=True)
+    alias = models.TextField(default=None, blank=True, null=True)
+    classification = models.TextField(default=None, blank=True, null=True)
+    foundingdate = models.TextField(default=None, blank=True, null=True)
+    dissolutiondate = models.TextField(default=None, blank=True, null=True)
+    realfounding = models.TextField(default=None, blank=True, null=True)
+    realdissolution = models.TextField(default=None, blank=True, null=True)
+
+    sortkey_name = models.CharField(max_length=255, null=True)
+    sortkey_alias = models.CharField(max_length=255, null=True)
+    sortkey_classification = models.CharField(max_length=255, null=True)
+    sortkey_foundingdate = models.DateField(null=True)
+    sortkey_dissolutiondate = models.DateField(null=True)
+
+    class Meta:
+        unique_together = ('object_ref', 'lang')
+        index_together = [
+            ('lang', 'sortkey_name', 'object_ref'),
+            ('lang', 'sortkey_alias', 'object_ref'),
+            ('lang', 'sortkey_classification', 'object_ref'),
+            ('lang', 'sortkey_foundingdate', 'object_ref'),
+            ('lang', 'sortkey_dissolutiondate', 'object_ref'),
+        ]
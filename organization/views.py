@@ -1,18 +1,23 @@
 import json
-import csv
 from datetime import date
 
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.contrib.admin.util import NestedObjects
 from django.views.generic.edit import DeleteView
 from django.views.generic.base import TemplateView
 from django.utils.translation import ugettext as _
-from django.template.loader import render_to_string
 from django.http import HttpResponse
 from django.db import DEFAULT_DB_ALIAS
 
 from .models import Organization, Classification
 from sfm_pc.utils import deleted_in_str
+from sfm_pc.snapshots import get_snapshots, get_snapshots_for_ids
+from sfm_pc.hierarchy import superior_units
+from sfm_pc.export import stream_csv
+from sfm_pc.counts import search_count
+from sfm_pc.results import cached_search
+from sfm_pc.pagination import paginate
+from sfm_pc.autocomplete import autocomplete, entity_matches, containing, ranked
+from sfm_pc.vocabulary import vocabulary
 
 
 class OrganizationDelete(DeleteView):
@@ -43,81 +48,62 @@ class OrganizationView(TemplateView):
 
         context['year_range'] = range(1950, date.today().year + 1)
         context['day_range'] = range(1, 32)
-        context['classifications'] = Classification.objects.all()
+        context['classifications'] = vocabulary(Classification)
 
         return context
 
 
 def organization_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="organizations.csv"'
-
     terms = request.GET.dict()
     organization_query = Organization.search(terms)
 
-    writer = csv.writer(response)
-    for organization in organization_query:
-        writer.writerow([
-            organization.id,
-            organization.name.get_value(),
-            organization.alias.get_value(),
-            organization.classification.get_value(),
-            repr(organization.foundingdate.get_value()),
-            repr(organization.dissolutiondate.get_value()),
-            organization.realfounding.get_value(),
-            organization.realdissolution.get_value(),
-        ])
-
-    return response
+    return stream_csv(organization_query, 'organizations.csv', [
+        'id', 'name', 'alias', 'classification', 'foundingdate',
+        'dissolutiondate', 'realfounding', 'realdissolution'
+    ])
 
 
+@cached_search(Organization)
 def organization_search(request):
     terms = request.GET.dict()
 
-    page = int(terms.get('page', 1))
-
     keys = ['name', 'alias', 'classification', 'superiorunit', 'foundingdate',
             'dissolutiondate']
 
     orgs_query = Organization.search(terms)
 
-    paginator = Paginator(orgs_query, 15)
-    try:
-        orgs_page = paginator.page(page)
-    except PageNotAnInteger:
-        orgs_page = paginator.page(1)
-        page = 1
-    except EmptyPage:
-        orgs_page = paginator.page(paginator.num_pages)
-        page = paginator.num_pages
-
-    orgs = [
-        {
+    result_number, estimated = search_count(Organization, terms)
+
+    orgs_page, paging = paginate(orgs_query, terms, result_number)
+
+    snapshots = get_snapshots(orgs_page)
+    parents = superior_units([org.id for org in orgs_page])
+    parent_snapshots = get_snapshots_for_ids(Organization, list(set(parents.values())))
+
+    orgs = []
+    for org in orgs_page:
+        snapshot = snapshots[org.id].as_dict()
+        parent = parent_snapshots.get(parents.get(org.id))
+        orgs.append({
             "id": org.id,
-            "name": org.name.get_value(),
-            "alias": org.alias.get_value(),
-            "classification": str(org.classification.get_value()),
-            "superiorunit": "TODO",
-            "foundingdate": str(org.foundingdate.get_value()),
-            "dissolutiondate": str(org.dissolutiondate.get_value()),
-        }
-        for org in orgs_page
-    ]
-
-    html_paginator = render_to_string(
-        'paginator.html',
-        {'acutal': page, 'min': page - 5, 'max': page + 5,
-         'paginator': orgs_page,
-         'pages': range(1, paginator.num_pages + 1)}
-    )
-
-    return HttpResponse(json.dumps({
+            "name": snapshot['name'],
+            "alias": snapshot['alias'],
+            "classification": snapshot['classification'],
+            "superiorunit": parent.name or "" if parent else "",
+            "foundingdate": snapshot['foundingdate'],
+            "dissolutiondate": snapshot['dissolutiondate'],
+        })
+
+    response = {
         'success': True,
         'keys': keys,
         'objects': orgs,
-        'paginator': html_paginator,
-        'result_number': len(orgs_query)
-    }))
+        'result_number': result_number,
+        'result_number_estimated': estimated,
+    }
+    response.update(paging)
+
+    return HttpResponse(json.dumps(response))
 
 
 class OrganizationUpdate(TemplateView):
@@ -180,30 +166,21 @@ class OrganizationCreate(TemplateView):
 
 
 def organization_autocomplete(request):
-    data = request.GET.dict()['term']
-
-    organizations = Organization.objects.filter(
-        organizationname__value__icontains=data
-    )
-
-    organizations = [
-        {"value": org.id, "label": str(org.name)}
-        for org in organizations
-    ]
+    def complete(term, limit):
+        return [
+            {"value": snapshot.object_ref_id, "label": snapshot.name or ""}
+            for snapshot in entity_matches(Organization, 'name', term, limit)
+        ]
 
-    return HttpResponse(json.dumps(organizations))
+    return autocomplete(request, 'organization', complete)
 
 
 def classification_autocomplete(request):
-    data = request.GET.dict()['term']
-
-    classifications = Classification.objects.filter(
-        value__icontains=data
-    )
-
-    classifications = [
-        {"value": classif.id, "label": _(classif.value)}
-        for classif in classifications
-    ]
-
-    return HttpResponse(json.dumps(classifications))
+    def complete(term, limit):
+        classifications = containing(Classification.objects.all(), ['value'], term)
+        return [
+            {"value": classif.id, "label": _(classif.value)}
+            for classif in ranked(classifications, 'value', term, limit)
+        ]
+
+    return autocomplete(request, 'classification', complete, 'vocabulary')
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('person', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonSnapshot',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('lang', models.CharField(max_length=5)),
+                ('name', models.TextField(blank=True, null=True, default=None)),
+                ('alias', models.TextField(blank=True, null=True, default=None)),
+                ('deathdate', models.TextField(blank=True, null=True, default=None)),
+                ('object_ref', models.ForeignKey(to='person.Person', related_name='snapshots')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='personsnapshot',
+            unique_together=set([('object_ref', 'lang')]),
+        ),
+    ]
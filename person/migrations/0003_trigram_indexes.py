@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from sfm_pc.indexes import trigram_extension, trigram_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('person', '0002_personsnapshot'),
+    ]
+
+    operations = [
+        trigram_extension(),
+        trigram_index('person_personname'),
+        trigram_index('person_personalias'),
+    ]
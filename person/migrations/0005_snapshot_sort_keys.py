@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('person', '0004_normalized_dates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personsnapshot',
+            name='sortkey_name',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='personsnapshot',
+            name='sortkey_alias',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='personsnapshot',
+            name='sortkey_deathdate',
+            field=models.DateField(null=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='personsnapshot',
+            index_together=set([('lang', 'sortkey_name', 'object_ref'), ('lang', 'sortkey_alias', 'object_ref'), ('lang', 'sortkey_deathdate', 'object_ref')]),
+        ),
+    ]
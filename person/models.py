@@ -1,16 +1,38 @@
 from django.db import models
-from django.contrib.gis.geos import Point
 from django.utils.translation import ugettext as _
-from django.db.models import Max
 
 from django_date_extensions.fields import ApproximateDateField
 
 from complex_fields.model_decorators import versioned, translated, sourced
 from complex_fields.models import ComplexField, ComplexFieldContainer
 from complex_fields.base_models import BaseModel
+from sfm_pc.managers import ComplexFieldQuerySet
+from sfm_pc.dates import NormalizedDate
+from sfm_pc.search import Search, SearchMixin, Dates, Location, Sort, Term
+from sfm_pc.snapshots import Snapshot, SnapshotMixin
+from sfm_pc.spatial import linked_to_areas
+
+
+class Person(SearchMixin, SnapshotMixin, models.Model, BaseModel):
+    objects = ComplexFieldQuerySet.as_manager()
+
+    search_spec = Search(
+        default_order='name',
+        orderings={
+            'name': Sort('name'),
+            'alias': Sort('alias'),
+            'deathdate': Sort('deathdate'),
+        },
+        filters=[
+            Term('name', 'personname__value__icontains'),
+            Term('alias', 'personalias__value__icontains'),
+            Dates('deathdate', 'persondeathdate'),
+            Term('role_membership', 'membershippersonmember__object_ref__'
+                                    'membershippersonrole__value__value'),
+            Location(lambda location: linked_to_areas(location, 'person_id')),
+        ]
+    )
 
-
-class Person(models.Model, BaseModel):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.name = ComplexFieldContainer(self, PersonName)
@@ -28,85 +50,6 @@ class Person(models.Model, BaseModel):
     def __str__(self):
         return str(self.name)
 
-    @classmethod
-    def search(cls, terms):
-        order_by = terms.get('orderby')
-        if not order_by:
-            order_by = 'personname__value'
-        elif order_by in ['name']:
-            order_by = 'person' + order_by + '__value'
-
-        direction = terms.get('direction')
-        if not direction:
-            direction = 'ASC'
-
-        dirsym = ''
-        if direction == 'DESC':
-            dirsym = '-'
-
-        person_query = (cls.objects
-                        .annotate(Max(order_by))
-                        .order_by(dirsym + order_by + "__max"))
-
-        name = terms.get('name')
-        if name:
-            person_query = person_query.filter(personname__value__icontains=name)
-
-        alias_val = terms.get('alias')
-        if alias_val:
-            person_query = person_query.filter(personalias__value__icontains=alias_val)
-
-        deathdate_year = terms.get('deathdate_year')
-        if deathdate_year:
-            person_query = person_query.filter(
-                persondeathdate__value__startswith=deathdate_year
-            )
-
-        deathdate_month = terms.get('deathdate_month')
-        if deathdate_month:
-            person_query = person_query.filter(
-                persondeathdate__value__contains="-" + deathdate_month + "-"
-            )
-
-        deathdate_day = terms.get('deathdate_day')
-        if deathdate_day:
-            person_query = person_query.filter(
-                persondeathdate__value__endswith=deathdate_day
-            )
-
-        role = terms.get('role_membership')
-        if role:
-            person_query = person_query.filter(
-                membershippersonmember__object_ref__membershiprole__value__value=role
-            )
-
-        latitude = terms.get('latitude')
-        longitude = terms.get('longitude')
-        if latitude and longitude:
-            try:
-                latitude = float(latitude)
-                longitude = float(longitude)
-            except ValueError:
-                latitude = 0
-                longitude = 0
-
-            point = Point(latitude, longitude)
-            radius = terms.get('radius')
-            if radius:
-                try:
-                    radius = float(radius)
-                except ValueError:
-                    radius = 0
-                person_query = person_query.filter(
-                    membershippersonmember__object_ref__membershiporganization__value__associationorganization__object_ref__associationarea__value__areageometry__value__dwithin=(point, radius)
-                )
-            else:
-                person_query = person_query.filter(
-                    membershippersonmember__object_ref__membershiporganization__value__associationorganization__object_ref__associationarea__value__areageometry__value__bbcontains=point
-                )
-
-        return person_query
-
 
 @translated
 @versioned
@@ -128,7 +71,26 @@ class PersonAlias(ComplexField):
 
 @versioned
 @sourced
-class PersonDeathDate(ComplexField):
+class PersonDeathDate(ComplexField, NormalizedDate):
     object_ref = models.ForeignKey('Person')
     value = ApproximateDateField(default=None, blank=True, null=True)
     field_name = _("Death date")
+
+
+class PersonSnapshot(Snapshot):
+    object_ref = models.ForeignKey('Person', related_name='snapshots')
+    name = models.TextField(default=None, blank=True, null=True)
+    alias = models.TextField(default=None, blank=True, null=True)
+    deathdate = models.TextField(default=None, blank=True, null=True)
+
+    sortkey_name = models.CharField(max_length=255, null=True)
+    sortkey_alias = models.CharField(max_length=255, null=True)
+    sortkey_deathdate = models.DateField(null=True)
+
+    class Meta:
+        unique_together = ('object_ref', 'lang')
+        index_together = [
+            ('lang', 'sortkey_name', 'object_ref'),
+            ('lang', 'sortkey_alias', 'object_ref'),
+            ('lang', 'sortkey_deathdate', 'object_ref'),
+        ]
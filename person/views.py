@@ -1,19 +1,22 @@
 import json
-import csv
 
 from datetime import date
 
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.contrib.admin.util import NestedObjects
 from django.views.generic.edit import DeleteView
 from django.views.generic.base import TemplateView
-from django.template.loader import render_to_string
 from django.http import HttpResponse
 from django.db import DEFAULT_DB_ALIAS
 
-from .models import Person, PersonName
+from .models import Person
 from membershipperson.models import MembershipPerson, Role
 from sfm_pc.utils import deleted_in_str
+from sfm_pc.snapshots import get_snapshots
+from sfm_pc.export import stream_csv
+from sfm_pc.counts import search_count
+from sfm_pc.results import cached_search
+from sfm_pc.pagination import paginate
+from sfm_pc.autocomplete import autocomplete, entity_matches
 
 
 class PersonDelete(DeleteView):
@@ -48,67 +51,48 @@ class PersonView(TemplateView):
 
 
 def person_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="persons.csv"'
-
     terms = request.GET.dict()
     person_query = Person.search(terms)
 
-    writer = csv.writer(response)
-    for person in person_query:
-        writer.writerow([
-            person.id,
-            person.name.get_value(),
-            person.alias.get_value(),
-            repr(person.deathdate.get_value())
-        ])
-
-    return response
+    return stream_csv(person_query, 'persons.csv', [
+        'id', 'name', 'alias', 'deathdate'
+    ])
 
 
+@cached_search(Person)
 def person_search(request):
     terms = request.GET.dict()
 
-    page = int(terms.get('page', 1))
-
     person_query = Person.search(terms)
 
     keys = ['name', 'alias', 'deathdate']
 
-    paginator = Paginator(person_query, 15)
-    try:
-        person_page = paginator.page(page)
-    except PageNotAnInteger:
-        person_page = paginator.page(1)
-        page = 1
-    except EmptyPage:
-        person_page = paginator.page(paginator.num_pages)
-        page = paginator.num_pages
-
-    persons = [
-        {
+    result_number, estimated = search_count(Person, terms)
+
+    person_page, paging = paginate(person_query, terms, result_number)
+
+    snapshots = get_snapshots(person_page)
+
+    persons = []
+    for person in person_page:
+        snapshot = snapshots[person.id].as_dict()
+        persons.append({
             "id": person.id,
-            "name": str(person.name),
-            "alias": str(person.alias),
-            "deathdate": str(person.deathdate.get_value()),
-        }
-        for person in person_page
-    ]
-
-    html_paginator = render_to_string(
-        'paginator.html',
-        {'actual': page, 'min': page - 5, 'max': page + 5,
-         'paginator': person_page,
-         'pages': range(1, paginator.num_pages + 1)}
-    )
-
-    return HttpResponse(json.dumps({
+            "name": snapshot['name'],
+            "alias": snapshot['alias'],
+            "deathdate": snapshot['deathdate'],
+        })
+
+    response = {
         'success': True,
         'keys': keys,
         'objects': persons,
-        'paginator': html_paginator,
-        'result_number': len(person_query)
-    }))
+        'result_number': result_number,
+        'result_number_estimated': estimated,
+    }
+    response.update(paging)
+
+    return HttpResponse(json.dumps(response))
 
 
 class PersonUpdate(TemplateView):
@@ -142,7 +126,9 @@ class PersonUpdate(TemplateView):
         context['person'] = Person.objects.get(pk=context.get('pk'))
         context['memberships'] = MembershipPerson.objects.filter(
             membershippersonmember__value=context['person']
-        ).filter(membershippersonorganization__value__isnull=False)
+        ).filter(
+            membershippersonorganization__value__isnull=False
+        ).with_complex_values('organization', 'role', 'rank')
 
         return context
 
@@ -177,16 +163,13 @@ class PersonCreate(TemplateView):
 
 
 def person_autocomplete(request):
-    term = request.GET.dict()['term']
-
-    person_names = PersonName.objects.filter(value__icontains=term)
-
-    persons = [
-        {
-            'label': str(name.object_ref.name),
-            'value': str(name.object_ref_id)
-        }
-        for name in person_names
-    ]
-
-    return HttpResponse(json.dumps(persons))
+    def complete(term, limit):
+        return [
+            {
+                'label': snapshot.name or "",
+                'value': str(snapshot.object_ref_id)
+            }
+            for snapshot in entity_matches(Person, 'name', term, limit)
+        ]
+
+    return autocomplete(request, 'person', complete)
@@ -0,0 +1 @@
+default_app_config = 'sfm_pc.apps.SfmPcConfig'
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SfmPcConfig(AppConfig):
+    name = 'sfm_pc'
+    verbose_name = 'Security Force Monitor'
+
+    def ready(self):
+        # Connect the cache invalidation and derived table receivers
+        from . import caching, vocabulary, spatial, hierarchy, periods, citations  # noqa
@@ -0,0 +1,112 @@
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, When, Value, IntegerField, Q
+from django.http import HttpResponse
+
+from .caching import make_key
+from .snapshots import snapshot_language
+from .utils import field_model_for
+
+AUTOCOMPLETE_LIMIT = 20
+AUTOCOMPLETE_TIMEOUT = 60 * 60
+LOCAL_CACHE_SIZE = 1000
+
+
+class LRUCache(object):
+    """
+    Small thread safe least recently used cache, private to the process.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            try:
+                value = self.entries.pop(key)
+            except KeyError:
+                return None
+            self.entries[key] = value
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = value
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+
+local_cache = LRUCache(LOCAL_CACHE_SIZE)
+
+
+def containing(queryset, fields, term):
+    matches = Q()
+    for field in fields:
+        matches |= Q(**{field + '__icontains': term})
+    return queryset.filter(matches)
+
+
+def ranked(queryset, rank_field, term, limit):
+    """
+    At most `limit` rows of `queryset`, those whose `rank_field` starts with
+    `term` first, then in alphabetical order.
+    """
+    return (queryset
+            .annotate(prefix_rank=Case(
+                When(then=Value(0), **{rank_field + '__istartswith': term}),
+                default=Value(1),
+                output_field=IntegerField()
+            ))
+            .order_by('prefix_rank', rank_field, 'id')[:limit])
+
+
+def entity_matches(entity_model, attr_name, term, limit):
+    """
+    Snapshots of the entities having a value of `attr_name` (in any
+    language) which contains `term`, ranked on the snapshot column of the
+    same name. One query: the field table is read as a semi-join.
+    """
+    field_model = field_model_for(entity_model, attr_name)
+    matching = field_model.objects.filter(value__icontains=term)
+
+    snapshots = entity_model.get_snapshot_model().objects.filter(
+        lang=snapshot_language(),
+        object_ref__in=matching.values('object_ref_id')
+    )
+
+    return ranked(snapshots, attr_name, term, limit)
+
+
+def autocomplete(request, name, complete, namespace='search'):
+    """
+    JSON response of `complete(term, limit)` for the `term` query parameter.
+
+    Results are cached per term and language in the shared cache and in a
+    per-process LRU in front of it. Keys embed the generation of
+    `namespace` ('search' for entities, 'vocabulary' for lookup tables)
+    so writes invalidate them everywhere.
+    """
+    term = request.GET.get('term', '').strip()
+    if not term:
+        return HttpResponse(json.dumps([]))
+
+    limit = getattr(settings, 'AUTOCOMPLETE_LIMIT', AUTOCOMPLETE_LIMIT)
+    key = make_key(namespace, 'autocomplete', name, term.lower(),
+                   snapshot_language(), limit)
+
+    content = local_cache.get(key)
+    if content is None:
+        content = cache.get(key)
+        if content is None:
+            content = json.dumps(complete(term, limit))
+            cache.set(key, content, AUTOCOMPLETE_TIMEOUT)
+        local_cache.set(key, content)
+
+    return HttpResponse(content)
@@ -0,0 +1,394 @@
+import csv
+import json
+import time
+
+import reversion
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.geos import GEOSGeometry
+from django.core import serializers
+from django.db import models, transaction
+from django_date_extensions.fields import ApproximateDate, ApproximateDateField
+from reversion.models import Revision, Version
+
+from .caching import bump_generation, invalidate_searches, is_tiled
+from .citations import refresh_citations
+from .dates import NormalizedDate, parse_date_term
+from .hierarchy import refresh_composition
+from .periods import PERIODS, refresh_periods
+from .snapshots import refresh_snapshots_for_ids
+from .spatial import (refresh_area_shapes, refresh_association_links,
+                      refresh_membership_links)
+from .utils import field_model_for, reserve_ids
+
+BATCH_SIZE = 1000
+
+# Columns of an import which are not complex fields: the sources of every
+# field of the row (separated by SOURCE_SEPARATOR) and their confidence
+SOURCES_COLUMN = 'sources'
+CONFIDENCE_COLUMN = 'confidence'
+SOURCE_SEPARATOR = '|'
+
+TRUE_VALUES = ('1', 'true', 'yes', 'y')
+FALSE_VALUES = ('0', 'false', 'no', 'n')
+
+
+class ImportReport(object):
+    """
+    Outcome of an import: ids of the created entities, [(row number,
+    {column: message})] for the rejected rows and the time taken.
+    """
+
+    def __init__(self):
+        self.created = []
+        self.errors = []
+        self.started = time.time()
+        self.elapsed = 0
+
+    def finish(self):
+        self.elapsed = time.time() - self.started
+
+    @property
+    def rate(self):
+        rows = len(self.created) + len(self.errors)
+        return rows / self.elapsed if self.elapsed else 0
+
+
+def _parse_date(value):
+    bounds = parse_date_term(value)
+    if bounds is None:
+        raise ValueError('Dates are written YYYY, YYYY-MM or YYYY-MM-DD')
+
+    parts = [int(part) for part in value.split('-')]
+    return ApproximateDate(*(parts + [0] * (3 - len(parts))))
+
+
+def _parse_boolean(value):
+    if value.lower() in TRUE_VALUES:
+        return True
+    if value.lower() in FALSE_VALUES:
+        return False
+    raise ValueError('Expected yes or no')
+
+
+class Column(object):
+    """
+    Parser of an import column, the `attr_name` complex field of the
+    entity. Foreign keys take an id or, for lookup tables, their value.
+    """
+
+    def __init__(self, entity_model, attr_name):
+        self.attr_name = attr_name
+        try:
+            self.field_model = field_model_for(entity_model, attr_name)
+        except LookupError:
+            raise ValueError('{} has no field {}'.format(entity_model.__name__,
+                                                         attr_name))
+        self.value_field = self.field_model._meta.get_field('value')
+        self.columns = [field.name for field in self.field_model._meta.get_fields()]
+
+    def parse(self, value):
+        """
+        Parsed `value` (an id for foreign keys, checked by resolve()).
+        Raises ValueError when malformed.
+        """
+        field = self.value_field
+        if field.rel is not None:
+            return int(value) if value.isdigit() else value
+        if isinstance(field, ApproximateDateField):
+            return _parse_date(value)
+        if isinstance(field, models.BooleanField):
+            return _parse_boolean(value)
+        if isinstance(field, GeometryField):
+            return GEOSGeometry(value, srid=field.srid)
+        return field.to_python(value)
+
+    def resolve(self, values):
+        """
+        {parsed value: id} for the foreign key `values` which exist, in one
+        query for ids and one for lookup table values.
+        """
+        related = self.value_field.rel.to
+        ids = [value for value in values if isinstance(value, int)]
+        names = [value for value in values if not isinstance(value, int)]
+
+        found = {id_: id_ for id_ in
+                 related.objects.filter(id__in=ids).values_list('id', flat=True)}
+        if names and 'value' in [field.name for field in related._meta.get_fields()]:
+            found.update(related.objects.filter(value__in=names)
+                         .values_list('value', 'id'))
+        return found
+
+
+def required_attributes(entity_model):
+    # required_fields are named '<prefix>_<prefix><Attribute>', the prefix
+    # being the entity's name or a shorter one (Membership_MembershipOrganization)
+    attr_names = []
+    for name in getattr(entity_model(), 'required_fields', []):
+        prefix, field_name = name.split('_', 1)
+        attr_names.append(field_name[len(prefix):].lower())
+    return attr_names
+
+
+def _validate(columns, required, rows, first_line):
+    """
+    ([(line, {attribute: value}, sources, confidence)], [(line, errors)])
+    of a batch of rows.
+    """
+    parsed, errors = [], []
+    for line, row in enumerate(rows, first_line):
+        values, row_errors = {}, {}
+        for column in columns:
+            value = (row.get(column.attr_name) or '').strip()
+            if not value:
+                continue
+            try:
+                values[column.attr_name] = column.parse(value)
+            except (ValueError, TypeError) as error:
+                row_errors[column.attr_name] = str(error) or 'Invalid value'
+
+        for attr_name in required:
+            if attr_name not in values and attr_name not in row_errors:
+                row_errors[attr_name] = 'This field is required'
+
+        sources = [source.strip() for source
+                   in (row.get(SOURCES_COLUMN) or '').split(SOURCE_SEPARATOR)
+                   if source.strip()]
+        confidence = (row.get(CONFIDENCE_COLUMN) or '').strip() or None
+
+        if row_errors:
+            errors.append((line, row_errors))
+        else:
+            parsed.append((line, values, sources, confidence))
+
+    # Foreign keys are checked for the whole batch at once
+    for column in columns:
+        if column.value_field.rel is None:
+            continue
+        wanted = {row[1][column.attr_name] for row in parsed
+                  if column.attr_name in row[1]}
+        if not wanted:
+            continue
+        found = column.resolve(wanted)
+
+        kept = []
+        for line, values, sources, confidence in parsed:
+            value = values.get(column.attr_name)
+            if value is not None and value not in found:
+                errors.append((line, {column.attr_name: 'No such {} {}'.format(
+                    column.value_field.rel.to.__name__, value
+                )}))
+                continue
+            if value is not None:
+                values[column.attr_name] = found[value]
+            kept.append((line, values, sources, confidence))
+        parsed = kept
+
+    return (parsed, errors)
+
+
+def import_sources(names):
+    """
+    {source: id} for `names`, creating the missing sources in one insert.
+    """
+    Source = apps.get_model('source', 'Source')
+    return {name: source.id
+            for name, source in Source.get_or_create_texts(names).items()}
+
+
+def _write_fields(column, rows, lang):
+    """
+    Insert the field rows of `column` for [(entity id, value, source ids,
+    confidence)] and return [(field row, source ids)].
+    """
+    field_model = column.field_model
+    is_fk = column.value_field.rel is not None
+
+    objects = []
+    for object_id, value, source_ids, confidence in rows:
+        obj = field_model(object_ref_id=object_id)
+        if is_fk:
+            obj.value_id = value
+        else:
+            obj.value = value
+        if 'lang' in column.columns:
+            obj.lang = lang
+        if confidence and 'confidence' in column.columns:
+            obj.confidence = confidence
+        if isinstance(obj, NormalizedDate):
+            obj.normalize_date()
+        objects.append(obj)
+
+    for obj, id_ in zip(objects, reserve_ids(field_model, len(objects))):
+        obj.id = id_
+    field_model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+    if 'sources' in column.columns:
+        sources = field_model._meta.get_field('sources')
+        through = sources.rel.through
+        through.objects.bulk_create([
+            through(**{sources.m2m_field_name() + '_id': obj.id,
+                       'source_id': source_id})
+            for obj, (object_id, value, source_ids, confidence) in zip(objects, rows)
+            for source_id in source_ids
+        ], batch_size=BATCH_SIZE)
+
+    return [(obj, source_ids) for obj, (object_id, value, source_ids, confidence)
+            in zip(objects, rows)]
+
+
+def _version_data(adapter, obj, source_ids):
+    """
+    adapter.get_version_data() of a new field row, its sources serialized
+    from `source_ids` instead of being read back with a query per row.
+    """
+    format_ = adapter.get_serialization_format()
+    fields = list(adapter.get_fields_to_serialize())
+    many = [field.name for field in type(obj)._meta.many_to_many if field.name in fields]
+    if format_ != 'json' or set(many) - {'sources'}:
+        return adapter.get_version_data(obj)
+
+    data = json.loads(serializers.serialize(
+        format_, [obj], fields=[name for name in fields if name not in many]
+    ))
+    if many:
+        data[0]['fields']['sources'] = list(source_ids)
+
+    return {
+        'object_id': str(obj.pk),
+        'object_id_int': obj.pk,
+        'content_type': ContentType.objects.get_for_model(obj),
+        'format': format_,
+        'serialized_data': json.dumps(data),
+        'object_repr': str(obj),
+    }
+
+
+def save_revisions(objects_by_entity, comment, user=None):
+    """
+    One revision per entity holding the versions of its field rows, like
+    BaseModel.update() saves them, written with one insert per table.
+    `objects_by_entity` is {entity id: [(field row, source ids)]}.
+    """
+    manager = reversion.default_revision_manager
+    entity_ids = list(objects_by_entity)
+    revision_ids = reserve_ids(Revision, len(entity_ids))
+    Revision.objects.bulk_create([
+        Revision(id=id_, comment=comment, user=user)
+        for id_ in revision_ids
+    ], batch_size=BATCH_SIZE)
+
+    versions = []
+    for revision_id, entity_id in zip(revision_ids, entity_ids):
+        for obj, source_ids in objects_by_entity[entity_id]:
+            if not manager.is_registered(type(obj)):
+                continue
+            version_data = _version_data(manager.get_adapter(type(obj)), obj,
+                                         source_ids)
+            versions.append(Version(revision_id=revision_id, **version_data))
+    Version.objects.bulk_create(versions, batch_size=BATCH_SIZE)
+
+
+def refresh_derived(entity_model, ids):
+    """
+    Rebuild the snapshots and derived tables of entities written without
+    BaseModel.update(), and drop the cached searches and tiles they appear
+    in.
+    """
+    label = (entity_model._meta.app_label, entity_model._meta.model_name)
+    for start in range(0, len(ids), BATCH_SIZE):
+        batch = ids[start:start + BATCH_SIZE]
+        refresh_snapshots_for_ids(entity_model, batch)
+        refresh_citations(entity_model, batch)
+        if label == ('area', 'area'):
+            refresh_area_shapes(batch)
+        elif label == ('association', 'association'):
+            refresh_association_links(batch)
+        elif label == ('membershipperson', 'membershipperson'):
+            refresh_membership_links(batch)
+        if label in PERIODS:
+            refresh_periods(entity_model, batch)
+
+    if label == ('composition', 'composition'):
+        for composition_id in ids:
+            refresh_composition(composition_id)
+
+    invalidate_searches(entity_model)
+    if is_tiled(entity_model):
+        bump_generation('tiles')
+
+
+def import_rows(entity_model, rows, lang=None, comment='Bulk import', user=None,
+                batch_size=BATCH_SIZE):
+    """
+    Create an entity of `entity_model` for each of `rows` (dicts of
+    {attribute: text} as read from a spreadsheet, plus the `sources` and
+    `confidence` columns) and return an ImportReport.
+
+    Rows are validated, and their entities, fields, sources and revisions
+    written, `batch_size` at a time with bulk inserts; each batch commits on
+    its own and invalid rows are reported instead of stopping the import.
+    """
+    lang = lang or settings.LANGUAGE_CODE
+    report = ImportReport()
+    rows = iter(rows)
+
+    header = None
+    line = 1
+    while True:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                break
+        if not batch:
+            break
+
+        if header is None:
+            header = [name for name in batch[0]
+                      if name and name not in (SOURCES_COLUMN, CONFIDENCE_COLUMN)]
+            columns = [Column(entity_model, attr_name) for attr_name in header]
+            required = required_attributes(entity_model)
+
+        parsed, errors = _validate(columns, required, batch, line + 1)
+        report.errors.extend(sorted(errors))
+        line += len(batch)
+        if not parsed:
+            continue
+
+        with transaction.atomic():
+            source_ids = import_sources(
+                source for _, _, sources, _ in parsed for source in sources
+            )
+            ids = reserve_ids(entity_model, len(parsed))
+            entity_model.objects.bulk_create(
+                [entity_model(id=id_) for id_ in ids], batch_size=BATCH_SIZE
+            )
+
+            objects_by_entity = {id_: [] for id_ in ids}
+            for column in columns:
+                field_rows = [
+                    (id_, values[column.attr_name],
+                     [source_ids[source] for source in sources], confidence)
+                    for id_, (_, values, sources, confidence) in zip(ids, parsed)
+                    if column.attr_name in values
+                ]
+                for obj, field_source_ids in _write_fields(column, field_rows, lang):
+                    objects_by_entity[obj.object_ref_id].append((obj, field_source_ids))
+
+            save_revisions(objects_by_entity, comment, user)
+
+        refresh_derived(entity_model, ids)
+        report.created.extend(ids)
+
+    report.finish()
+    return report
+
+
+def import_csv(entity_model, csv_file, **kwargs):
+    """
+    import_rows() of an open CSV file whose first line names the columns.
+    """
+    return import_rows(entity_model, csv.DictReader(csv_file), **kwargs)
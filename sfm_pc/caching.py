@@ -0,0 +1,164 @@
+import hashlib
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import connection
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .signals import entity_updated
+from .snapshots import SnapshotMixin
+
+GENERATION_KEY = 'sfm:generation:{}'
+
+# Lookup tables, edited through the admin. Writes to them bump the
+# 'vocabulary' generation.
+VOCABULARY_MODELS = (
+    'organization.Classification',
+    'area.Code',
+    'membershipperson.Role',
+    'membershipperson.Rank',
+    'membershipperson.Context',
+    'violation.Type',
+    'languages_plus.Language',
+)
+
+# Entities whose locations or shapes are served as map tiles, writes to them bump the
+# 'tiles' generation.
+TILED_MODELS = ('violation.Violation', 'geosite.Geosite', 'area.Area')
+
+# Entities whose writes change the search results of another one besides
+# its own: through its filters (area links, memberships) or the names and
+# superior units it shows. Each entity has a 'search:<label>' generation.
+SEARCH_DEPENDENCIES = {
+    'person.Person': ('membershipperson.MembershipPerson',
+                      'association.Association', 'area.Area'),
+    'organization.Organization': ('composition.Composition',
+                                  'association.Association', 'area.Area'),
+    'association.Association': ('organization.Organization', 'area.Area'),
+    'composition.Composition': ('organization.Organization',),
+    'emplacement.Emplacement': ('organization.Organization', 'geosite.Geosite'),
+    'membershipperson.MembershipPerson': ('person.Person',
+                                          'organization.Organization'),
+    # Perpetrators are searched by the names of people and organizations
+    'violation.Violation': ('person.Person', 'organization.Organization'),
+}
+
+# Generations bumped inside a transaction, bumped again once the request's
+# transactions are over: until the write commits, a concurrent request can
+# cache the old rows under the new generation (Django 1.8 has no
+# transaction.on_commit)
+_pending = threading.local()
+
+
+def _new_generation():
+    # Time based so that a generation lost by the cache backend never comes
+    # back with a value some stale entry was stored under.
+    return int(time.time() * 1000)
+
+
+def get_generation(name):
+    key = GENERATION_KEY.format(name)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _new_generation(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def _bump(name):
+    key = GENERATION_KEY.format(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_generation(), None)
+
+
+def bump_generation(name):
+    if connection.in_atomic_block:
+        if not hasattr(_pending, 'names'):
+            _pending.names = set()
+        _pending.names.add(name)
+    else:
+        bump_pending_generations()
+    _bump(name)
+
+
+@receiver(request_finished)
+def bump_pending_generations(sender=None, **kwargs):
+    names = getattr(_pending, 'names', set())
+    _pending.names = set()
+    for name in names:
+        _bump(name)
+
+
+def get_generations(names):
+    generations = cache.get_many([GENERATION_KEY.format(name) for name in names])
+    return tuple(generations.get(GENERATION_KEY.format(name)) or get_generation(name)
+                 for name in names)
+
+
+def make_key(namespace, *parts):
+    """
+    Cache key for `parts` (any repr-able values) in `namespace`, tied to the
+    current generation of that namespace so bumping it invalidates every
+    entry at once.
+    """
+    digest = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+    return 'sfm:{}:{}:{}'.format(namespace, get_generation(namespace), digest)
+
+
+def search_key(model, *parts):
+    """
+    Cache key for `parts` of a search of `model`, invalidated by writes to
+    `model`, to the entities it depends on (SEARCH_DEPENDENCIES) and to the
+    lookup tables, but not by the other ones.
+    """
+    label = model_label(model)
+    names = ['search:' + label] + ['search:' + dependency for dependency
+                                   in SEARCH_DEPENDENCIES.get(label, ())]
+    generations = get_generations(names + ['vocabulary'])
+    digest = hashlib.md5(repr((generations, parts)).encode('utf-8')).hexdigest()
+    return 'sfm:search:{}:{}'.format(label, digest)
+
+
+def model_label(model):
+    return '{}.{}'.format(model._meta.app_label, model.__name__)
+
+
+def is_vocabulary(model):
+    return model_label(model) in VOCABULARY_MODELS
+
+
+def is_tiled(model):
+    return model_label(model) in TILED_MODELS
+
+
+def invalidate_searches(model):
+    bump_generation('search')
+    bump_generation('search:' + model_label(model))
+
+
+@receiver(entity_updated)
+def invalidate_on_update(sender, instance, **kwargs):
+    invalidate_searches(sender)
+    if is_tiled(sender):
+        bump_generation('tiles')
+
+
+@receiver(post_delete)
+def invalidate_on_delete(sender, instance, **kwargs):
+    if isinstance(instance, SnapshotMixin):
+        invalidate_searches(sender)
+        if is_tiled(sender):
+            bump_generation('tiles')
+    elif is_vocabulary(sender):
+        bump_generation('vocabulary')
+
+
+@receiver(post_save)
+def invalidate_on_save(sender, instance, **kwargs):
+    if is_vocabulary(sender):
+        bump_generation('vocabulary')
@@ -0,0 +1,178 @@
+import json
+
+from django.apps import apps
+from django.http import HttpResponse
+
+from .dates import parse_date_term
+from .periods import overlapping
+from .snapshots import get_snapshots_for_ids
+from .vocabulary import vocabulary_lookup
+
+
+def date_bounds(value):
+    bounds = parse_date_term(value)
+    if bounds is None:
+        raise ValueError(value)
+    return bounds
+
+
+def search_period(terms):
+    """
+    (start, end) asked for by the `date` term (its whole year or month when
+    partial) or the `start` and `end` terms, open bounds being None.
+    """
+    if terms.get('date'):
+        return date_bounds(terms['date'])
+
+    start = end = None
+    if terms.get('start'):
+        start = date_bounds(terms['start'])[0]
+    if terms.get('end'):
+        end = date_bounds(terms['end'])[1]
+    if start and end and start > end:
+        raise ValueError('start after end')
+    return (start, end)
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _name(snapshots, object_id):
+    snapshot = snapshots.get(object_id)
+    return snapshot.name if snapshot else None
+
+
+def chain_of_command(organization_ids, start, end, role_id=None):
+    """
+    The units under `organization_ids` (included) between `start` and
+    `end`, each with its parent, its members (restricted to `role_id` when
+    given) and the sites it was stationed at over the period. Every
+    relation is read with one query on its period table.
+    """
+    CompositionClosure = apps.get_model('composition', 'CompositionClosure')
+    MembershipPeriod = apps.get_model('membershipperson', 'MembershipPeriod')
+    EmplacementPeriod = apps.get_model('emplacement', 'EmplacementPeriod')
+
+    depths = {organization_id: 0 for organization_id in organization_ids}
+    below = overlapping(
+        CompositionClosure.objects.filter(ancestor__in=organization_ids), start, end
+    ).values_list('descendant_id', 'depth')
+    for organization_id, depth in below:
+        depths[organization_id] = min(depth, depths.get(organization_id, depth))
+    units = list(depths)
+
+    parents = {}
+    links = overlapping(
+        CompositionClosure.objects.filter(depth=1, descendant__in=units,
+                                          ancestor__in=units),
+        start, end
+    ).order_by('descendant', '-enddate', 'id').values_list('descendant_id',
+                                                           'ancestor_id')
+    for organization_id, parent_id in links:
+        parents.setdefault(organization_id, parent_id)
+
+    members = overlapping(MembershipPeriod.objects.filter(organization__in=units),
+                          start, end)
+    if role_id:
+        members = members.filter(role_id=role_id)
+    members = list(members.order_by('startdate', 'id').values_list(
+        'organization_id', 'person_id', 'role_id', 'startdate', 'enddate'
+    ))
+
+    stations = list(
+        overlapping(EmplacementPeriod.objects.filter(organization__in=units),
+                    start, end)
+        .order_by('startdate', 'id')
+        .values_list('organization_id', 'site_id', 'startdate', 'enddate')
+    )
+
+    organizations = get_snapshots_for_ids(
+        apps.get_model('organization', 'Organization'), units
+    )
+    persons = get_snapshots_for_ids(
+        apps.get_model('person', 'Person'), list({row[1] for row in members})
+    )
+    sites = get_snapshots_for_ids(
+        apps.get_model('geosite', 'Geosite'), list({row[1] for row in stations})
+    )
+
+    Role = apps.get_model('membershipperson', 'Role')
+
+    chain = {
+        organization_id: {
+            'id': organization_id,
+            'name': _name(organizations, organization_id),
+            'depth': depth,
+            'parent': parents.get(organization_id),
+            'members': [],
+            'sites': [],
+        }
+        for organization_id, depth in depths.items()
+    }
+    for organization_id, person_id, role_id, startdate, enddate in members:
+        role = vocabulary_lookup(Role, 'id', role_id)
+        chain[organization_id]['members'].append({
+            'id': person_id,
+            'name': _name(persons, person_id),
+            'role': role.value if role else None,
+            'start': _isoformat(startdate),
+            'end': _isoformat(enddate),
+        })
+    for organization_id, site_id, startdate, enddate in stations:
+        chain[organization_id]['sites'].append({
+            'id': site_id,
+            'name': _name(sites, site_id),
+            'start': _isoformat(startdate),
+            'end': _isoformat(enddate),
+        })
+
+    return sorted(chain.values(), key=lambda unit: (unit['depth'], unit['name'] or ''))
+
+
+def command_chain(request):
+    """
+    JSON chain of command on `date` or from `start` to `end` (YYYY, YYYY-MM
+    or YYYY-MM-DD): the units under `organization` (comma separated ids),
+    or under the organizations `person` was a member of over the period,
+    with their members (only those with role id `role` if given) and
+    sites.
+    """
+    terms = request.GET.dict()
+    errors = {}
+
+    try:
+        start, end = search_period(terms)
+    except ValueError:
+        errors['date'] = 'Dates are written YYYY, YYYY-MM or YYYY-MM-DD'
+
+    try:
+        organization_ids = [int(id_) for id_ in terms.get('organization', '').split(',')
+                            if id_]
+        person_id = int(terms['person']) if terms.get('person') else None
+        role_id = int(terms['role']) if terms.get('role') else None
+    except ValueError:
+        errors['organization'] = 'Organizations, persons and roles are given by id'
+
+    if not errors and not organization_ids and person_id is None:
+        errors['organization'] = 'An organization or a person is required'
+
+    if errors:
+        return HttpResponse(json.dumps({'success': False, 'errors': errors}),
+                            status=400, content_type='application/json')
+
+    if person_id is not None:
+        MembershipPeriod = apps.get_model('membershipperson', 'MembershipPeriod')
+        organization_ids.extend(
+            overlapping(MembershipPeriod.objects.filter(person_id=person_id),
+                        start, end)
+            .values_list('organization_id', flat=True)
+            .distinct()
+        )
+
+    return HttpResponse(json.dumps({
+        'success': True,
+        'start': _isoformat(start),
+        'end': _isoformat(end),
+        'units': chain_of_command(organization_ids, start, end, role_id),
+    }), content_type='application/json')
@@ -0,0 +1,82 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .signals import entity_updated
+from .snapshots import SnapshotMixin
+from .utils import field_models
+
+# Tables linking an entity itself (not one of its fields) to sources:
+# entity -> (table, column of the entity, name of the field cited)
+ENTITY_SOURCES = {
+    ('violation', 'violation'): ('violation.ViolationSource', 'violation', 'source'),
+}
+
+
+def citation_tables(entity_model):
+    """
+    [(field name, table, lookup of the entity id, lookup of the field row
+    id)] of the tables linking `entity_model` to sources: the `sources`
+    tables of its field tables and the ENTITY_SOURCES one.
+    """
+    tables = []
+    for attr_name, model in field_models(entity_model):
+        if 'sources' not in [field.name for field in model._meta.get_fields()]:
+            continue
+        sources = model._meta.get_field('sources')
+        row = sources.m2m_field_name()
+        tables.append((attr_name, sources.rel.through, row + '__object_ref', row))
+
+    label = (entity_model._meta.app_label, entity_model._meta.model_name)
+    if label in ENTITY_SOURCES:
+        table, column, field = ENTITY_SOURCES[label]
+        tables.append((field, apps.get_model(table), column, 'id'))
+
+    return tables
+
+
+def refresh_citations(entity_model, object_ids):
+    Citation = apps.get_model('source', 'Citation')
+    entity_type = entity_model.__name__
+
+    citations = []
+    for field, table, entity_lookup, row_lookup in citation_tables(entity_model):
+        rows = (table.objects
+                .filter(**{entity_lookup + '__in': object_ids})
+                .values_list('source_id', entity_lookup, row_lookup))
+        citations.extend(
+            Citation(source_id=source_id, entity_type=entity_type,
+                     entity_id=entity_id, field=field, field_id=field_id)
+            for source_id, entity_id, field_id in rows
+        )
+
+    with transaction.atomic():
+        Citation.objects.filter(entity_type=entity_type,
+                                entity_id__in=object_ids).delete()
+        Citation.objects.bulk_create(citations)
+
+
+def citations_of(source_id):
+    """
+    Citations of a source, grouped by entity, read in one index scan.
+    """
+    return (apps.get_model('source', 'Citation').objects
+            .filter(source_id=source_id)
+            .order_by('entity_type', 'entity_id', 'field', 'field_id')
+            .values_list('entity_type', 'entity_id', 'field', 'field_id'))
+
+
+@receiver(entity_updated)
+def update_citations(sender, instance, **kwargs):
+    if len(citation_tables(sender)):
+        refresh_citations(sender, [instance.id])
+
+
+@receiver(post_delete)
+def delete_citations(sender, instance, **kwargs):
+    # Deleted sources take their citations along (CASCADE)
+    if isinstance(instance, SnapshotMixin):
+        apps.get_model('source', 'Citation').objects.filter(
+            entity_type=sender.__name__, entity_id=instance.id
+        ).delete()
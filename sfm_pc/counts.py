@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .caching import search_key
+
+COUNT_TIMEOUT = 60 * 60
+
+# Search terms which change the page shown, not the set of results
+PAGING_TERMS = ('page', 'cursor', 'orderby', 'direction', 'order', 'paginator')
+
+
+def normalize_terms(terms):
+    return tuple(sorted(
+        (key, value.strip())
+        for key, value in terms.items()
+        if key not in PAGING_TERMS and value.strip()
+    ))
+
+
+def estimated_count(model):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+            [model._meta.db_table]
+        )
+        row = cursor.fetchone()
+
+    if row is None:
+        return 0
+    return row[0]
+
+
+def search_count(model, terms):
+    """
+    Return (number of results, is an estimate) for `model.search(terms)`.
+
+    The count is a single COUNT(*) without the ordering (search filters are
+    subqueries and never repeat an entity), cached until the next write to
+    an entity it depends on. Unfiltered listings of tables
+    bigger than SEARCH_COUNT_ESTIMATE_THRESHOLD use the planner's estimate.
+    """
+    filters = normalize_terms(terms)
+
+    threshold = getattr(settings, 'SEARCH_COUNT_ESTIMATE_THRESHOLD', None)
+    if not len(filters) and threshold is not None:
+        estimate = estimated_count(model)
+        if estimate >= threshold:
+            return (estimate, True)
+
+    key = search_key(model, 'count', filters)
+    count = cache.get(key)
+    if count is None:
+        count = model.search(terms, ordered=False).count()
+        cache.set(key, count, COUNT_TIMEOUT)
+
+    return (count, False)
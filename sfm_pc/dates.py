@@ -0,0 +1,81 @@
+from django.apps import apps
+from django.db import models
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from .utils import approximate_bounds, approximate_parts
+
+
+class NormalizedDate(models.Model):
+    """
+    Columns derived from the ApproximateDateField `value` of a date field
+    table, written before every save (reverts included): the known year,
+    month and day (None when unknown) and the first and last day the value
+    may stand for. Search filters compare these indexed columns instead of
+    matching the string.
+    """
+    value_year = models.PositiveSmallIntegerField(null=True, db_index=True)
+    value_month = models.PositiveSmallIntegerField(null=True, db_index=True)
+    value_day = models.PositiveSmallIntegerField(null=True, db_index=True)
+    value_lower = models.DateField(null=True, db_index=True)
+    value_upper = models.DateField(null=True, db_index=True)
+
+    class Meta:
+        abstract = True
+
+    def normalize_date(self):
+        self.value_year, self.value_month, self.value_day = approximate_parts(self.value)
+        self.value_lower, self.value_upper = approximate_bounds(self.value)
+
+
+@receiver(pre_save)
+def normalize_before_save(sender, instance, **kwargs):
+    # Also sent by save_base(), which reversion's revert() calls directly
+    if isinstance(instance, NormalizedDate):
+        instance.normalize_date()
+
+
+def date_models():
+    return [model for model in apps.get_models() if issubclass(model, NormalizedDate)]
+
+
+def parse_date_term(value):
+    """
+    (first day, last day) of a 'YYYY', 'YYYY-MM' or 'YYYY-MM-DD' search
+    term, None when it is none of these.
+    """
+    parts = value.split('-')
+    if len(parts) > 3 or not all(part.isdigit() for part in parts):
+        return None
+
+    bounds = approximate_bounds('-'.join(parts + ['00'] * (3 - len(parts))))
+    if bounds == (None, None):
+        return None
+    return bounds
+
+
+def date_conditions(lookup, terms, name):
+    """
+    Conditions on the date field table reached by `lookup` (e.g.
+    'persondeathdate') for the `<name>_year`, `<name>_month` and
+    `<name>_day` terms, and for `<name>_from` and `<name>_to` (YYYY,
+    YYYY-MM or YYYY-MM-DD) keeping the dates that may fall in that range.
+    Malformed terms are ignored.
+    """
+    conditions = {}
+    for part in ('year', 'month', 'day'):
+        value = terms.get(name + '_' + part)
+        if value and value.isdigit():
+            conditions['{}__value_{}'.format(lookup, part)] = int(value)
+
+    start = terms.get(name + '_from')
+    bounds = parse_date_term(start) if start else None
+    if bounds:
+        conditions[lookup + '__value_upper__gte'] = bounds[0]
+
+    end = terms.get(name + '_to')
+    bounds = parse_date_term(end) if end else None
+    if bounds:
+        conditions[lookup + '__value_lower__lte'] = bounds[1]
+
+    return conditions
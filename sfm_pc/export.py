@@ -0,0 +1,82 @@
+import csv
+import uuid
+
+from django.db import connection, transaction
+from django.http import StreamingHttpResponse
+
+from .managers import current_fields
+from .snapshots import get_snapshots_for_ids, snapshot_language
+from .utils import field_model_for
+
+CHUNK_SIZE = 2000
+
+
+class Echo(object):
+    # csv.writer only needs a file-like object with write()
+    def write(self, value):
+        return value
+
+
+def iterate_ids(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Yield the ids of `queryset` in chunks, read through a named (server-side)
+    cursor so the whole result set is never held in memory.
+    """
+    sql, params = queryset.values_list('id', flat=True).query.sql_with_params()
+
+    with transaction.atomic():
+        connection.ensure_connection()
+        cursor = connection.connection.cursor(
+            name='export_{}'.format(uuid.uuid4().hex)
+        )
+        cursor.itersize = chunk_size
+        try:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not len(rows):
+                    break
+                yield [row[0] for row in rows]
+        finally:
+            cursor.close()
+
+
+def csv_rows(queryset, columns, lang, chunk_size=CHUNK_SIZE):
+    """
+    Columns are 'id', a snapshot column, or the name of any other complex
+    field of the entity (looked up in bulk, one query per chunk).
+    """
+    model = queryset.model
+    snapshot_columns = model.get_snapshot_model().columns()
+    field_columns = [column for column in columns
+                     if column != 'id' and column not in snapshot_columns]
+
+    writer = csv.writer(Echo())
+    for ids in iterate_ids(queryset, chunk_size):
+        snapshots = get_snapshots_for_ids(model, ids, lang)
+        fields = {
+            column: current_fields(field_model_for(model, column), ids, lang)
+            for column in field_columns
+        }
+
+        for id_ in ids:
+            snapshot = snapshots[id_].as_dict()
+            row = []
+            for column in columns:
+                if column == 'id':
+                    row.append(id_)
+                elif column in fields:
+                    field = fields[column].get(id_)
+                    value = field.value if field is not None else None
+                    row.append("" if value is None else str(value))
+                else:
+                    row.append(snapshot[column])
+            yield writer.writerow(row)
+
+
+def stream_csv(queryset, filename, columns):
+    rows = csv_rows(queryset, columns, snapshot_language())
+    response = StreamingHttpResponse(rows, content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
+
+    return response
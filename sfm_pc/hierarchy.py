@@ -0,0 +1,233 @@
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models.signals import pre_delete, post_delete
+from django.dispatch import receiver
+
+from .periods import first_values, overlapping
+from .signals import entity_updated
+from .utils import approximate_bounds
+
+# Every path ending at the new link's parent (plus the parent itself)
+# joined to every path starting at its child (plus the child itself), kept
+# when their dates overlap. A link closing a cycle adds no row.
+EXTEND_CLOSURE = """
+    INSERT INTO composition_compositionclosure
+        (ancestor_id, descendant_id, depth, startdate, enddate, path)
+    SELECT above.ancestor_id, below.descendant_id,
+           above.depth + 1 + below.depth,
+           GREATEST(above.startdate, %(start)s::date, below.startdate),
+           LEAST(above.enddate, %(end)s::date, below.enddate),
+           above.path || %(composition)s::integer || below.path
+    FROM (
+        SELECT ancestor_id, depth, startdate, enddate, path
+        FROM composition_compositionclosure
+        WHERE descendant_id = %(parent)s
+        UNION ALL
+        SELECT %(parent)s, 0, NULL, NULL, '{}'::integer[]
+    ) above
+    CROSS JOIN (
+        SELECT descendant_id, depth, startdate, enddate, path
+        FROM composition_compositionclosure
+        WHERE ancestor_id = %(child)s
+        UNION ALL
+        SELECT %(child)s, 0, NULL, NULL, '{}'::integer[]
+    ) below
+    WHERE %(parent)s <> %(child)s
+      AND above.ancestor_id <> below.descendant_id
+      AND NOT EXISTS (
+          SELECT 1 FROM composition_compositionclosure
+          WHERE ancestor_id = %(child)s AND descendant_id = %(parent)s
+      )
+      AND COALESCE(GREATEST(above.startdate, %(start)s::date, below.startdate)
+                   <= LEAST(above.enddate, %(end)s::date, below.enddate), true)
+"""
+
+
+def _model(name):
+    return apps.get_model('composition', name)
+
+
+def _first_value(field_model, composition_id):
+    return first_values(field_model, [composition_id]).get(composition_id)
+
+
+def composition_link(composition_id):
+    """
+    (parent id, child id, first day, last day) of a composition, the days
+    being None when the dates are unknown. None without parent or child.
+    """
+    parent = _first_value(_model('CompositionParent'), composition_id)
+    child = _first_value(_model('CompositionChild'), composition_id)
+    if parent is None or child is None:
+        return None
+
+    start = _first_value(_model('CompositionStartDate'), composition_id)
+    end = _first_value(_model('CompositionEndDate'), composition_id)
+    return (parent, child, approximate_bounds(start)[0], approximate_bounds(end)[1])
+
+
+def _extend(composition_id):
+    link = composition_link(composition_id)
+    if link is None:
+        return
+
+    parent, child, start, end = link
+    with connection.cursor() as cursor:
+        cursor.execute(EXTEND_CLOSURE, {
+            'composition': composition_id,
+            'parent': parent,
+            'child': child,
+            'start': start,
+            'end': end,
+        })
+
+
+def _drop(composition_id):
+    """
+    Delete the closure rows whose path goes through `composition_id` and
+    return the ids of the organizations they linked.
+    """
+    rows = _model('CompositionClosure').objects.filter(path__contains=[composition_id])
+    organization_ids = set()
+    for ancestor_id, descendant_id in rows.values_list('ancestor_id', 'descendant_id'):
+        organization_ids.update((ancestor_id, descendant_id))
+    rows.delete()
+    return organization_ids
+
+
+def _retry_refused(organization_ids, composition_id):
+    """
+    Extend the closure with the other compositions linking two of
+    `organization_ids` which have no row: they were refused for closing a
+    cycle through paths which may just have been removed.
+    """
+    if not organization_ids:
+        return
+
+    candidates = None
+    for name in ('CompositionParent', 'CompositionChild'):
+        ids = set(_model(name).objects.filter(value_id__in=organization_ids)
+                  .values_list('object_ref_id', flat=True))
+        candidates = ids if candidates is None else candidates & ids
+    candidates.discard(composition_id)
+    if not candidates:
+        return
+
+    # A composition in the closure has the row of its own link, path [id]
+    linked = {path[0] for path in _model('CompositionClosure').objects
+              .filter(depth=1, path__overlap=list(candidates))
+              .values_list('path', flat=True)}
+    for candidate in sorted(candidates - linked):
+        _extend(candidate)
+
+
+def refresh_composition(composition_id):
+    """
+    Replace the closure rows whose path goes through `composition_id` with
+    the ones of its current parent and child, and reconsider the links
+    refused while those rows stood.
+    """
+    with transaction.atomic():
+        organization_ids = _drop(composition_id)
+        _extend(composition_id)
+        _retry_refused(organization_ids, composition_id)
+
+
+def rebuild_hierarchy():
+    CompositionClosure = _model('CompositionClosure')
+    Composition = _model('Composition')
+
+    ids = list(Composition.objects.order_by('id').values_list('id', flat=True))
+    with transaction.atomic():
+        CompositionClosure.objects.all().delete()
+        for composition_id in ids:
+            _extend(composition_id)
+
+    return len(ids)
+
+
+def _valid_at(rows, date):
+    if date is None:
+        return rows
+    return overlapping(rows, date, date)
+
+
+def subtree(organization_id, date=None):
+    """
+    Organizations under `organization_id` at any depth, at `date` (a
+    datetime.date) or at any time.
+    """
+    rows = _model('CompositionClosure').objects.filter(
+        ancestor_id=organization_id
+    )
+    return apps.get_model('organization', 'Organization').objects.filter(
+        id__in=_valid_at(rows, date).values('descendant_id')
+    )
+
+
+def ancestors(organization_id, date=None):
+    """
+    Closure rows above `organization_id`, nearest first, with their
+    `ancestor` loaded. An ancestor reached by several paths comes once per
+    path.
+    """
+    rows = _model('CompositionClosure').objects.filter(
+        descendant_id=organization_id
+    )
+    return (_valid_at(rows, date)
+            .select_related('ancestor')
+            .order_by('depth', 'ancestor_id'))
+
+
+def superior_units(organization_ids, date=None):
+    """
+    {organization id: id of its parent} for `organization_ids`, at `date`.
+    Without a date the latest link wins, open ended ones first.
+    """
+    rows = _model('CompositionClosure').objects.filter(
+        descendant_id__in=organization_ids, depth=1
+    )
+    rows = (_valid_at(rows, date)
+            .order_by('descendant', '-enddate', '-startdate', 'id')
+            .distinct('descendant')
+            .values_list('descendant_id', 'ancestor_id'))
+    return dict(rows)
+
+
+def superior_unit(organization_id, date=None):
+    parent_id = superior_units([organization_id], date).get(organization_id)
+    if parent_id is None:
+        return None
+    return apps.get_model('organization', 'Organization').objects.get(id=parent_id)
+
+
+@receiver(entity_updated)
+def update_hierarchy(sender, instance, **kwargs):
+    if (sender._meta.app_label, sender._meta.model_name) == ('composition', 'composition'):
+        refresh_composition(instance.id)
+
+
+@receiver(pre_delete)
+def collect_compositions(sender, instance, **kwargs):
+    # Compositions lose their parent or child with the organization but
+    # stay in place, their paths have to be rebuilt without it
+    if (sender._meta.app_label, sender._meta.model_name) != ('organization', 'organization'):
+        return
+
+    instance._hierarchy_compositions = set()
+    for name in ('CompositionParent', 'CompositionChild'):
+        instance._hierarchy_compositions.update(
+            _model(name).objects.filter(value=instance)
+            .values_list('object_ref_id', flat=True)
+        )
+
+
+@receiver(post_delete)
+def update_hierarchy_on_delete(sender, instance, **kwargs):
+    label = (sender._meta.app_label, sender._meta.model_name)
+    if label == ('composition', 'composition'):
+        with transaction.atomic():
+            _retry_refused(_drop(instance.id), instance.id)
+    elif label == ('organization', 'organization'):
+        for composition_id in getattr(instance, '_hierarchy_compositions', ()):
+            refresh_composition(composition_id)
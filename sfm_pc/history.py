@@ -0,0 +1,249 @@
+from datetime import datetime, time
+
+import reversion
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.html import escape
+from reversion.models import Version
+
+from .caching import make_key
+from .snapshots import snapshot_language
+from .utils import entity_for_name, field_model_for, field_models
+
+HISTORY_PER_PAGE = 20
+HISTORY_TIMEOUT = 60 * 60 * 24
+
+
+def resolve_versions(field_model, versions):
+    """
+    [(version, deserialized fields, value, [Source])] of versions of rows
+    of `field_model`, the related objects of foreign key values and the
+    sources being read with one query each.
+    """
+    fields = [version.field_dict for version in versions]
+    names = [field.name for field in field_model._meta.get_fields()]
+
+    value_field = field_model._meta.get_field('value')
+    related = {}
+    if value_field.rel is not None:
+        ids = {field['value'] for field in fields if field.get('value') is not None}
+        related = value_field.rel.to.objects.in_bulk(list(ids))
+
+    sources = {}
+    if 'sources' in names:
+        Source = field_model._meta.get_field('sources').rel.to
+        ids = {id_ for field in fields for id_ in field.get('sources', [])}
+        sources = Source.objects.in_bulk(list(ids))
+
+    resolved = []
+    for version, field in zip(versions, fields):
+        value = field.get('value')
+        if value_field.rel is not None:
+            value = related.get(value)
+        resolved.append((version, field, value, [sources[id_] for id_
+                                                 in field.get('sources', [])
+                                                 if id_ in sources]))
+    return resolved
+
+
+class FieldHistory(object):
+    """
+    The reversion history of the `field_name` field of an entity (of its
+    row `field_id` for fields with several rows), in `lang` for translated
+    fields. Every lookup is on the (content type, object_id_int) index of
+    reversion's versions and only the versions of the page asked for are
+    deserialized.
+    """
+
+    def __init__(self, object_type, object_id, field_name, field_id=None, lang=None):
+        self.field_model = field_model_for(entity_for_name(object_type), field_name)
+        self.object_id = int(object_id)
+        self.field_name = field_name
+        self.field_id = int(field_id) if field_id else None
+        self.columns = [field.name for field in self.field_model._meta.get_fields()]
+        self.translated = 'lang' in self.columns
+        self.lang = snapshot_language(lang) if self.translated else None
+
+    def rows(self):
+        rows = self.field_model.objects.filter(object_ref_id=self.object_id)
+        if self.field_id is not None:
+            rows = rows.filter(id=self.field_id)
+        if self.translated:
+            rows = rows.filter(lang=self.lang)
+        return rows
+
+    def versions(self):
+        return (Version.objects
+                .filter(content_type=ContentType.objects.get_for_model(self.field_model),
+                        object_id_int__in=self.rows().values('id'))
+                .order_by('-id'))
+
+    def watermark(self):
+        # Id of the latest version: any new revision of the field changes it
+        return self.versions().aggregate(latest=Max('id'))['latest']
+
+    def langs(self):
+        """
+        [{'value': code, 'label': name}] of the languages the field has
+        values in, the current one first.
+        """
+        if not self.translated:
+            return []
+
+        used = set(self.field_model.objects.filter(object_ref_id=self.object_id)
+                   .values_list('lang', flat=True))
+        names = dict(settings.LANGUAGES)
+        current = snapshot_language()
+        codes = sorted(used & set(names), key=lambda code: (code != current, code))
+        return [{'value': code, 'label': str(names[code])} for code in codes]
+
+    def page(self, number):
+        """
+        {'versions': [{'id', 'value', 'sources', 'date'}], 'pagination'} of
+        page `number`, newest first, cached until the field gets a new
+        version.
+        """
+        key = make_key('history', self.field_model.__name__, self.object_id,
+                       self.field_id, self.lang, self.watermark(), str(number))
+        page = cache.get(key)
+        if page is None:
+            page = self._page(number)
+            cache.set(key, page, HISTORY_TIMEOUT)
+        return page
+
+    def _page(self, number):
+        paginator = Paginator(self.versions().select_related('revision'),
+                              HISTORY_PER_PAGE)
+        try:
+            versions = paginator.page(number)
+        except PageNotAnInteger:
+            versions = paginator.page(1)
+        except EmptyPage:
+            versions = paginator.page(paginator.num_pages)
+
+        results = []
+        for version, field, value, sources in resolve_versions(self.field_model,
+                                                               list(versions)):
+            results.append({
+                'id': version.id,
+                'value': None if value is None else escape(str(value)),
+                'sources': '<br>'.join(escape(str(source)) for source in sources),
+                'date': version.revision.date_created.isoformat(),
+            })
+
+        return {
+            'versions': results,
+            'pagination': {
+                'count': paginator.count,
+                'per_page': HISTORY_PER_PAGE,
+                'page': versions.number,
+                'num_pages': paginator.num_pages,
+                'previous': versions.number - 1 if versions.has_previous() else None,
+                'next': versions.number + 1 if versions.has_next() else None,
+            },
+        }
+
+
+def parse_moment(value):
+    """
+    Aware datetime of an ISO date and time, or of the end of an ISO date
+    (UTC unless an offset is given). Raises ValueError when malformed.
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.max)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, timezone.utc)
+    return moment
+
+
+def versions_at(entity_model, object_id, moment):
+    """
+    [(attribute name, field model, version)] of the latest version saved
+    at or before `moment` of every current row of the fields of an entity,
+    with one DISTINCT ON query per field table on the (content type,
+    object_id_int, id) index. Rows created after `moment` have none.
+    """
+    found = []
+    for attr_name, field_model in field_models(entity_model):
+        rows = field_model.objects.filter(object_ref_id=object_id).values('id')
+        versions = (Version.objects
+                    .filter(content_type=ContentType.objects.get_for_model(field_model),
+                            object_id_int__in=rows,
+                            revision__date_created__lte=moment)
+                    .select_related('revision')
+                    .order_by('object_id_int', '-id')
+                    .distinct('object_id_int'))
+        found.extend((attr_name, field_model, version) for version in versions)
+    return found
+
+
+def entity_at(entity_model, object_id, moment):
+    """
+    {attribute: [{'id', 'lang', 'value', 'confidence', 'sources', 'version',
+    'date'}]} of the fields of an entity as they stood at `moment`, one
+    entry per row (per language for translated fields).
+    """
+    by_model = {}
+    for attr_name, field_model, version in versions_at(entity_model, object_id, moment):
+        by_model.setdefault((attr_name, field_model), []).append(version)
+
+    fields = {}
+    for (attr_name, field_model), versions in by_model.items():
+        for version, field, value, sources in resolve_versions(field_model, versions):
+            fields.setdefault(attr_name, []).append({
+                'id': version.object_id_int,
+                'lang': field.get('lang'),
+                'value': None if value is None else str(value),
+                'confidence': field.get('confidence'),
+                'sources': [{'id': source.id, 'source': source.source}
+                            for source in sources],
+                'version': version.id,
+                'date': version.revision.date_created.isoformat(),
+            })
+    return fields
+
+
+def field_versions(entity_model, object_id, version_ids):
+    """
+    Versions among `version_ids` belonging to the field rows of an entity,
+    in one query per field table they are of.
+    """
+    versions = Version.objects.filter(id__in=version_ids).select_related('content_type')
+    tables = {field_model: [] for attr_name, field_model in field_models(entity_model)}
+    for version in versions:
+        model = version.content_type.model_class()
+        if model in tables:
+            tables[model].append(version)
+
+    kept = []
+    for field_model, model_versions in tables.items():
+        if not model_versions:
+            continue
+        rows = set(field_model.objects.filter(
+            object_ref_id=object_id,
+            id__in=[version.object_id_int for version in model_versions]
+        ).values_list('id', flat=True))
+        kept.extend(version for version in model_versions
+                    if version.object_id_int in rows)
+    return kept
+
+
+def revert_versions(versions, comment='Batch revert'):
+    """
+    Restore the field rows of `versions` (their values, translations and
+    sources) in one transaction, recorded as a single revision.
+    """
+    with transaction.atomic(), reversion.create_revision():
+        for version in versions:
+            version.revert()
+        reversion.set_comment(comment)
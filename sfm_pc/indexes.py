@@ -0,0 +1,52 @@
+from django.db import migrations
+
+
+def trigram_extension():
+    # Left in place on reverse, other migrations may depend on it
+    return migrations.RunSQL(
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+        migrations.RunSQL.noop
+    )
+
+
+def trigram_index(table, column='value'):
+    """
+    GIN trigram index on UPPER(column::text), the exact expression Django
+    compares for `__icontains` on Postgres, so those filters become bitmap
+    index scans instead of sequential scans.
+    """
+    name = '{}_{}_trgm'.format(table, column)
+    return migrations.RunSQL(
+        'CREATE INDEX {} ON {} USING gin (UPPER({}::text) gin_trgm_ops)'.format(
+            name, table, column
+        ),
+        'DROP INDEX IF EXISTS {}'.format(name)
+    )
+
+
+def geography_index(table, column='value'):
+    """
+    GiST index on the column cast to geography, used by the metre based
+    ST_DWithin filters of sfm_pc.spatial. The plain geometry index is
+    created by GeoDjango with the column.
+    """
+    name = '{}_{}_geog'.format(table, column)
+    return migrations.RunSQL(
+        'CREATE INDEX {} ON {} USING gist (({}::geography))'.format(
+            name, table, column
+        ),
+        'DROP INDEX IF EXISTS {}'.format(name)
+    )
+
+
+def period_index(table):
+    """
+    GiST index on daterange(startdate, enddate, '[]'), the expression the
+    overlap filters of sfm_pc.periods compare (NULL bounds are open).
+    """
+    name = '{}_period'.format(table)
+    return migrations.RunSQL(
+        "CREATE INDEX {} ON {} USING gist "
+        "(daterange(startdate, enddate, '[]'))".format(name, table),
+        'DROP INDEX IF EXISTS {}'.format(name)
+    )
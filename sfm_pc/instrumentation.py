@@ -0,0 +1,210 @@
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class RequestStats(object):
+    """
+    Per view (URL name) totals since the worker started.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def record(self, name, queries, db_time, template_time, total_time):
+        # `queries` and `db_time` are None when queries are not recorded
+        with self.lock:
+            stats = self.views.setdefault(name, {
+                'requests': 0, 'measured': 0, 'queries': 0, 'max_queries': 0,
+                'db_time': 0.0, 'template_time': 0.0, 'total_time': 0.0,
+                'max_time': 0.0,
+            })
+            stats['requests'] += 1
+            if queries is not None:
+                stats['measured'] += 1
+                stats['queries'] += queries
+                stats['max_queries'] = max(stats['max_queries'], queries)
+                stats['db_time'] += db_time
+            stats['template_time'] += template_time
+            stats['total_time'] += total_time
+            stats['max_time'] = max(stats['max_time'], total_time)
+
+    def summary(self):
+        with self.lock:
+            views = {name: dict(stats) for name, stats in self.views.items()}
+
+        summary = []
+        for name, stats in views.items():
+            requests = stats['requests']
+            measured = stats['measured']
+            summary.append({
+                'view': name,
+                'requests': requests,
+                'avg_queries': (round(stats['queries'] / measured, 1)
+                                if measured else None),
+                'max_queries': stats['max_queries'] if measured else None,
+                'avg_db_ms': round(stats['db_time'] / measured, 1) if measured else None,
+                'avg_template_ms': round(stats['template_time'] / requests, 1),
+                'avg_total_ms': round(stats['total_time'] / requests, 1),
+                'max_total_ms': round(stats['max_time'], 1),
+            })
+
+        return sorted(summary, key=lambda row: -row['avg_total_ms'] * row['requests'])
+
+    def reset(self):
+        with self.lock:
+            self.views = {}
+
+
+request_stats = RequestStats()
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name
+
+
+class InstrumentationMiddleware(object):
+    """
+    Measures the number of SQL queries, the time spent in the database and
+    in template rendering and the total latency of each request (all in
+    milliseconds). They are added to `request_stats`, sent as X-Query-Count,
+    X-Query-Time, X-Template-Time and X-Response-Time headers when DEBUG is
+    on, and checked against QUERY_BUDGETS, e.g.:
+    ------
+    QUERY_BUDGETS = {
+        'person_search': 10,
+    }
+    ------
+    A view going over its budget logs a warning, or raises
+    QueryBudgetExceeded when QUERY_BUDGET_STRICT is set (in tests).
+
+    Queries are only recorded when QUERY_INSTRUMENTATION is set (DEBUG by
+    default): it keeps the SQL of every query of the request in memory.
+    Streamed responses (CSV exports) are measured once their content has
+    been consumed, their queries included, and get no headers.
+
+    Put it first in MIDDLEWARE_CLASSES so the other middlewares are
+    measured too.
+    """
+
+    def process_request(self, request):
+        request._instrumentation = {
+            'start': time.perf_counter(),
+            'template_time': 0.0,
+            'queries': {},
+        }
+        if not getattr(settings, 'QUERY_INSTRUMENTATION', settings.DEBUG):
+            return
+        for connection in connections.all():
+            request._instrumentation['queries'][connection.alias] = (
+                connection.force_debug_cursor, len(connection.queries_log)
+            )
+            connection.force_debug_cursor = True
+
+    def process_template_response(self, request, response):
+        instrumentation = getattr(request, '_instrumentation', None)
+        if instrumentation is None:
+            return response
+
+        render = response.render
+
+        def timed_render():
+            start = time.perf_counter()
+            try:
+                return render()
+            finally:
+                instrumentation['template_time'] += (time.perf_counter() - start) * 1000
+
+        response.render = timed_render
+        return response
+
+    def process_response(self, request, response):
+        instrumentation = getattr(request, '_instrumentation', None)
+        if instrumentation is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self.measured_stream(
+                request, response.streaming_content
+            )
+            return response
+
+        queries, db_time, total_time = self.measure(request)
+        if settings.DEBUG:
+            if queries is not None:
+                response['X-Query-Count'] = queries
+                response['X-Query-Time'] = '{:.1f}'.format(db_time)
+            response['X-Template-Time'] = '{:.1f}'.format(
+                instrumentation['template_time']
+            )
+            response['X-Response-Time'] = '{:.1f}'.format(total_time)
+        return response
+
+    def measured_stream(self, request, content):
+        try:
+            for chunk in content:
+                yield chunk
+        finally:
+            self.measure(request)
+
+    def measure(self, request):
+        """
+        (queries, database time, total time) of a request, recorded and
+        checked against its budget; the queries and their time are None
+        when they were not recorded.
+        """
+        instrumentation = request._instrumentation
+        total_time = (time.perf_counter() - instrumentation['start']) * 1000
+
+        queries = db_time = None
+        for connection in connections.all():
+            if connection.alias not in instrumentation['queries']:
+                continue
+            forced, start = instrumentation['queries'][connection.alias]
+            connection.force_debug_cursor = forced
+
+            executed = list(connection.queries_log)[start:]
+            queries = (queries or 0) + len(executed)
+            db_time = (db_time or 0.0) + sum(float(query['time'])
+                                             for query in executed) * 1000
+
+        name = view_name(request)
+        request_stats.record(name, queries, db_time,
+                             instrumentation['template_time'], total_time)
+
+        budget = getattr(settings, 'QUERY_BUDGETS', {}).get(name)
+        if budget is not None and queries is not None and queries > budget:
+            message = '{} ran {} queries, its budget is {}'.format(
+                name, queries, budget
+            )
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return (queries, db_time, total_time)
+
+
+@staff_member_required
+def instrumentation_stats(request):
+    if request.method == 'POST':
+        request_stats.reset()
+
+    return HttpResponse(json.dumps({
+        'views': request_stats.summary(),
+    }), content_type='application/json')
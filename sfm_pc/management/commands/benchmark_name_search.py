@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from person.models import Person
+
+GENERATE_NAMES = """
+    WITH persons AS (
+        INSERT INTO person_person (id)
+        SELECT nextval(pg_get_serial_sequence('person_person', 'id'))
+        FROM generate_series(1, %s)
+        RETURNING id
+    )
+    INSERT INTO person_personname (lang, confidence, value, object_ref_id)
+    SELECT 'en', '1', 'Person ' || md5(id::text), id FROM persons
+"""
+
+
+class Command(BaseCommand):
+    help = ('Time the person name search against generated names, with and '
+            'without the trigram index. Nothing is kept in the database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--term', default='c4ca4')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--explain', action='store_true',
+                            help='Print the query plans')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                self.stdout.write('Generating {} names...'.format(options['rows']))
+                cursor.execute(GENERATE_NAMES, [options['rows']])
+                cursor.execute('ANALYZE person_person')
+                cursor.execute('ANALYZE person_personname')
+
+                query = Person.search({'name': options['term']})
+                self.report('trigram index', cursor, query, options)
+
+                cursor.execute('SET LOCAL enable_bitmapscan = off')
+                cursor.execute('SET LOCAL enable_indexscan = off')
+                self.report('sequential scan', cursor, query, options)
+
+            transaction.set_rollback(True)
+
+    def report(self, label, cursor, query, options):
+        page = query[:15]
+        sql, params = page.query.sql_with_params()
+
+        timings = []
+        for i in range(options['repeat']):
+            start = time.perf_counter()
+            cursor.execute(sql, params)
+            cursor.fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        self.stdout.write('{}: median {:.1f}ms, best {:.1f}ms'.format(
+            label, timings[len(timings) // 2], timings[0]
+        ))
+
+        if options['explain']:
+            cursor.execute('EXPLAIN ANALYZE ' + sql, params)
+            for row in cursor.fetchall():
+                self.stdout.write('    ' + row[0])
@@ -0,0 +1,319 @@
+import random
+
+import reversion
+from django.conf import settings
+from django.contrib.gis.geos import Point, Polygon
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_date_extensions.fields import ApproximateDate
+
+from area.models import Area, Code
+from association.models import Association
+from composition.models import Composition
+from emplacement.models import Emplacement
+from geosite.models import Geosite
+from membershipperson.models import MembershipPerson, Role, Rank, Context
+from organization.models import Organization, Classification
+from person.models import Person
+from source.models import Source, source_hash
+from violation.models import Violation, ViolationSource, ViolationType, Type
+from sfm_pc.citations import refresh_citations
+from sfm_pc.dates import NormalizedDate
+from sfm_pc.hierarchy import rebuild_hierarchy
+from sfm_pc.periods import refresh_periods
+from sfm_pc.snapshots import refresh_snapshots_for_ids, snapshot_languages
+from sfm_pc.spatial import refresh_association_links, refresh_area_shapes
+from sfm_pc.utils import field_model_for, reserve_ids
+
+BATCH_SIZE = 1000
+
+# Number of records of each kind for --scale 1
+COUNTS = {
+    'sources': 500,
+    'persons': 1000,
+    'organizations': 200,
+    'areas': 100,
+    'sites': 300,
+    'associations': 200,
+    'emplacements': 300,
+    'compositions': 200,
+    'memberships': 2000,
+    'violations': 5000,
+}
+
+VOCABULARIES = {
+    Classification: ['Army', 'Police', 'Navy', 'Air Force', 'Militia'],
+    Rank: ['General', 'Colonel', 'Major', 'Captain', 'Lieutenant', 'Sergeant'],
+    Role: ['Commander', 'Deputy Commander', 'Chief of Staff', 'Member'],
+    Context: ['Appointment', 'Promotion', 'Retirement', 'Death'],
+    Code: ['Country', 'State', 'Municipality'],
+}
+
+FIRST_NAMES = ['Ana', 'Carlos', 'Fatima', 'Jean', 'Luis', 'Maria', 'Miguel',
+               'Nadia', 'Omar', 'Pedro', 'Rosa', 'Samuel', 'Sofia', 'Yusuf']
+LAST_NAMES = ['Alvarez', 'Benitez', 'Castro', 'Diallo', 'Fernandez', 'Garcia',
+              'Hernandez', 'Ibrahim', 'Lopez', 'Mendoza', 'Ortiz', 'Ramirez',
+              'Sanchez', 'Traore', 'Vargas']
+UNIT_KINDS = ['Battalion', 'Brigade', 'Division', 'Regiment', 'Command',
+              'Company', 'Squadron']
+PLACES = ['Norte', 'Sur', 'Central', 'Costa', 'Sierra', 'Valle', 'Rio',
+          'Montana', 'Llano', 'Frontera']
+
+
+class Command(BaseCommand):
+    help = ('Generate a synthetic dataset (entities, sources, translations and '
+            'revisions) for benchmarking')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1,
+                            help='Multiplier of the default record counts')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--translated', type=float, default=0.2,
+                            help='Share of names also given in the other languages')
+        parser.add_argument('--revisions', type=float, default=0.1,
+                            help='Share of entities given a revision history')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.translated = options['translated']
+        self.lang = settings.LANGUAGE_CODE
+        counts = {name: max(1, int(count * options['scale']))
+                  for name, count in COUNTS.items()}
+
+        with transaction.atomic():
+            self.vocabularies()
+
+            self.sources = self.create_sources(counts['sources'])
+            self.generate(counts)
+
+            for entity_model, ids, attr_names in self.created:
+                self.revisions(entity_model, ids, attr_names, options['revisions'])
+
+        for entity_model, ids, attr_names in self.created:
+            for start in range(0, len(ids), BATCH_SIZE):
+                refresh_snapshots_for_ids(entity_model, ids[start:start + BATCH_SIZE])
+                refresh_citations(entity_model, ids[start:start + BATCH_SIZE])
+            for start in range(0, len(ids), BATCH_SIZE):
+                if entity_model is Area:
+                    refresh_area_shapes(ids[start:start + BATCH_SIZE])
+                elif entity_model is Association:
+                    refresh_association_links(ids[start:start + BATCH_SIZE])
+                elif entity_model in (MembershipPerson, Emplacement):
+                    refresh_periods(entity_model, ids[start:start + BATCH_SIZE])
+            self.stdout.write('{}: {} created'.format(entity_model.__name__, len(ids)))
+
+        rebuild_hierarchy()
+
+    def generate(self, counts):
+        rand = self.random
+        self.created = []
+
+        persons = self.entities(Person, counts['persons'], {
+            'name': lambda i: '{} {}'.format(rand.choice(FIRST_NAMES),
+                                             rand.choice(LAST_NAMES)),
+            'alias': lambda i: rand.choice(LAST_NAMES) if rand.random() < 0.3 else None,
+            'deathdate': lambda i: self.date() if rand.random() < 0.1 else None,
+        })
+
+        organizations = self.entities(Organization, counts['organizations'], {
+            'name': lambda i: '{} {} {}'.format(rand.randint(1, 99),
+                                                rand.choice(UNIT_KINDS),
+                                                rand.choice(PLACES)),
+            'alias': lambda i: rand.choice(PLACES) if rand.random() < 0.3 else None,
+            'classification': lambda i: rand.choice(self.vocabulary[Classification]),
+            'foundingdate': lambda i: self.date(),
+            'dissolutiondate': lambda i: self.date() if rand.random() < 0.2 else None,
+            'realfounding': lambda i: rand.random() < 0.5,
+            'realdissolution': lambda i: rand.random() < 0.5,
+        })
+
+        def area_geometry(i):
+            lng, lat = rand.uniform(-110, -70), rand.uniform(-30, 30)
+            size = rand.uniform(0.05, 2)
+            return Polygon.from_bbox((lng, lat, lng + size, lat + size))
+
+        areas = self.entities(Area, counts['areas'], {
+            'name': lambda i: '{} {}'.format(rand.choice(PLACES), i),
+            'code': lambda i: rand.choice(self.vocabulary[Code]),
+            'geoname': lambda i: rand.randint(1000000, 9999999),
+            'geometry': area_geometry,
+        })
+
+        sites = self.entities(Geosite, counts['sites'], {
+            'name': lambda i: 'Base {} {}'.format(rand.choice(PLACES), i),
+            'adminlevel1': lambda i: rand.choice(PLACES),
+            'adminlevel2': lambda i: rand.choice(PLACES),
+            'coordinates': lambda i: Point(rand.uniform(-110, -70),
+                                           rand.uniform(-30, 30)),
+            'geoname': lambda i: rand.choice(PLACES),
+            'geonameid': lambda i: str(rand.randint(1000000, 9999999)),
+        })
+
+        self.entities(Association, counts['associations'], {
+            'startdate': lambda i: self.date(),
+            'enddate': lambda i: self.date() if rand.random() < 0.3 else None,
+            'organization': lambda i: rand.choice(organizations),
+            'area': lambda i: rand.choice(areas),
+        })
+
+        self.entities(Emplacement, counts['emplacements'], {
+            'startdate': lambda i: self.date(),
+            'enddate': lambda i: self.date() if rand.random() < 0.3 else None,
+            'organization': lambda i: rand.choice(organizations),
+            'site': lambda i: rand.choice(sites),
+        })
+
+        # Parents always have a lower index than their child: no cycles
+        self.entities(Composition, min(counts['compositions'], len(organizations) - 1), {
+            'parent': lambda i: organizations[rand.randint(0, i)],
+            'child': lambda i: organizations[i + 1],
+            'startdate': lambda i: self.date(),
+            'enddate': lambda i: self.date() if rand.random() < 0.3 else None,
+            'classification': lambda i: rand.choice(self.vocabulary[Classification]),
+        })
+
+        self.entities(MembershipPerson, counts['memberships'], {
+            'member': lambda i: rand.choice(persons),
+            'organization': lambda i: rand.choice(organizations),
+            'role': lambda i: rand.choice(self.vocabulary[Role]),
+            'title': lambda i: rand.choice(UNIT_KINDS) + ' commander',
+            'rank': lambda i: rand.choice(self.vocabulary[Rank]),
+            'realstart': lambda i: rand.random() < 0.5,
+            'realend': lambda i: rand.random() < 0.5,
+            'startcontext': lambda i: rand.choice(self.vocabulary[Context]),
+            'endcontext': lambda i: rand.choice(self.vocabulary[Context]),
+            'firstciteddate': lambda i: self.date(),
+            'lastciteddate': lambda i: self.date(),
+        })
+
+        violations = self.entities(Violation, counts['violations'], {
+            'startdate': lambda i: self.date(),
+            'enddate': lambda i: self.date(),
+            'locationdescription': lambda i: 'Near {}'.format(rand.choice(PLACES)),
+            'adminlevel1': lambda i: rand.choice(PLACES),
+            'adminlevel2': lambda i: rand.choice(PLACES),
+            'geoname': lambda i: rand.choice(PLACES),
+            'geonameid': lambda i: str(rand.randint(1000000, 9999999)),
+            'location': lambda i: Point(rand.uniform(-110, -70), rand.uniform(-30, 30)),
+            'description': lambda i: 'Incident reported in {}'.format(rand.choice(PLACES)),
+            'perpetrator': lambda i: '{} {}'.format(rand.choice(FIRST_NAMES),
+                                                    rand.choice(LAST_NAMES)),
+            'perpetratororganization': lambda i: '{} {}'.format(rand.choice(UNIT_KINDS),
+                                                                rand.choice(PLACES)),
+        })
+
+        ViolationType.objects.bulk_create([
+            ViolationType(object_ref_id=id_, value_id=rand.choice(self.vocabulary[Type]))
+            for id_ in violations
+        ], batch_size=BATCH_SIZE)
+        ViolationSource.objects.bulk_create([
+            ViolationSource(violation_id=id_, source_id=rand.choice(self.sources))
+            for id_ in violations
+        ], batch_size=BATCH_SIZE)
+
+    def vocabularies(self):
+        self.vocabulary = {}
+        for model, values in VOCABULARIES.items():
+            for value in values:
+                model.objects.get_or_create(value=value)
+            self.vocabulary[model] = list(model.objects.values_list('id', flat=True))
+
+        for code in ['Killing', 'Torture', 'Disappearance', 'Arbitrary detention']:
+            Type.objects.get_or_create(code=code)
+        self.vocabulary[Type] = list(Type.objects.values_list('id', flat=True))
+
+    def create_sources(self, count):
+        ids = reserve_ids(Source, count)
+        texts = ['http://example.com/report/{}'.format(id_) for id_ in ids]
+        Source.objects.bulk_create([
+            Source(id=id_, source=text, source_hash=source_hash(text))
+            for id_, text in zip(ids, texts)
+        ], batch_size=BATCH_SIZE)
+        return ids
+
+    def date(self):
+        year = self.random.randint(1950, 2015)
+        month = self.random.choice([0] + list(range(1, 13)))
+        day = self.random.randint(1, 28) if month and self.random.random() < 0.7 else 0
+        return ApproximateDate(year, month, day)
+
+    def entities(self, entity_model, count, values):
+        """
+        Create `count` entities with one row per field in `values`, a dict
+        of {attribute: function(index) -> value (an id for foreign keys) or
+        None to leave the field empty}. Returns the new entity ids.
+        """
+        ids = reserve_ids(entity_model, count)
+        entity_model.objects.bulk_create(
+            [entity_model(id=id_) for id_ in ids], batch_size=BATCH_SIZE
+        )
+
+        for attr_name, make_value in values.items():
+            self.fields(field_model_for(entity_model, attr_name), attr_name, ids,
+                        make_value)
+
+        self.created.append((entity_model, ids, list(values)))
+        return ids
+
+    def fields(self, field_model, attr_name, object_ids, make_value):
+        columns = [field.name for field in field_model._meta.get_fields()]
+        is_fk = field_model._meta.get_field('value').rel is not None
+        languages = snapshot_languages()
+
+        rows = []
+        for index, object_id in enumerate(object_ids):
+            value = make_value(index)
+            if value is None:
+                continue
+
+            langs = [self.lang]
+            if (attr_name in ('name', 'alias') and 'lang' in columns and
+                    self.random.random() < self.translated):
+                langs = languages
+
+            for lang in langs:
+                row = field_model(object_ref_id=object_id)
+                if is_fk:
+                    row.value_id = value
+                elif lang != self.lang:
+                    row.value = '{} ({})'.format(value, lang)
+                else:
+                    row.value = value
+                if 'lang' in columns:
+                    row.lang = lang
+                if 'confidence' in columns:
+                    row.confidence = self.random.choice(['1', '2', '3'])
+                if isinstance(row, NormalizedDate):
+                    row.normalize_date()
+                rows.append(row)
+
+        for row, id_ in zip(rows, reserve_ids(field_model, len(rows))):
+            row.id = id_
+        field_model.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+        if 'sources' in columns:
+            sources = field_model._meta.get_field('sources')
+            through = sources.rel.through
+            through.objects.bulk_create([
+                through(**{sources.m2m_field_name() + '_id': row.id,
+                           'source_id': self.random.choice(self.sources)})
+                for row in rows
+            ], batch_size=BATCH_SIZE)
+
+    def revisions(self, entity_model, ids, attr_names, share):
+        sample = [id_ for id_ in ids if self.random.random() < share]
+        if not sample:
+            return
+
+        rows = {}
+        for attr_name in attr_names:
+            field_model = field_model_for(entity_model, attr_name)
+            if not reversion.is_registered(field_model):
+                continue
+            for row in field_model.objects.filter(object_ref_id__in=sample):
+                rows.setdefault(row.object_ref_id, []).append(row)
+
+        for object_rows in rows.values():
+            reversion.default_revision_manager.save_revision(
+                object_rows, comment='Generated dataset'
+            )
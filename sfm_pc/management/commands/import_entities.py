@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from sfm_pc.bulk_import import BATCH_SIZE, import_csv
+from sfm_pc.utils import entity_for_name
+
+# Errors listed in full before only counting them
+MAX_ERRORS_SHOWN = 100
+
+
+class Command(BaseCommand):
+    help = ('Create entities from a CSV file with one column per field '
+            '(name, alias, organization...) plus sources and confidence')
+
+    def add_arguments(self, parser):
+        parser.add_argument('entity', help='Entity name, e.g. Person or MembershipPerson')
+        parser.add_argument('path', help='CSV file, the first line naming the columns')
+        parser.add_argument('--lang', help='Language of the translated fields')
+        parser.add_argument('--comment', default='Bulk import',
+                            help='Comment of the revisions')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            entity_model = entity_for_name(options['entity'])
+        except LookupError:
+            raise CommandError('Unknown entity {}'.format(options['entity']))
+
+        with open(options['path'], newline='', encoding='utf-8') as csv_file:
+            try:
+                report = import_csv(entity_model, csv_file, lang=options['lang'],
+                                    comment=options['comment'],
+                                    batch_size=options['batch_size'])
+            except ValueError as error:
+                raise CommandError(str(error))
+
+        for line, errors in report.errors[:MAX_ERRORS_SHOWN]:
+            for column, message in sorted(errors.items()):
+                self.stderr.write('Line {}, {}: {}'.format(line, column, message))
+        if len(report.errors) > MAX_ERRORS_SHOWN:
+            self.stderr.write('... and {} more rejected rows'.format(
+                len(report.errors) - MAX_ERRORS_SHOWN
+            ))
+
+        self.stdout.write('{}: {} created, {} rejected in {:.1f}s ({:.0f} rows/s)'.format(
+            entity_model.__name__, len(report.created), len(report.errors),
+            report.elapsed, report.rate
+        ))
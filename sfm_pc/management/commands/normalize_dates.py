@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from sfm_pc.dates import date_models
+from sfm_pc.utils import approximate_bounds, approximate_parts
+
+BATCH_SIZE = 1000
+
+UPDATE = """
+    UPDATE {table} SET value_year = v.year, value_month = v.month,
+                       value_day = v.day, value_lower = v.lower,
+                       value_upper = v.upper
+    FROM (VALUES {rows}) AS v (id, year, month, day, lower, upper)
+    WHERE {table}.id = v.id
+"""
+ROW = '(%s, %s::smallint, %s::smallint, %s::smallint, %s::date, %s::date)'
+
+
+class Command(BaseCommand):
+    help = ('Fill the year, month, day and bound columns of the approximate '
+            'date tables, used by the date search filters')
+
+    def handle(self, *args, **options):
+        for model in date_models():
+            count = 0
+            last_id = 0
+            while True:
+                rows = list(model.objects
+                            .filter(id__gt=last_id)
+                            .order_by('id')
+                            .values_list('id', 'value')[:BATCH_SIZE])
+                if not rows:
+                    break
+
+                params = []
+                for id_, value in rows:
+                    params.append(id_)
+                    params.extend(approximate_parts(value))
+                    params.extend(approximate_bounds(value))
+
+                sql = UPDATE.format(table=model._meta.db_table,
+                                    rows=', '.join([ROW] * len(rows)))
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+
+                count += len(rows)
+                last_id = rows[-1][0]
+
+            self.stdout.write('{}: {} dates normalized'.format(model.__name__, count))
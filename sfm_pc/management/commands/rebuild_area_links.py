@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from area.models import Area
+from association.models import Association
+from sfm_pc.spatial import refresh_association_links, refresh_area_shapes
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = ('Rebuild the area shapes and the area -> organization -> person '
+            'links used by maps and location searches')
+
+    def handle(self, *args, **options):
+        ids = list(Area.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, len(ids), BATCH_SIZE):
+            refresh_area_shapes(ids[start:start + BATCH_SIZE])
+
+        self.stdout.write('{} area shapes rebuilt'.format(len(ids)))
+
+        ids = list(Association.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, len(ids), BATCH_SIZE):
+            refresh_association_links(ids[start:start + BATCH_SIZE])
+
+        self.stdout.write('{} associations linked'.format(len(ids)))
@@ -0,0 +1,24 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from sfm_pc.citations import citation_tables, refresh_citations
+from sfm_pc.snapshots import SnapshotMixin
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the citation table answering which entities cite a source'
+
+    def handle(self, *args, **options):
+        for entity_model in apps.get_models():
+            if not issubclass(entity_model, SnapshotMixin):
+                continue
+            if not len(citation_tables(entity_model)):
+                continue
+
+            ids = list(entity_model.objects.order_by('id').values_list('id', flat=True))
+            for start in range(0, len(ids), BATCH_SIZE):
+                refresh_citations(entity_model, ids[start:start + BATCH_SIZE])
+            self.stdout.write('{} {} citations rebuilt'.format(len(ids),
+                                                               entity_model.__name__))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from emplacement.models import Emplacement
+from membershipperson.models import MembershipPerson
+from sfm_pc.hierarchy import rebuild_hierarchy
+from sfm_pc.periods import refresh_periods
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = ('Rebuild the organization hierarchy (closure of the compositions) '
+            'and the membership and emplacement periods used for subtrees, '
+            'superior units and chains of command')
+
+    def handle(self, *args, **options):
+        count = rebuild_hierarchy()
+        self.stdout.write('{} compositions linked'.format(count))
+
+        for entity_model in (MembershipPerson, Emplacement):
+            ids = list(entity_model.objects.order_by('id').values_list('id', flat=True))
+            for start in range(0, len(ids), BATCH_SIZE):
+                refresh_periods(entity_model, ids[start:start + BATCH_SIZE])
+            self.stdout.write('{} {} periods rebuilt'.format(len(ids),
+                                                             entity_model.__name__))
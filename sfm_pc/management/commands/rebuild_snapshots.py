@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from sfm_pc.snapshots import snapshot_models, refresh_snapshots
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the current value snapshot of every entity'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'entities', nargs='*',
+            help='Only rebuild these entities (e.g. Person Organization)'
+        )
+
+    def handle(self, *args, **options):
+        names = [name.lower() for name in options['entities']]
+
+        for snapshot_model in snapshot_models():
+            entity_model = snapshot_model._meta.get_field('object_ref').rel.to
+            if names and entity_model.__name__.lower() not in names:
+                continue
+
+            ids = list(entity_model.objects.order_by('id').values_list('id', flat=True))
+            for start in range(0, len(ids), BATCH_SIZE):
+                batch = ids[start:start + BATCH_SIZE]
+                refresh_snapshots(list(entity_model.objects.filter(id__in=batch)))
+
+            self.stdout.write('{}: {} snapshots rebuilt'.format(
+                entity_model.__name__, len(ids)
+            ))
@@ -0,0 +1,155 @@
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from sfm_pc.snapshots import snapshot_models
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'benchmarks.json')
+
+# Entity app -> URL prefix, autocomplete URL, field shown in the modals
+ENDPOINTS = {
+    'person': ('person', 'person/name/autocomplete/', 'name'),
+    'organization': ('organization', 'organization/autocomplete', 'name'),
+    'membershipperson': ('membershipperson', 'membershipperson/role/autocomplete/', 'title'),
+    'composition': ('composition', None, 'startdate'),
+    'area': ('area', 'area/autocomplete', 'name'),
+    'association': ('association', None, 'startdate'),
+    'geosite': ('geosite', 'geosite/autocomplete', 'name'),
+    'emplacement': ('emplacement', None, 'startdate'),
+    'violation': ('violation', None, 'locationdescription'),
+}
+
+
+class Command(BaseCommand):
+    help = ('Time the search, CSV, autocomplete, edit and modal endpoints, '
+            'with empty (cold) and filled (warm) caches, and compare them with '
+            'a stored baseline. Clears the caches.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', required=True,
+                            help='Account used to sign in')
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+        parser.add_argument('--save', action='store_true',
+                            help='Store the timings as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Slowdown over the baseline reported as a regression')
+
+    def handle(self, *args, **options):
+        hosts = [host for host in settings.ALLOWED_HOSTS if '*' not in host]
+        client = Client(HTTP_HOST=hosts[0] if hosts else 'localhost')
+        if not client.login(username=options['email'], password=options['password']):
+            raise CommandError('Could not sign in as {}'.format(options['email']))
+
+        baseline = {}
+        if os.path.exists(options['baseline']):
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        timings = {}
+        regressions = []
+        for name, url in self.endpoints():
+            measured = self.time(client, url, options['repeat'])
+            if measured is None:
+                self.stderr.write('{}: {} failed'.format(name, url))
+                continue
+
+            for state, timing in zip(('cold', 'warm'), measured):
+                key = '{}:{}'.format(name, state)
+                timings[key] = timing
+
+                line = '{:45} {:8.1f}ms'.format(key, timing)
+                previous = baseline.get(key)
+                if previous:
+                    change = (timing - previous) / previous
+                    line += ' {:+6.0%}'.format(change)
+                    if change > options['tolerance']:
+                        regressions.append(key)
+                        line += ' REGRESSION'
+                self.stdout.write(line)
+
+        if options['save']:
+            with open(options['baseline'], 'w') as f:
+                json.dump(timings, f, indent=2, sort_keys=True)
+            self.stdout.write('Baseline saved to {}'.format(options['baseline']))
+
+        if regressions and not options['save']:
+            raise CommandError('{} regression(s): {}'.format(
+                len(regressions), ', '.join(regressions)
+            ))
+
+    def endpoints(self):
+        prefix = '/' + settings.LANGUAGE_CODE + '/'
+
+        entity_ids = {}
+        for snapshot_model in snapshot_models():
+            entity_model = snapshot_model._meta.get_field('object_ref').rel.to
+            entity_ids[entity_model._meta.app_label] = (
+                entity_model, entity_model.objects.order_by('id').first()
+            )
+
+        for app, (path, autocomplete, field) in sorted(ENDPOINTS.items()):
+            entity_model, entity = entity_ids.get(app, (None, None))
+
+            yield app + '_list', prefix + path + '/'
+            yield app + '_search', prefix + path + '/search/'
+            yield app + '_search_deep', prefix + path + '/search/?page=100'
+            yield app + '_search_cursor', prefix + path + '/search/?cursor='
+            if entity_model is not None:
+                # Every other ordering, so all the searches are compared
+                # on the same sorts
+                spec = entity_model.search_spec
+                for ordering in sorted(spec.orderings):
+                    if ordering != spec.default_order:
+                        yield ('{}_search_{}'.format(app, ordering),
+                               '{}{}/search/?orderby={}&direction=DESC'.format(
+                                   prefix, path, ordering))
+            yield app + '_csv', prefix + path + '/csv/'
+            if autocomplete:
+                yield app + '_autocomplete', prefix + autocomplete + '?term=a'
+
+            if entity is None:
+                continue
+            yield app + '_edit', '{}{}/{}/'.format(prefix, path, entity.id)
+            for modal in ('source', 'translate', 'version'):
+                yield app + '_' + modal + '_modal', '{}modal/{}/{}/{}/{}/'.format(
+                    prefix, modal, entity_model.__name__, entity.id, field
+                )
+
+        yield 'person_search_name', prefix + 'person/search/?name=ar'
+
+    def get(self, client, url):
+        """
+        (status, milliseconds) of a request, streamed responses included.
+        """
+        start = time.perf_counter()
+        response = client.get(url)
+        if hasattr(response, 'streaming_content'):
+            for chunk in response.streaming_content:
+                pass
+        return (response.status_code, (time.perf_counter() - start) * 1000)
+
+    def time(self, client, url, repeat):
+        """
+        (cold, warm) median timings of `url`: every repetition empties the
+        caches, then requests it twice, the second request being served
+        from what the first one cached.
+        """
+        cold, warm = [], []
+        for i in range(repeat):
+            for alias in settings.CACHES:
+                caches[alias].clear()
+
+            for timings in (cold, warm):
+                status, timing = self.get(client, url)
+                if status != 200:
+                    return None
+                timings.append(timing)
+
+        return tuple(sorted(timings)[len(timings) // 2] for timings in (cold, warm))
@@ -0,0 +1,133 @@
+from django.db import models
+from django.utils import translation
+
+from .utils import field_model_for
+
+
+class PrefetchedFieldContainer(object):
+    """
+    Stands in for a ComplexFieldContainer whose current row was loaded in
+    bulk by `with_complex_values()`. Reads are answered from that row, every
+    other attribute (history, sources, translations...) goes to the wrapped
+    container.
+    """
+
+    def __init__(self, container, field):
+        self.container = container
+        self.field = field
+
+    def __getattr__(self, name):
+        if name == 'container':
+            raise AttributeError(name)
+        return getattr(self.container, name)
+
+    def __str__(self):
+        value = self.get_value()
+        if value is None:
+            return ""
+        return str(value)
+
+    def get_field(self, *args, **kwargs):
+        return self.field
+
+    def get_value(self, *args, **kwargs):
+        if self.field is None:
+            return None
+        return self.field.value
+
+
+def prime_related_names(rows, lang):
+    """
+    Load the names of the entities `rows` point to (a membership's person
+    or organization), which they print as, in `lang` with one query.
+    """
+    related = [row.value for row in rows if row.value is not None]
+    if not related:
+        return
+    model = type(related[0])
+    if not hasattr(model.objects, 'with_complex_values'):
+        return
+    try:
+        field_model_for(model, 'name')
+    except LookupError:
+        return
+    prime_complex_values(related, ['name'], lang)
+
+
+def current_fields(field_model, object_ids, lang):
+    """
+    Return {object id: current row} for one complex field table in a single
+    query: the row in `lang` when the field has one, the oldest row
+    otherwise. Entities used as values come with their name in `lang`.
+    """
+    rows = field_model.objects.filter(object_ref__in=object_ids).order_by('id')
+    if field_model._meta.get_field('value').rel is not None:
+        rows = list(rows.select_related('value'))
+        prime_related_names(rows, lang)
+
+    fields = {}
+    for row in rows:
+        current = fields.get(row.object_ref_id)
+        if current is None or (getattr(row, 'lang', None) == lang and
+                               getattr(current, 'lang', None) != lang):
+            fields[row.object_ref_id] = row
+
+    return fields
+
+
+def prime_complex_values(objects, attr_names, lang=None):
+    objects = list(objects)
+    if not len(objects):
+        return objects
+
+    lang = lang or translation.get_language()
+    model = type(objects[0])
+    object_ids = [obj.id for obj in objects]
+
+    for attr_name in attr_names:
+        fields = current_fields(field_model_for(model, attr_name), object_ids, lang)
+        for obj in objects:
+            container = getattr(obj, attr_name)
+            if isinstance(container, PrefetchedFieldContainer):
+                container = container.container
+            prefetched = PrefetchedFieldContainer(container, fields.get(obj.id))
+            setattr(obj, attr_name, prefetched)
+            obj.complex_fields = [
+                prefetched if field is container else field
+                for field in obj.complex_fields
+            ]
+
+    return objects
+
+
+class ComplexFieldQuerySet(models.QuerySet):
+    """
+    QuerySet for BaseModel entities. `with_complex_values('name', 'alias')`
+    loads the current row of each named container for the whole result set
+    with one query per field table, so iterating a page and calling
+    `obj.name.get_value()` no longer costs one query per row.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._complex_values = ()
+        self._complex_lang = None
+
+    def with_complex_values(self, *attr_names, lang=None):
+        clone = self._clone()
+        clone._complex_values = self._complex_values + attr_names
+        clone._complex_lang = lang
+        return clone
+
+    def _clone(self, *args, **kwargs):
+        clone = super()._clone(*args, **kwargs)
+        clone._complex_values = self._complex_values
+        clone._complex_lang = self._complex_lang
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is not None
+        super()._fetch_all()
+        if not fetched and self._complex_values:
+            prime_complex_values(self._result_cache, self._complex_values,
+                                 self._complex_lang)
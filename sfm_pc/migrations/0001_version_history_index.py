@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reversion', '0001_initial'),
+    ]
+
+    # Versions of a row, newest first: the history pages and the
+    # point in time lookups of sfm_pc.history
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX reversion_version_object_history '
+            'ON reversion_version (content_type_id, object_id_int, id)',
+            'DROP INDEX IF EXISTS reversion_version_object_history'
+        ),
+    ]
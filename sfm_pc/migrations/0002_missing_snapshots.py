@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations
+
+# (app, entity) of the entities having snapshots
+ENTITIES = [
+    ('person', 'Person'),
+    ('organization', 'Organization'),
+    ('membershipperson', 'MembershipPerson'),
+    ('composition', 'Composition'),
+    ('area', 'Area'),
+    ('association', 'Association'),
+    ('geosite', 'Geosite'),
+    ('emplacement', 'Emplacement'),
+    ('violation', 'Violation'),
+]
+
+# Empty rows, filled by rebuild_snapshots, for the entities and languages
+# without one: sorted searches join the snapshot of the language
+INSERT_SNAPSHOTS = """
+    INSERT INTO {snapshots} (object_ref_id, lang)
+    SELECT entity.id, langs.lang
+    FROM {entities} entity
+    CROSS JOIN unnest(%s::varchar[]) AS langs(lang)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM {snapshots} snapshot
+        WHERE snapshot.object_ref_id = entity.id AND snapshot.lang = langs.lang
+    )
+"""
+
+
+def create_missing_snapshots(apps, schema_editor):
+    langs = [code for code, name in settings.LANGUAGES]
+    with schema_editor.connection.cursor() as cursor:
+        for app, entity in ENTITIES:
+            cursor.execute(INSERT_SNAPSHOTS.format(
+                snapshots=apps.get_model(app, entity + 'Snapshot')._meta.db_table,
+                entities=apps.get_model(app, entity)._meta.db_table,
+            ), [langs])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sfm_pc', '0001_version_history_index'),
+        ('person', '0005_snapshot_sort_keys'),
+        ('organization', '0005_snapshot_sort_keys'),
+        ('membershipperson', '0005_snapshot_sort_keys'),
+        ('composition', '0006_snapshot_sort_keys'),
+        ('area', '0006_snapshot_sort_keys'),
+        ('association', '0004_snapshot_sort_keys'),
+        ('geosite', '0005_snapshot_sort_keys'),
+        ('emplacement', '0005_snapshot_sort_keys'),
+        ('violation', '0007_snapshot_sort_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,230 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from django.template.loader import render_to_string
+
+PER_PAGE = 15
+
+# Page numbers listed on each side of the current one
+PAGE_WINDOW = 5
+
+
+class CountedPaginator(Paginator):
+    """
+    Paginator which trusts a count computed beforehand (see
+    sfm_pc.counts.search_count) instead of running its own COUNT over the
+    search query.
+    """
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count = count
+
+
+def encode_cursor(key, value, id_, direction):
+    data = json.dumps([key, value, id_, direction], default=str)
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Return (sort key, sort value, id, direction) or None when `cursor` is
+    not one of ours.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        key, value, id_, direction = json.loads(data)
+    except (TypeError, ValueError, UnicodeError):
+        return None
+
+    if direction not in ('next', 'previous') or not isinstance(id_, int):
+        return None
+    return (key, value, id_, direction)
+
+
+def sort_key(queryset):
+    """
+    Return (ordering name, descending) of the first ordering of `queryset`,
+    e.g. ('sort_name', True) for a person search() sorted by name desc.
+    """
+    order_by = list(queryset.query.order_by)
+    if not len(order_by) or order_by[0].lstrip('-') in ('id', 'pk'):
+        return ('id', order_by[0].startswith('-') if len(order_by) else False)
+    return (order_by[0].lstrip('-'), order_by[0].startswith('-'))
+
+
+def _ordered(queryset, key, descending):
+    sign = '-' if descending else ''
+    if key == 'id':
+        return queryset.order_by(sign + 'id')
+    return queryset.order_by(sign + key, sign + 'id')
+
+
+def _sort_value(queryset, obj, key):
+    value = getattr(obj, key)
+    annotation = queryset.query.annotations.get(key)
+    if annotation is not None and value is not None:
+        value = annotation.output_field.get_prep_value(value)
+    return value
+
+
+def _cursor_value(queryset, key, value):
+    """
+    Sort value of a cursor as the field of `key` reads it. Raises
+    ValueError when it cannot be one of its values (a tampered or stale
+    cursor).
+    """
+    if value is None or key == 'id':
+        return value
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(value)
+
+    annotation = queryset.query.annotations.get(key)
+    if annotation is None:
+        return value
+    try:
+        return annotation.output_field.to_python(value)
+    except (ValidationError, TypeError):
+        raise ValueError(value)
+
+
+def _seek(queryset, key, value, id_, descending, limit):
+    """
+    The `limit` rows following (value, id_) in (key, id) order. Each part is
+    a range condition on the sort key so no row before the cursor is ever
+    read. Postgres sorts NULLs last ascending and first descending.
+    """
+    ordered = _ordered(queryset, key, descending)
+    after = 'lt' if descending else 'gt'
+
+    if key == 'id':
+        parts = [ordered.filter(**{'id__' + after: id_})]
+    elif value is None:
+        parts = [ordered.filter(**{key + '__isnull': True})
+                        .filter(**{'id__' + after: id_})]
+        if descending:
+            parts.append(ordered.filter(**{key + '__isnull': False}))
+    else:
+        parts = [ordered.filter(**{key: value}).filter(**{'id__' + after: id_}),
+                 ordered.filter(**{key + '__' + after: value})]
+        if not descending:
+            parts.append(ordered.filter(**{key + '__isnull': True}))
+
+    rows = []
+    for part in parts:
+        if len(rows) >= limit:
+            break
+        rows.extend(part[:limit - len(rows)])
+    return rows
+
+
+def keyset_page(queryset, cursor, per_page=PER_PAGE):
+    """
+    Return (objects, next cursor, previous cursor) for the page of
+    `queryset` designated by `cursor` (the first page when empty or
+    invalid). Pages are fetched by seeking from the sort value and id of the
+    last (or first) row seen, so page 1000 costs the same as page 1.
+    """
+    key, descending = sort_key(queryset)
+
+    position = decode_cursor(cursor) if cursor else None
+    if position is not None and position[0] != key:
+        position = None
+    if position is not None:
+        try:
+            value = _cursor_value(queryset, key, position[1])
+        except ValueError:
+            position = None
+        else:
+            position = (key, value) + position[2:]
+
+    if position is None:
+        rows = list(_ordered(queryset, key, descending)[:per_page + 1])
+        has_previous, has_next = False, len(rows) > per_page
+        rows = rows[:per_page]
+    else:
+        _, value, id_, direction = position
+        backwards = direction == 'previous'
+        rows = _seek(queryset, key, value, id_, descending != backwards,
+                     per_page + 1)
+        more = len(rows) > per_page
+        rows = rows[:per_page]
+        if backwards:
+            rows.reverse()
+            has_previous, has_next = more, True
+        else:
+            has_previous, has_next = True, more
+
+    next_cursor = previous_cursor = None
+    if len(rows) and has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(key, _sort_value(queryset, last, key),
+                                    last.id, 'next')
+    if len(rows) and has_previous:
+        first = rows[0]
+        previous_cursor = encode_cursor(key, _sort_value(queryset, first, key),
+                                        first.id, 'previous')
+
+    return (rows, next_cursor, previous_cursor)
+
+
+def page_window(page, num_pages, window=PAGE_WINDOW):
+    """
+    The page numbers shown around `page`: at most `window` on each side.
+    """
+    return list(range(max(1, page - window), min(num_pages, page + window) + 1))
+
+
+def paginate(queryset, terms, count, per_page=PER_PAGE):
+    """
+    Return (objects of the requested page, paging entries of the JSON
+    response) for a `*_search` view.
+
+    The `pagination` entry describes the page for clients to render: total
+    `count`, `per_page` and, with a `cursor` term (empty for the first
+    page), the `next_cursor` and `previous_cursor` of keyset_page();
+    otherwise the `page` term is an OFFSET page number and it carries the
+    `page`, `num_pages`, `previous` and `next` page numbers and the window
+    of `pages` around it. The `paginator.html` links are only rendered, in
+    `paginator`, when the `paginator` term is 'html'.
+    """
+    pagination = {'count': count, 'per_page': per_page}
+
+    if 'cursor' in terms:
+        objects, next_cursor, previous_cursor = keyset_page(
+            queryset, terms['cursor'], per_page
+        )
+        pagination.update({
+            'next_cursor': next_cursor,
+            'previous_cursor': previous_cursor,
+        })
+        return (objects, {'pagination': pagination})
+
+    paginator = CountedPaginator(queryset, per_page, count)
+    try:
+        objects = paginator.page(terms.get('page', 1))
+    except PageNotAnInteger:
+        objects = paginator.page(1)
+    except EmptyPage:
+        objects = paginator.page(paginator.num_pages)
+
+    page = objects.number
+    pages = page_window(page, paginator.num_pages)
+    pagination.update({
+        'page': page,
+        'num_pages': paginator.num_pages,
+        'previous': page - 1 if objects.has_previous() else None,
+        'next': page + 1 if objects.has_next() else None,
+        'pages': pages,
+    })
+    paging = {'pagination': pagination}
+
+    if terms.get('paginator') == 'html':
+        paging['paginator'] = render_to_string(
+            'paginator.html',
+            {'actual': page, 'paginator': objects, 'pages': pages}
+        )
+
+    return (objects, paging)
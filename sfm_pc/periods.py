@@ -0,0 +1,92 @@
+from django.apps import apps
+from django.db import transaction
+from django.dispatch import receiver
+
+from .signals import entity_updated
+from .utils import approximate_bounds, field_model_for
+
+# Matches the GiST index created by indexes.period_index()
+OVERLAPS = ("daterange({table}.startdate, {table}.enddate, '[]') && "
+            "daterange(%s::date, %s::date, '[]')")
+
+# Entity -> (period model, column of the entity, {period column: field},
+# start date field, end date field). Rows are only written for entities
+# with a value in every column but `role`; the Composition links live in
+# composition.CompositionClosure (depth 1).
+PERIODS = {
+    ('membershipperson', 'membershipperson'): (
+        'membershipperson.MembershipPeriod', 'membership',
+        {'person': 'Member', 'organization': 'Organization', 'role': 'Role'},
+        'FirstCitedDate', 'LastCitedDate',
+    ),
+    ('emplacement', 'emplacement'): (
+        'emplacement.EmplacementPeriod', 'emplacement',
+        {'organization': 'Organization', 'site': 'Site'},
+        'StartDate', 'EndDate',
+    ),
+}
+OPTIONAL_COLUMNS = ('role',)
+
+
+def overlapping(rows, start, end):
+    """
+    Filter `rows` of a table with startdate and enddate columns to the ones
+    overlapping start - end (both included, None for open). Pass the same
+    date twice for the rows valid on that day.
+    """
+    table = rows.model._meta.db_table
+    return rows.extra(where=[OVERLAPS.format(table=table)], params=[start, end])
+
+
+def first_values(field_model, object_ids):
+    """
+    {object_ref id: value (id for foreign keys)} of the oldest non-empty
+    row of `field_model` for each of `object_ids`.
+    """
+    values = {}
+    rows = (field_model.objects
+            .filter(object_ref__in=object_ids, value__isnull=False)
+            .order_by('id')
+            .values_list('object_ref_id', 'value'))
+    for object_id, value in rows:
+        values.setdefault(object_id, value)
+    return values
+
+
+def refresh_periods(entity_model, object_ids):
+    label = (entity_model._meta.app_label, entity_model._meta.model_name)
+    period_name, entity_column, columns, start_field, end_field = PERIODS[label]
+    period_model = apps.get_model(period_name)
+
+    values = {
+        column: first_values(field_model_for(entity_model, field), object_ids)
+        for column, field in columns.items()
+    }
+    starts = first_values(field_model_for(entity_model, start_field), object_ids)
+    ends = first_values(field_model_for(entity_model, end_field), object_ids)
+
+    periods = []
+    for object_id in object_ids:
+        row = {column + '_id': values[column].get(object_id) for column in columns}
+        if any(row[column + '_id'] is None for column in columns
+               if column not in OPTIONAL_COLUMNS):
+            continue
+        row[entity_column + '_id'] = object_id
+
+        start = approximate_bounds(starts.get(object_id))[0]
+        end = approximate_bounds(ends.get(object_id))[1]
+        # daterange() refuses reversed bounds, keep mistyped dates usable
+        if start and end and start > end:
+            start, end = end, start
+        periods.append(period_model(startdate=start, enddate=end, **row))
+
+    with transaction.atomic():
+        period_model.objects.filter(**{entity_column + '__in': object_ids}).delete()
+        period_model.objects.bulk_create(periods)
+
+
+@receiver(entity_updated)
+def update_periods(sender, instance, **kwargs):
+    # Deletions are handled by the foreign keys (CASCADE)
+    if (sender._meta.app_label, sender._meta.model_name) in PERIODS:
+        refresh_periods(sender, [instance.id])
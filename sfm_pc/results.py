@@ -0,0 +1,53 @@
+from functools import wraps
+
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from .caching import search_key
+from .counts import normalize_terms
+from .snapshots import snapshot_language
+
+# Alias in settings.CACHES of the cache holding the result pages
+SEARCH_CACHE = 'search'
+
+
+def page_terms(model, terms):
+    """
+    The terms choosing the page of `model.search(terms)` shown: the
+    ordering (unknown ones falling back to the default), page or cursor
+    and whether the paginator links are rendered.
+    """
+    return (
+        model.search_spec.ordering(terms),
+        terms.get('page', '').strip(),
+        terms['cursor'].strip() if 'cursor' in terms else None,
+        terms.get('paginator') == 'html',
+    )
+
+
+def cached_search(model):
+    """
+    Cache the JSON page (results and count) returned by a search view of
+    `model` by filters, page, ordering and language. Entries are dropped
+    by any write to the entities the search depends on (see
+    caching.search_key); failed requests are never stored.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            terms = request.GET.dict()
+            key = search_key(model, 'page', normalize_terms(terms),
+                             page_terms(model, terms), snapshot_language())
+
+            cache = caches[SEARCH_CACHE]
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, (response.content, response['Content-Type']))
+            return response
+        return wrapper
+    return decorator
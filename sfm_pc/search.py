@@ -0,0 +1,140 @@
+from django.db.models import F
+
+from .dates import date_conditions
+from .snapshots import SORT_KEY_PREFIX, snapshot_language
+from .spatial import search_location
+
+
+class Sort(object):
+    """
+    An ordering offered by a search: the sort key of snapshot column
+    `column` (see Snapshot.sort_keys) in the current language. Each key has
+    a (lang, key, entity) index, so a sorted page is an index scan stopped
+    by the LIMIT instead of a GROUP BY over the whole table.
+    """
+
+    def __init__(self, column):
+        self.column = column
+
+    def expression(self):
+        return F('snapshots__' + SORT_KEY_PREFIX + self.column)
+
+
+class Term(object):
+    """
+    `lookup` compared with the value of search term `name`.
+    """
+
+    def __init__(self, name, lookup):
+        self.name = name
+        self.lookup = lookup
+
+    def conditions(self, terms):
+        value = terms.get(self.name)
+        if not value:
+            return {}
+        return {self.lookup: value}
+
+
+class Dates(object):
+    """
+    The year, month, day and range terms of the approximate date field
+    table reached by `lookup` (see sfm_pc.dates.date_conditions).
+    """
+
+    def __init__(self, name, lookup):
+        self.name = name
+        self.lookup = lookup
+
+    def conditions(self, terms):
+        return date_conditions(self.lookup, terms, self.name)
+
+
+class Location(object):
+    """
+    The latitude, longitude and radius terms, `entity_ids(location)`
+    returning the ids (as a subquery) of the entities near it.
+    """
+
+    def __init__(self, entity_ids):
+        self.entity_ids = entity_ids
+
+    def conditions(self, terms):
+        location = search_location(terms)
+        if location is None:
+            return {}
+        return {'id__in': self.entity_ids(location)}
+
+
+class Search(object):
+    """
+    Declarative search of an entity: the orderings it offers (`orderby`
+    term, `direction` or `order` ASC/DESC) and the filters it understands.
+    Sorted searches join the snapshot of the current language, which
+    every entity has (see create_snapshots), so they return the same
+    entities as search_count() counts.
+
+    Filter conditions are grouped by the field table they start from and
+    each table is read once, in an `id IN (SELECT object_ref_id ...)`
+    subquery: whatever the number of filters, the entity rows are never
+    multiplied and counting them needs no DISTINCT.
+    """
+
+    def __init__(self, default_order, orderings, filters):
+        self.default_order = default_order
+        self.orderings = orderings
+        self.filters = filters
+
+    def ordering(self, terms):
+        name = terms.get('orderby')
+        if name not in self.orderings:
+            name = self.default_order
+        direction = terms.get('direction') or terms.get('order')
+        return (name, direction == 'DESC')
+
+    def conditions(self, terms):
+        conditions = {}
+        for search_filter in self.filters:
+            conditions.update(search_filter.conditions(terms))
+        return conditions
+
+    def query(self, model, terms, ordered=True):
+        query = model.objects.all()
+
+        tables = {}
+        for lookup, value in self.conditions(terms).items():
+            relation = lookup.split('__', 1)[0]
+            field = model._meta.get_field(relation)
+            if field.concrete:
+                query = query.filter(**{lookup: value})
+            else:
+                tables.setdefault(field, {})[lookup[len(relation) + 2:]] = value
+
+        for field, conditions in tables.items():
+            # Reverse relation from a field table (or any table pointing
+            # at the entity): filter it alone and keep its foreign key
+            rows = field.related_model.objects.filter(**conditions)
+            query = query.filter(id__in=rows.values(field.field.name))
+
+        if ordered:
+            name, descending = self.ordering(terms)
+            key = 'sort_' + name
+            sign = '-' if descending else ''
+            # The annotation reuses the join on the snapshot of the language
+            query = (query
+                     .filter(snapshots__lang=snapshot_language())
+                     .annotate(**{key: self.orderings[name].expression()})
+                     .order_by(sign + key, sign + 'id'))
+
+        return query
+
+
+class SearchMixin(object):
+    """
+    Entities declaring a `search_spec` (a Search) get `search(terms)`.
+    """
+    search_spec = None
+
+    @classmethod
+    def search(cls, terms, ordered=True):
+        return cls.search_spec.query(cls, terms, ordered)
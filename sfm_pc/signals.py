@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent once the complex fields of an entity (Person, Organization, ...) have
+# been written, whether through BaseModel.update(), a translation or a revert.
+entity_updated = Signal(providing_args=['instance'])
@@ -0,0 +1,233 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import pre_delete, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import translation
+
+from .signals import entity_updated
+from .utils import approximate_bounds, field_model_for
+
+
+SORT_KEY_PREFIX = 'sortkey_'
+
+
+class Snapshot(models.Model):
+    """
+    Flat copy of the current value of every complex field of an entity, one
+    row per language. Each entity app declares a concrete `<Entity>Snapshot`
+    whose columns are named after the entity's ComplexFieldContainer
+    attributes; search, CSV and autocomplete views read these rows instead of
+    issuing one query per container.
+    """
+    lang = models.CharField(max_length=5)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def columns(cls):
+        return [field.name for field in cls._meta.concrete_fields
+                if field.name not in ('id', 'object_ref', 'lang') and
+                not field.name.startswith(SORT_KEY_PREFIX)]
+
+    @classmethod
+    def sort_keys(cls):
+        """
+        The `sortkey_<column>` fields: typed, indexed copies of a column
+        (a DateField holds the first day of an approximate date, a
+        CharField the text) which search() orders on.
+        """
+        return [field for field in cls._meta.concrete_fields
+                if field.name.startswith(SORT_KEY_PREFIX)]
+
+    def as_dict(self):
+        return {
+            column: getattr(self, column) or ""
+            for column in self.columns()
+        }
+
+
+class SnapshotMixin(object):
+
+    @classmethod
+    def get_snapshot_model(cls):
+        return apps.get_model(cls._meta.app_label, cls.__name__ + 'Snapshot')
+
+    def update(self, *args, **kwargs):
+        result = super().update(*args, **kwargs)
+        entity_updated.send(sender=type(self), instance=self)
+        return result
+
+
+def snapshot_models():
+    return [model for model in apps.get_models() if issubclass(model, Snapshot)]
+
+
+def snapshot_languages():
+    return [code for code, name in settings.LANGUAGES]
+
+
+def snapshot_language(lang=None):
+    lang = lang or translation.get_language() or settings.LANGUAGE_CODE
+    if lang not in snapshot_languages():
+        lang = lang.split('-')[0]
+    if lang not in snapshot_languages():
+        lang = settings.LANGUAGE_CODE
+    return lang
+
+
+def _sort_key(field, value):
+    if value is None:
+        return None
+    if isinstance(field, models.DateField):
+        return approximate_bounds(value)[0]
+    return str(value)[:field.max_length]
+
+
+def refresh_snapshots(objects):
+    """
+    Rebuild the snapshot rows of `objects` (all of the same entity) with one
+    query per complex field table and language.
+    """
+    objects = list(objects)
+    if len(objects):
+        refresh_snapshots_for_ids(type(objects[0]), [obj.id for obj in objects])
+
+
+def refresh_snapshots_for_ids(entity_model, object_ids):
+    if not len(object_ids):
+        return
+
+    snapshot_model = entity_model.get_snapshot_model()
+    columns = snapshot_model.columns()
+    sort_keys = snapshot_model.sort_keys()
+
+    snapshots = []
+    for lang in snapshot_languages():
+        # str() of the values (related entities, dates) in the snapshot's
+        # language, not the editor's
+        with translation.override(lang):
+            entities = (entity_model.objects
+                        .filter(id__in=object_ids)
+                        .with_complex_values(*columns, lang=lang))
+            for entity in entities:
+                snapshot = snapshot_model(object_ref_id=entity.id, lang=lang)
+                values = {column: getattr(entity, column).get_value()
+                          for column in columns}
+                for column, value in values.items():
+                    setattr(snapshot, column, None if value is None else str(value))
+                for field in sort_keys:
+                    column = field.name[len(SORT_KEY_PREFIX):]
+                    setattr(snapshot, field.name, _sort_key(field, values[column]))
+                snapshots.append(snapshot)
+
+    with transaction.atomic():
+        snapshot_model.objects.filter(object_ref__in=object_ids).delete()
+        snapshot_model.objects.bulk_create(snapshots)
+
+
+def create_snapshots(entity_model, object_ids):
+    """
+    Insert empty snapshot rows, in every language, for entities which have
+    none yet: sorted searches join the snapshot of a language and would
+    leave out the entities without one.
+    """
+    snapshot_model = entity_model.get_snapshot_model()
+    existing = set(snapshot_model.objects.filter(object_ref__in=object_ids)
+                   .values_list('object_ref_id', 'lang'))
+    snapshot_model.objects.bulk_create([
+        snapshot_model(object_ref_id=id_, lang=lang)
+        for id_ in object_ids
+        for lang in snapshot_languages()
+        if (id_, lang) not in existing
+    ])
+
+
+def refresh_snapshot(instance):
+    refresh_snapshots([instance])
+
+
+def get_snapshots(objects, lang=None):
+    """
+    Return {entity id: snapshot} for `objects` in one query. Entities that
+    were never snapshotted (e.g. created before the table existed) are
+    refreshed on the fly.
+    """
+    objects = list(objects)
+    if not len(objects):
+        return {}
+
+    return get_snapshots_for_ids(type(objects[0]), [obj.id for obj in objects],
+                                 lang)
+
+
+def get_snapshots_for_ids(entity_model, object_ids, lang=None):
+    lang = snapshot_language(lang)
+    snapshot_model = entity_model.get_snapshot_model()
+    snapshots = {
+        snapshot.object_ref_id: snapshot
+        for snapshot in snapshot_model.objects.filter(object_ref__in=object_ids,
+                                                      lang=lang)
+    }
+
+    missing = [id_ for id_ in object_ids if id_ not in snapshots]
+    if len(missing):
+        refresh_snapshots_for_ids(entity_model, missing)
+        snapshots.update({
+            snapshot.object_ref_id: snapshot
+            for snapshot in snapshot_model.objects.filter(object_ref__in=missing,
+                                                          lang=lang)
+        })
+
+    return snapshots
+
+
+def dependent_ids(instance):
+    """
+    {entity model: set of ids} of the entities whose snapshot displays
+    `instance`, e.g. the memberships of a person or the compositions of an
+    organization, read with one query per field table referencing it.
+    """
+    dependents = {}
+    for snapshot_model in snapshot_models():
+        entity_model = snapshot_model._meta.get_field('object_ref').rel.to
+        for column in snapshot_model.columns():
+            field_model = field_model_for(entity_model, column)
+            value_field = field_model._meta.get_field('value')
+            if value_field.rel is None or value_field.rel.to is not type(instance):
+                continue
+
+            refs = (field_model.objects.filter(value=instance)
+                    .values_list('object_ref_id', flat=True))
+            dependents.setdefault(entity_model, set()).update(refs)
+
+    return dependents
+
+
+@receiver(post_save)
+def create_entity_snapshots(sender, instance, created, **kwargs):
+    # Entities are created before their fields, which entity_updated
+    # snapshots afterwards
+    if created and isinstance(instance, SnapshotMixin):
+        create_snapshots(sender, [instance.id])
+
+
+@receiver(entity_updated)
+def update_snapshots(sender, instance, **kwargs):
+    refresh_snapshot(instance)
+    for entity_model, ids in dependent_ids(instance).items():
+        refresh_snapshots_for_ids(entity_model, list(ids))
+
+
+@receiver(pre_delete)
+def collect_dependent_snapshots(sender, instance, **kwargs):
+    if isinstance(instance, SnapshotMixin):
+        instance._snapshot_dependents = dependent_ids(instance)
+
+
+@receiver(post_delete)
+def update_dependent_snapshots(sender, instance, **kwargs):
+    # Dependents deleted along with the instance have no rows to rebuild
+    for entity_model, ids in getattr(instance, '_snapshot_dependents', {}).items():
+        refresh_snapshots_for_ids(entity_model, list(ids))
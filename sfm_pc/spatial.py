@@ -0,0 +1,247 @@
+from django.apps import apps
+from django.conf import settings
+from django.contrib.gis import geos
+from django.db import connection, transaction
+from django.dispatch import receiver
+
+from .signals import entity_updated
+
+DWITHIN = ('ST_DWithin({}::geography, '
+           'ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography, %s)')
+
+# (column of AreaShape, tolerance in degrees, first zoom where the next
+# level or the full geometry takes over)
+SHAPE_LEVELS = (
+    ('low', 0.05, 6),
+    ('medium', 0.005, 10),
+    ('high', 0.0005, 14),
+)
+
+# The current geometry of each area: in the default language if there is
+# one, the oldest row otherwise
+AREA_SHAPES = """
+    INSERT INTO area_areashape (area_id, geometry_id, bbox, {columns})
+    SELECT DISTINCT ON (object_ref_id) object_ref_id, id, ST_Envelope(value),
+           {simplified}
+    FROM area_areageometry
+    WHERE object_ref_id IN %s AND value IS NOT NULL
+    ORDER BY object_ref_id, COALESCE(lang = %s, false) DESC, id
+"""
+
+
+def search_location(terms):
+    """
+    Return (point, radius in metres) for the `latitude`, `longitude` and
+    `radius` (in km, as offered by the search forms) terms, radius being
+    None when not given. None when the search is not by location.
+    """
+    latitude = terms.get('latitude')
+    longitude = terms.get('longitude')
+    if not (latitude and longitude):
+        return None
+
+    try:
+        point = geos.Point(float(longitude), float(latitude), srid=4326)
+    except ValueError:
+        return None
+
+    radius = terms.get('radius')
+    if radius:
+        try:
+            radius = float(radius) * 1000
+        except ValueError:
+            radius = None
+    else:
+        radius = None
+
+    return (point, radius)
+
+
+def near(field_model, location):
+    """
+    object_ref ids (as a subquery) of the rows of a geometry field table
+    within the radius of the point in `location`, or whose bounding box
+    contains it when there is no radius. Both read the GiST indexes of the
+    table (on the geometry, resp. the geography cast) directly.
+    """
+    point, radius = location
+    rows = field_model.objects.all()
+    if radius is None:
+        rows = rows.filter(value__bbcontains=point)
+    else:
+        rows = _within(rows, '"{}"."value"'.format(field_model._meta.db_table),
+                       location)
+
+    return rows.values('object_ref_id')
+
+
+def _within(rows, column, location):
+    point, radius = location
+    return rows.extra(where=[DWITHIN.format(column)],
+                      params=[point.x, point.y, radius])
+
+
+def near_areas(location):
+    """
+    Area ids (as a subquery) near `location`. The bounding boxes of
+    AreaShape answer containment alone and narrow down the radius search,
+    the full geometry is only read for the areas they keep.
+    """
+    AreaShape = apps.get_model('area', 'AreaShape')
+    point, radius = location
+    if radius is None:
+        return AreaShape.objects.filter(bbox__bbcontains=point).values('area_id')
+
+    candidates = _within(AreaShape.objects.all(), '"area_areashape"."bbox"',
+                         location).values('area_id')
+    geometries = apps.get_model('area', 'AreaGeometry').objects.filter(
+        object_ref__in=candidates
+    )
+    return _within(geometries, '"area_areageometry"."value"',
+                   location).values('object_ref_id')
+
+
+def linked_to_areas(location, column):
+    """
+    Organization (`column` 'organization_id') or person ('person_id') ids
+    associated with an area near `location`, through AreaLink.
+    """
+    links = apps.get_model('area', 'AreaLink').objects.filter(
+        area__in=near_areas(location)
+    )
+    if column == 'person_id':
+        links = links.filter(person__isnull=False)
+
+    return links.values(column)
+
+
+def _values(field_model, object_ids):
+    values = {}
+    rows = (field_model.objects
+            .filter(object_ref__in=object_ids, value__isnull=False)
+            .values_list('object_ref_id', 'value_id'))
+    for object_id, value_id in rows:
+        values.setdefault(object_id, set()).add(value_id)
+    return values
+
+
+def _memberships_of(organization_ids):
+    """
+    {organization id: {(membership id, person id), ...}}
+    """
+    MembershipPersonOrganization = apps.get_model('membershipperson',
+                                                  'MembershipPersonOrganization')
+    MembershipPersonMember = apps.get_model('membershipperson',
+                                            'MembershipPersonMember')
+
+    organizations = {}
+    rows = (MembershipPersonOrganization.objects
+            .filter(value__in=organization_ids)
+            .values_list('object_ref_id', 'value_id'))
+    for membership_id, organization_id in rows:
+        organizations.setdefault(membership_id, set()).add(organization_id)
+
+    members = _values(MembershipPersonMember, list(organizations))
+
+    memberships = {}
+    for membership_id, organization_ids in organizations.items():
+        for organization_id in organization_ids:
+            for person_id in members.get(membership_id, ()):
+                memberships.setdefault(organization_id, set()).add(
+                    (membership_id, person_id)
+                )
+    return memberships
+
+
+def refresh_association_links(association_ids):
+    AreaLink = apps.get_model('area', 'AreaLink')
+    areas = _values(apps.get_model('association', 'AssociationArea'),
+                    association_ids)
+    organizations = _values(apps.get_model('association', 'AssociationOrganization'),
+                            association_ids)
+    memberships = _memberships_of(
+        set().union(*organizations.values()) if organizations else set()
+    )
+
+    links = []
+    for association_id in association_ids:
+        for area_id in areas.get(association_id, ()):
+            for organization_id in organizations.get(association_id, ()):
+                links.append(AreaLink(area_id=area_id,
+                                      association_id=association_id,
+                                      organization_id=organization_id))
+                for membership_id, person_id in memberships.get(organization_id, ()):
+                    links.append(AreaLink(area_id=area_id,
+                                          association_id=association_id,
+                                          organization_id=organization_id,
+                                          membership_id=membership_id,
+                                          person_id=person_id))
+
+    with transaction.atomic():
+        AreaLink.objects.filter(association__in=association_ids).delete()
+        AreaLink.objects.bulk_create(links)
+
+
+def refresh_membership_links(membership_ids):
+    AreaLink = apps.get_model('area', 'AreaLink')
+    organizations = _values(
+        apps.get_model('membershipperson', 'MembershipPersonOrganization'),
+        membership_ids
+    )
+    members = _values(apps.get_model('membershipperson', 'MembershipPersonMember'),
+                      membership_ids)
+
+    associations = {}
+    organization_links = AreaLink.objects.filter(
+        membership__isnull=True,
+        organization__in=set().union(*organizations.values()) if organizations else []
+    ).values_list('organization_id', 'area_id', 'association_id')
+    for organization_id, area_id, association_id in organization_links:
+        associations.setdefault(organization_id, []).append((area_id, association_id))
+
+    links = []
+    for membership_id in membership_ids:
+        for organization_id in organizations.get(membership_id, ()):
+            for area_id, association_id in associations.get(organization_id, ()):
+                for person_id in members.get(membership_id, ()):
+                    links.append(AreaLink(area_id=area_id,
+                                          association_id=association_id,
+                                          organization_id=organization_id,
+                                          membership_id=membership_id,
+                                          person_id=person_id))
+
+    with transaction.atomic():
+        AreaLink.objects.filter(membership__in=membership_ids).delete()
+        AreaLink.objects.bulk_create(links)
+
+
+def refresh_area_shapes(area_ids):
+    if not len(area_ids):
+        return
+
+    AreaShape = apps.get_model('area', 'AreaShape')
+
+    sql = AREA_SHAPES.format(
+        columns=', '.join(column for column, tolerance, zoom in SHAPE_LEVELS),
+        simplified=', '.join(
+            'ST_SimplifyPreserveTopology(value, {})'.format(tolerance)
+            for column, tolerance, zoom in SHAPE_LEVELS
+        )
+    )
+
+    with transaction.atomic():
+        AreaShape.objects.filter(area__in=area_ids).delete()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [tuple(area_ids), settings.LANGUAGE_CODE])
+
+
+@receiver(entity_updated)
+def update_spatial_tables(sender, instance, **kwargs):
+    # Deletions are handled by the foreign keys (CASCADE)
+    label = (sender._meta.app_label, sender._meta.model_name)
+    if label == ('area', 'area'):
+        refresh_area_shapes([instance.id])
+    elif label == ('association', 'association'):
+        refresh_association_links([instance.id])
+    elif label == ('membershipperson', 'membershipperson'):
+        refresh_membership_links([instance.id])
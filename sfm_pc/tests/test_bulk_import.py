@@ -0,0 +1,80 @@
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from reversion.models import Version
+
+from geosite.models import Geosite
+from person.models import Person, PersonAlias, PersonName
+from sfm_pc.bulk_import import import_rows, refresh_derived
+from sfm_pc.caching import get_generation
+from source.models import Source
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class ImportRowsTest(TestCase):
+
+    def test_sourced_columns(self):
+        report = import_rows(Person, [
+            {'name': 'Ana', 'alias': 'A', 'sources': 'Report | Article'},
+            {'name': 'Bea', 'alias': 'B', 'sources': 'Report'},
+        ], lang='en')
+
+        self.assertEqual(report.errors, [])
+        self.assertEqual(len(report.created), 2)
+        self.assertEqual(Source.objects.count(), 2)
+
+        ana = PersonName.objects.get(value='Ana')
+        alias = PersonAlias.objects.get(object_ref=ana.object_ref)
+        for row in (ana, alias):
+            self.assertEqual({source.source for source in row.sources.all()},
+                             {'Report', 'Article'})
+
+        # Versions hold the sources without reading them back
+        version = Version.objects.get(
+            content_type=ContentType.objects.get_for_model(PersonAlias),
+            object_id_int=alias.id
+        )
+        fields = json.loads(version.serialized_data)[0]['fields']
+        self.assertEqual(sorted(fields['sources']),
+                         sorted(source.id for source in alias.sources.all()))
+        self.assertEqual(version.revision.version_set.count(), 2)
+
+    def test_invalid_rows_reported(self):
+        report = import_rows(Person, [
+            {'name': 'Ana', 'deathdate': '2001'},
+            {'name': 'Bea', 'deathdate': 'soon'},
+            {'alias': 'C'},
+        ], lang='en')
+
+        self.assertEqual(len(report.created), 1)
+        self.assertEqual([line for line, errors in report.errors], [3, 4])
+        self.assertIn('deathdate', report.errors[0][1])
+        self.assertIn('name', report.errors[1][1])
+
+    def test_batches(self):
+        report = import_rows(Person, [{'name': str(i)} for i in range(5)],
+                             lang='en', batch_size=2)
+
+        self.assertEqual(len(report.created), 5)
+        self.assertEqual(Person.objects.filter(id__in=report.created).count(), 5)
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class RefreshDerivedTest(TestCase):
+
+    def test_tiles_dropped(self):
+        tiles = get_generation('tiles')
+        search = get_generation('search:geosite.Geosite')
+
+        refresh_derived(Geosite, [])
+
+        self.assertNotEqual(get_generation('tiles'), tiles)
+        self.assertNotEqual(get_generation('search:geosite.Geosite'), search)
+
+    def test_untiled_keep_tiles(self):
+        tiles = get_generation('tiles')
+        refresh_derived(Person, [])
+        self.assertEqual(get_generation('tiles'), tiles)
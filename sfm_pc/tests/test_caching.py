@@ -0,0 +1,79 @@
+from django.core.signals import request_finished
+from django.test import TestCase, override_settings
+
+from geosite.models import Geosite
+from person.models import Person, PersonName
+from sfm_pc.caching import (bump_generation, get_generation, invalidate_searches,
+                            search_key)
+from sfm_pc.counts import search_count
+from sfm_pc.signals import entity_updated
+from violation.models import Violation
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class GenerationTest(TestCase):
+
+    def test_search_dependencies(self):
+        key = search_key(Violation, 'count', {})
+
+        invalidate_searches(Geosite)
+        self.assertEqual(search_key(Violation, 'count', {}), key)
+
+        # Perpetrators are searched by the names of people
+        invalidate_searches(Person)
+        self.assertNotEqual(search_key(Violation, 'count', {}), key)
+
+    def test_own_generation(self):
+        key = search_key(Person, 'count', {})
+        invalidate_searches(Person)
+        self.assertNotEqual(search_key(Person, 'count', {}), key)
+
+    def test_bumped_again_after_transaction(self):
+        # Test cases run in a transaction, as the writes of a request
+        before = get_generation('test')
+        bump_generation('test')
+        bumped = get_generation('test')
+        self.assertNotEqual(bumped, before)
+
+        request_finished.send(sender=None)
+        after = get_generation('test')
+        self.assertNotEqual(after, bumped)
+
+        request_finished.send(sender=None)
+        self.assertEqual(get_generation('test'), after)
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM},
+                   SEARCH_COUNT_ESTIMATE_THRESHOLD=None)
+class SearchCountTest(TestCase):
+
+    def person(self, name):
+        person = Person.objects.create()
+        PersonName.objects.create(object_ref=person, value=name, lang='en')
+        return person
+
+    def test_cached_until_update(self):
+        self.person('Ana')
+        self.assertEqual(search_count(Person, {'name': 'an'}), (1, False))
+
+        # Not counted until entity_updated is sent for it
+        bea = self.person('Bea Anaya')
+        self.assertEqual(search_count(Person, {'name': 'an'}), (1, False))
+
+        entity_updated.send(sender=Person, instance=bea)
+        self.assertEqual(search_count(Person, {'name': 'an'}), (2, False))
+
+    def test_terms_cached_apart(self):
+        self.person('Ana')
+        self.person('Bea')
+        self.assertEqual(search_count(Person, {'name': 'ana'}), (1, False))
+        self.assertEqual(search_count(Person, {'name': 'a'}), (2, False))
+
+    @override_settings(SEARCH_COUNT_ESTIMATE_THRESHOLD=0)
+    def test_unfiltered_estimate(self):
+        count, estimated = search_count(Person, {})
+        self.assertTrue(estimated)
+        # Filtered counts stay exact
+        self.assertEqual(search_count(Person, {'name': 'x'}), (0, False))
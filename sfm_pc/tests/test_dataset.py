@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from reversion.models import Version
+
+from person.models import Person, PersonName, PersonSnapshot
+from sfm_pc.management.commands.run_benchmarks import ENDPOINTS
+from sfm_pc.snapshots import snapshot_languages
+from sfm_pc.utils import reserve_ids
+from violation.models import Violation, ViolationSource
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+def generate(**options):
+    call_command('generate_dataset', scale=0.01, stdout=StringIO(), **options)
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class GenerateDatasetTest(TestCase):
+
+    def test_counts(self):
+        generate(seed=1)
+        self.assertEqual(Person.objects.count(), 10)
+        self.assertEqual(Violation.objects.count(), 50)
+        self.assertEqual(ViolationSource.objects.count(), 50)
+
+    def test_snapshots(self):
+        # Rows are bulk inserted: no post_save, the command snapshots them
+        generate(seed=1)
+        for lang in snapshot_languages():
+            snapshots = PersonSnapshot.objects.filter(lang=lang)
+            self.assertEqual(snapshots.count(), 10)
+            self.assertFalse(snapshots.filter(name__isnull=True).exists())
+
+    def test_translations_and_revisions(self):
+        generate(seed=1, translated=1, revisions=1)
+        for lang in snapshot_languages():
+            self.assertEqual(PersonName.objects.filter(lang=lang).count(), 10)
+        self.assertTrue(Version.objects.exists())
+
+    def test_reserve_ids(self):
+        ids = reserve_ids(Person, 3)
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(reserve_ids(Person, 0), [])
+        self.assertGreater(Person.objects.create().id, max(ids))
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class RunBenchmarksTest(TestCase):
+
+    def setUp(self):
+        generate()
+        User.objects.create_user('editor', 'editor@example.com', 'secret')
+        self.directory = tempfile.mkdtemp()
+        self.baseline = os.path.join(self.directory, 'benchmarks.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def benchmark(self, **options):
+        stderr = StringIO()
+        call_command('run_benchmarks', email='editor@example.com', password='secret',
+                     repeat=1, baseline=self.baseline, stdout=StringIO(),
+                     stderr=stderr, **options)
+        return stderr.getvalue()
+
+    def test_save_baseline(self):
+        self.benchmark(save=True)
+
+        with open(self.baseline) as f:
+            timings = json.load(f)
+        for app in ENDPOINTS:
+            self.assertIn(app + '_search:cold', timings)
+            self.assertIn(app + '_search:warm', timings)
+            self.assertIn(app + '_csv:warm', timings)
+
+    def test_regression(self):
+        with open(self.baseline, 'w') as f:
+            json.dump({'person_search:warm': 1e-6}, f)
+
+        with self.assertRaisesRegex(CommandError, 'person_search:warm'):
+            self.benchmark()
+
+    def test_bad_login(self):
+        with self.assertRaises(CommandError):
+            call_command('run_benchmarks', email='editor@example.com',
+                         password='wrong', stdout=StringIO())
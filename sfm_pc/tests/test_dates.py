@@ -0,0 +1,102 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django_date_extensions.fields import ApproximateDate
+
+from person.models import Person, PersonDeathDate
+from sfm_pc.dates import date_conditions, parse_date_term
+from sfm_pc.utils import approximate_bounds, approximate_parts
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+class ApproximateDateTest(SimpleTestCase):
+
+    def test_parts(self):
+        self.assertEqual(approximate_parts('2010-00-00'), (2010, None, None))
+        self.assertEqual(approximate_parts('2010-03-00'), (2010, 3, None))
+        self.assertEqual(approximate_parts(ApproximateDate(2010, 3, 5)), (2010, 3, 5))
+        # A day without a month is not a date
+        self.assertEqual(approximate_parts('2010-00-05'), (2010, None, None))
+        for value in (None, '', 'soon', '0000-00-00'):
+            self.assertEqual(approximate_parts(value), (None, None, None), value)
+
+    def test_bounds(self):
+        self.assertEqual(approximate_bounds('2010-00-00'),
+                         (date(2010, 1, 1), date(2010, 12, 31)))
+        self.assertEqual(approximate_bounds('2012-02-00'),
+                         (date(2012, 2, 1), date(2012, 2, 29)))
+        self.assertEqual(approximate_bounds('2010-03-05'),
+                         (date(2010, 3, 5), date(2010, 3, 5)))
+        for value in (None, '2010-02-30', '2010-13-00'):
+            self.assertEqual(approximate_bounds(value), (None, None), value)
+
+    def test_parse_date_term(self):
+        self.assertEqual(parse_date_term('2010'), (date(2010, 1, 1), date(2010, 12, 31)))
+        self.assertEqual(parse_date_term('2010-3'), (date(2010, 3, 1), date(2010, 3, 31)))
+        self.assertEqual(parse_date_term('2010-03-05'),
+                         (date(2010, 3, 5), date(2010, 3, 5)))
+        for value in ('June', '2010-13', '2010-03-05-01', '2010/03', ''):
+            self.assertIsNone(parse_date_term(value), value)
+
+    def test_date_conditions(self):
+        terms = {'deathdate_year': '2010', 'deathdate_month': 'March',
+                 'deathdate_from': '2009-06', 'deathdate_to': 'later'}
+        self.assertEqual(date_conditions('persondeathdate', terms, 'deathdate'), {
+            'persondeathdate__value_year': 2010,
+            'persondeathdate__value_upper__gte': date(2009, 6, 1),
+        })
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class NormalizedDateTest(TestCase):
+
+    def person(self, value):
+        person = Person.objects.create()
+        PersonDeathDate.objects.create(object_ref=person, value=value)
+        return person
+
+    def columns(self, person):
+        return (PersonDeathDate.objects.filter(object_ref=person)
+                .values_list('value_year', 'value_month', 'value_day',
+                             'value_lower', 'value_upper')
+                .get())
+
+    def test_normalized_on_save(self):
+        person = self.person(ApproximateDate(2010, 3))
+        self.assertEqual(self.columns(person),
+                         (2010, 3, None, date(2010, 3, 1), date(2010, 3, 31)))
+
+        death_date = PersonDeathDate.objects.get(object_ref=person)
+        death_date.value = ApproximateDate(2011)
+        death_date.save()
+        self.assertEqual(self.columns(person),
+                         (2011, None, None, date(2011, 1, 1), date(2011, 12, 31)))
+
+    def test_normalize_dates_command(self):
+        # Rows written around save(), e.g. before the columns existed
+        person = self.person(ApproximateDate(2010, 3, 5))
+        PersonDeathDate.objects.update(value_year=None, value_lower=None)
+
+        call_command('normalize_dates', stdout=StringIO())
+        self.assertEqual(self.columns(person),
+                         (2010, 3, 5, date(2010, 3, 5), date(2010, 3, 5)))
+
+    def test_search(self):
+        year = self.person(ApproximateDate(2010))
+        month = self.person(ApproximateDate(2010, 3))
+        day = self.person(ApproximateDate(2009, 12, 24))
+        self.person(None)
+
+        def search(**terms):
+            return set(Person.search(terms).values_list('id', flat=True))
+
+        self.assertEqual(search(deathdate_year='2010'), {year.id, month.id})
+        self.assertEqual(search(deathdate_year='2010', deathdate_month='3'), {month.id})
+        # Dates which may fall in the range: the whole of 2010 may be June
+        self.assertEqual(search(deathdate_from='2010-06'), {year.id})
+        self.assertEqual(search(deathdate_to='2010-01'), {year.id, day.id})
+        self.assertEqual(search(deathdate_from='2009-12', deathdate_to='2009-12'),
+                         {day.id})
@@ -0,0 +1,60 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from person.models import Person, PersonName
+from sfm_pc.export import csv_rows, iterate_ids, stream_csv
+from sfm_pc.snapshots import refresh_snapshots
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class ExportTest(TestCase):
+
+    def setUp(self):
+        self.people = []
+        for name in ('Ana', 'Bea, "B"', 'Cid', 'Dan', None):
+            person = Person.objects.create()
+            if name is not None:
+                PersonName.objects.create(object_ref=person, value=name, lang='en')
+            self.people.append(person)
+        refresh_snapshots(self.people)
+        self.queryset = Person.objects.order_by('id')
+
+    def test_chunks(self):
+        chunks = list(iterate_ids(self.queryset, chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual([id_ for chunk in chunks for id_ in chunk],
+                         [person.id for person in self.people])
+
+    def test_empty(self):
+        self.assertEqual(list(iterate_ids(Person.objects.none())), [])
+        self.assertEqual(list(csv_rows(Person.objects.none(), ['id'], 'en')), [])
+
+    def test_rows(self):
+        rows = list(csv_rows(self.queryset, ['id', 'name'], 'en', chunk_size=2))
+        self.assertEqual(rows, [
+            '{},Ana\r\n'.format(self.people[0].id),
+            '{},"Bea, ""B"""\r\n'.format(self.people[1].id),
+            '{},Cid\r\n'.format(self.people[2].id),
+            '{},Dan\r\n'.format(self.people[3].id),
+            '{},\r\n'.format(self.people[4].id),
+        ])
+
+    def test_queries_per_chunk(self):
+        # The same queries whatever the number of rows in a chunk
+        with CaptureQueriesContext(connection) as small:
+            list(csv_rows(self.queryset[:1], ['id', 'name'], 'en'))
+        with CaptureQueriesContext(connection) as large:
+            list(csv_rows(self.queryset, ['id', 'name'], 'en'))
+        self.assertEqual(len(large), len(small))
+
+    def test_stream(self):
+        response = stream_csv(self.queryset, 'persons.csv', ['id', 'name'])
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'],
+                         'attachment; filename="persons.csv"')
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertEqual(len(content.splitlines()), 5)
@@ -0,0 +1,57 @@
+from django.test import TestCase, override_settings
+
+from composition.models import (Composition, CompositionChild, CompositionClosure,
+                                CompositionParent)
+from organization.models import Organization
+from sfm_pc.hierarchy import refresh_composition, subtree
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class ClosureCycleTest(TestCase):
+    """
+    A -> B -> C, then C -> A closing a cycle: the last link gets no row
+    until the cycle is broken.
+    """
+
+    def link(self, parent, child):
+        composition = Composition.objects.create()
+        CompositionParent.objects.create(object_ref=composition, value=parent)
+        CompositionChild.objects.create(object_ref=composition, value=child)
+        refresh_composition(composition.id)
+        return composition
+
+    def linked(self, composition):
+        return CompositionClosure.objects.filter(path=[composition.id]).exists()
+
+    def setUp(self):
+        self.a, self.b, self.c, self.d = [Organization.objects.create()
+                                          for i in range(4)]
+        self.ab = self.link(self.a, self.b)
+        self.bc = self.link(self.b, self.c)
+        self.ca = self.link(self.c, self.a)
+
+    def test_cycle_refused(self):
+        self.assertFalse(self.linked(self.ca))
+        self.assertEqual(set(subtree(self.a.id)), {self.b, self.c})
+
+    def test_delete_breaking_cycle(self):
+        self.bc.delete()
+
+        self.assertTrue(self.linked(self.ca))
+        self.assertEqual(set(subtree(self.c.id)), {self.a, self.b})
+
+    def test_update_breaking_cycle(self):
+        CompositionParent.objects.filter(object_ref=self.bc).update(value=self.d)
+        refresh_composition(self.bc.id)
+
+        self.assertTrue(self.linked(self.ca))
+        self.assertEqual(set(subtree(self.d.id)), {self.c, self.a, self.b})
+
+    def test_cycle_kept(self):
+        # C -> A stays refused while A -> B -> C stands
+        refresh_composition(self.ab.id)
+
+        self.assertFalse(self.linked(self.ca))
+        self.assertEqual(CompositionClosure.objects.filter(ancestor=self.c).count(), 0)
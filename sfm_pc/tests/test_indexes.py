@@ -0,0 +1,52 @@
+from django.db import connection
+from django.test import TestCase
+
+from person.models import PersonName
+from sfm_pc.indexes import trigram_index
+
+TRIGRAM_TABLES = [
+    'person_personname', 'person_personalias',
+    'organization_organizationname', 'organization_organizationalias',
+    'area_areaname', 'geosite_geositename',
+]
+
+
+class TrigramIndexTest(TestCase):
+
+    def indexes(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT indexname, indexdef FROM pg_indexes '
+                           'WHERE tablename = %s', [table])
+            return dict(cursor.fetchall())
+
+    def test_extension(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            self.assertIsNotNone(cursor.fetchone())
+
+    def test_migrated(self):
+        for table in TRIGRAM_TABLES:
+            definition = self.indexes(table).get(table + '_value_trgm')
+            self.assertIsNotNone(definition, table)
+            self.assertIn('gin_trgm_ops', definition)
+            self.assertIn('upper', definition.lower())
+
+    def test_icontains_expression(self):
+        # The expression of the index is the one Django filters on
+        sql, params = (PersonName.objects.filter(value__icontains='an')
+                       .query.sql_with_params())
+        self.assertIn('UPPER("person_personname"."value"::text)', sql)
+
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + sql, params)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn('person_personname_value_trgm', plan)
+
+    def test_operation(self):
+        operation = trigram_index('person_personname', 'value')
+        self.assertEqual(operation.sql,
+                         'CREATE INDEX person_personname_value_trgm ON person_personname '
+                         'USING gin (UPPER(value::text) gin_trgm_ops)')
+        self.assertEqual(operation.reverse_sql,
+                         'DROP INDEX IF EXISTS person_personname_value_trgm')
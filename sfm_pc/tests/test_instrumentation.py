@@ -0,0 +1,120 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.urlresolvers import ResolverMatch, reverse
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from sfm_pc.instrumentation import (InstrumentationMiddleware, QueryBudgetExceeded,
+                                    request_stats)
+
+
+def budgeted_view(request):
+    return HttpResponse()
+
+
+def streamed_rows(queries):
+    for i in range(queries):
+        yield '{}\n'.format(User.objects.count())
+
+
+@override_settings(QUERY_INSTRUMENTATION=True)
+class QueryBudgetTest(TestCase):
+
+    def setUp(self):
+        request_stats.reset()
+        self.middleware = InstrumentationMiddleware()
+
+    def run_view(self, queries, response=None):
+        request = RequestFactory().get('/')
+        request.resolver_match = ResolverMatch(budgeted_view, (), {},
+                                               url_name='budgeted')
+        self.middleware.process_request(request)
+        for i in range(queries):
+            User.objects.count()
+        return self.middleware.process_response(request,
+                                                response or budgeted_view(request))
+
+    @override_settings(QUERY_BUDGETS={'budgeted': 2})
+    def test_within_budget(self):
+        self.run_view(2)
+
+        stats, = request_stats.summary()
+        self.assertEqual(stats['view'], 'budgeted')
+        self.assertEqual(stats['requests'], 1)
+        self.assertEqual(stats['max_queries'], 2)
+
+    @override_settings(QUERY_BUDGETS={'budgeted': 2})
+    def test_over_budget_warns(self):
+        with self.assertLogs('sfm_pc.instrumentation', 'WARNING') as logs:
+            response = self.run_view(3)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('budgeted ran 3 queries, its budget is 2', logs.output[0])
+
+    @override_settings(QUERY_BUDGETS={'budgeted': 2}, QUERY_BUDGET_STRICT=True)
+    def test_over_budget_strict(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.run_view(3)
+
+    @override_settings(QUERY_BUDGETS={'budgeted': 2}, QUERY_BUDGET_STRICT=True)
+    def test_streamed_queries_counted(self):
+        response = self.run_view(1, StreamingHttpResponse(streamed_rows(2)))
+        # Nothing is recorded before the content is consumed
+        self.assertEqual(request_stats.summary(), [])
+
+        with self.assertRaises(QueryBudgetExceeded):
+            b''.join(response.streaming_content)
+        self.assertFalse(connection.force_debug_cursor)
+
+    def test_streamed_within_budget(self):
+        response = self.run_view(0, StreamingHttpResponse(streamed_rows(2)))
+        self.assertEqual(b''.join(response.streaming_content), b'0\n0\n')
+
+        stats, = request_stats.summary()
+        self.assertEqual(stats['max_queries'], 2)
+
+    @override_settings(QUERY_INSTRUMENTATION=False, QUERY_BUDGETS={'budgeted': 2},
+                       QUERY_BUDGET_STRICT=True)
+    def test_not_recorded(self):
+        response = self.run_view(3)
+
+        self.assertNotIn('X-Query-Count', response)
+        stats, = request_stats.summary()
+        self.assertEqual(stats['requests'], 1)
+        self.assertIsNone(stats['avg_queries'])
+
+
+class InstrumentationStatsTest(TestCase):
+
+    def setUp(self):
+        request_stats.reset()
+        request_stats.record('budgeted', 4, 2.0, 1.0, 10.0)
+        self.url = reverse('instrumentation')
+
+    def login(self, is_staff):
+        User.objects.create_user('user', 'user@example.com', 'secret',
+                                 is_staff=is_staff)
+        self.client.login(username='user@example.com', password='secret')
+
+    def test_anonymous(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_not_staff(self):
+        self.login(is_staff=False)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_staff(self):
+        self.login(is_staff=True)
+        response = self.client.get(self.url)
+        views = json.loads(response.content.decode('utf-8'))['views']
+        self.assertIn('budgeted', [stats['view'] for stats in views])
+
+    def test_reset(self):
+        self.login(is_staff=True)
+        self.client.post(self.url)
+        self.assertFalse([stats for stats in request_stats.summary()
+                          if stats['view'] == 'budgeted'])
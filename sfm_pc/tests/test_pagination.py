@@ -0,0 +1,163 @@
+import base64
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from person.models import Person, PersonName
+from sfm_pc.pagination import encode_cursor, keyset_page, page_window, paginate
+from sfm_pc.snapshots import refresh_snapshots
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class KeysetPageTest(TestCase):
+
+    def setUp(self):
+        self.people = []
+        for name in ('Eve', 'Ana', None, 'Cid', 'Ana', None, 'Bob'):
+            person = Person.objects.create()
+            if name is not None:
+                PersonName.objects.create(object_ref=person, value=name, lang='en')
+            self.people.append(person)
+        refresh_snapshots(self.people)
+
+    def search(self, direction='ASC', orderby='name'):
+        return Person.search({'orderby': orderby, 'direction': direction})
+
+    def walk(self, queryset, per_page=2):
+        """
+        Every page forwards, then backwards from the last one.
+        """
+        pages, cursor = [], ''
+        while cursor is not None:
+            rows, cursor, previous = keyset_page(queryset, cursor, per_page)
+            pages.append(rows)
+
+        backwards = [rows]
+        while previous is not None:
+            rows, next_cursor, previous = keyset_page(queryset, previous, per_page)
+            backwards.insert(0, rows)
+        return (pages, backwards)
+
+    def test_walk(self):
+        for direction in ('ASC', 'DESC'):
+            queryset = self.search(direction)
+            pages, backwards = self.walk(queryset)
+
+            self.assertEqual([row for page in pages for row in page], list(queryset))
+            self.assertEqual(pages, backwards)
+
+    def test_null_keys(self):
+        # Unnamed people come last ascending and first descending, by id
+        unnamed = [self.people[2], self.people[5]]
+        pages, backwards = self.walk(self.search('ASC'), per_page=3)
+        self.assertEqual([row for page in pages for row in page][-2:], unnamed)
+
+        pages, backwards = self.walk(self.search('DESC'), per_page=1)
+        self.assertEqual([row for page in pages for row in page][:2],
+                         unnamed[::-1])
+
+    def test_equal_keys(self):
+        # Both Anas, split over two pages, by id
+        rows, cursor, previous = keyset_page(self.search(), '', 1)
+        self.assertEqual(rows, [self.people[1]])
+        rows, cursor, previous = keyset_page(self.search(), cursor, 1)
+        self.assertEqual(rows, [self.people[4]])
+
+    def test_bad_cursors(self):
+        first = keyset_page(self.search(orderby='deathdate'), '', 2)
+        for cursor in ('garbage', encode_cursor('sort_deathdate', 'soon', 1, 'next'),
+                       encode_cursor('sort_deathdate', '2015-13-40', 1, 'next'),
+                       encode_cursor('sort_deathdate', [1], 1, 'next'),
+                       encode_cursor('sort_deathdate', {'a': 1}, 1, 'next'),
+                       encode_cursor('sort_name', 'Ana', 1, 'next'),
+                       encode_cursor('sort_deathdate', None, 'x', 'next'),
+                       encode_cursor('sort_deathdate', None, 1, 'sideways'),
+                       base64.urlsafe_b64encode(b'[1]').decode('ascii')):
+            self.assertEqual(keyset_page(self.search(orderby='deathdate'), cursor, 2),
+                             first, cursor)
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class PaginateTest(TestCase):
+
+    def setUp(self):
+        for i in range(5):
+            Person.objects.create()
+        self.queryset = Person.objects.order_by('id')
+
+    def test_page_terms(self):
+        objects, paging = paginate(self.queryset, {'page': '2'}, 5, per_page=2)
+        self.assertEqual(paging['pagination']['page'], 2)
+        self.assertEqual(paging['pagination']['previous'], 1)
+        self.assertEqual(paging['pagination']['next'], 3)
+
+        for page, number in (('abc', 1), ('99', 3)):
+            objects, paging = paginate(self.queryset, {'page': page}, 5, per_page=2)
+            self.assertEqual(paging['pagination']['page'], number)
+        self.assertIsNone(paging['pagination']['next'])
+        self.assertNotIn('paginator', paging)
+
+    def test_cursor_term(self):
+        objects, paging = paginate(self.queryset, {'cursor': ''}, 5, per_page=2)
+        self.assertEqual(len(objects), 2)
+        self.assertIsNone(paging['pagination']['previous_cursor'])
+        self.assertIsNotNone(paging['pagination']['next_cursor'])
+        self.assertNotIn('page', paging['pagination'])
+
+    def test_page_window(self):
+        self.assertEqual(page_window(1, 3), [1, 2, 3])
+        self.assertEqual(page_window(10, 20, window=2), [8, 9, 10, 11, 12])
+        self.assertEqual(page_window(1, 0), [])
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM},
+                   SEARCH_COUNT_ESTIMATE_THRESHOLD=None)
+class SearchPaginationTest(TestCase):
+
+    def setUp(self):
+        self.people = []
+        for i in range(20):
+            person = Person.objects.create()
+            PersonName.objects.create(object_ref=person, value='Ana {:02}'.format(i),
+                                      lang='en')
+            self.people.append(person)
+        refresh_snapshots(self.people)
+
+        User.objects.create_user('editor', 'editor@example.com', 'secret')
+        self.client.login(username='editor@example.com', password='secret')
+
+    def search(self, **terms):
+        response = self.client.get('/en/person/search/', terms)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_pages(self):
+        content = self.search(page='2')
+        self.assertEqual(content['pagination'], {
+            'count': 20, 'per_page': 15, 'page': 2, 'num_pages': 2,
+            'previous': 1, 'next': None, 'pages': [1, 2],
+        })
+        self.assertEqual(len(content['objects']), 5)
+        self.assertNotIn('paginator', content)
+
+        # Malformed page numbers serve the first page
+        self.assertEqual(self.search(page='two')['pagination']['page'], 1)
+
+    def test_paginator_html(self):
+        content = self.search(paginator='html')
+        self.assertIn('data-page-id="2"', content['paginator'])
+
+    def test_cursors(self):
+        content = self.search(cursor='')
+        pagination = content['pagination']
+        self.assertEqual((pagination['count'], pagination['per_page']), (20, 15))
+        self.assertIsNone(pagination['previous_cursor'])
+
+        content = self.search(cursor=pagination['next_cursor'])
+        self.assertEqual([person['name'] for person in content['objects']],
+                         ['Ana {:02}'.format(i) for i in range(15, 20)])
+        self.assertIsNone(content['pagination']['next_cursor'])
+        self.assertIsNotNone(content['pagination']['previous_cursor'])
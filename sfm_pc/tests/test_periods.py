@@ -0,0 +1,189 @@
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django_date_extensions.fields import ApproximateDate
+
+from composition.models import (Composition, CompositionChild, CompositionEndDate,
+                                CompositionParent, CompositionStartDate)
+from emplacement.models import (Emplacement, EmplacementOrganization, EmplacementPeriod,
+                                EmplacementSite, EmplacementStartDate, EmplacementEndDate)
+from geosite.models import Geosite, GeositeName
+from membershipperson.models import (MembershipPeriod, MembershipPerson,
+                                     MembershipPersonFirstCitedDate,
+                                     MembershipPersonLastCitedDate,
+                                     MembershipPersonMember,
+                                     MembershipPersonOrganization, MembershipPersonRole,
+                                     Role)
+from organization.models import Organization, OrganizationName
+from person.models import Person, PersonName
+from sfm_pc.chain import chain_of_command, search_period
+from sfm_pc.hierarchy import refresh_composition
+from sfm_pc.periods import overlapping, refresh_periods
+from sfm_pc.snapshots import refresh_snapshots
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+class PeriodData(object):
+    """
+    Juan commands the Brigade, under the Command from 2000 to 2005, from
+    March 2001 on. The Brigade is stationed at the Base in 2002 and 2003.
+    """
+
+    def named(self, entity_model, name_model, name):
+        entity = entity_model.objects.create()
+        name_model.objects.create(object_ref=entity, value=name, lang='en')
+        return entity
+
+    def membership(self, person, organization, first=None, last=None, role=None):
+        membership = MembershipPerson.objects.create()
+        MembershipPersonMember.objects.create(object_ref=membership, value=person)
+        if organization is not None:
+            MembershipPersonOrganization.objects.create(object_ref=membership,
+                                                        value=organization)
+        if role is not None:
+            MembershipPersonRole.objects.create(object_ref=membership, value=role)
+        if first is not None:
+            MembershipPersonFirstCitedDate.objects.create(object_ref=membership,
+                                                          value=first)
+        if last is not None:
+            MembershipPersonLastCitedDate.objects.create(object_ref=membership,
+                                                         value=last)
+        refresh_periods(MembershipPerson, [membership.id])
+        return membership
+
+    def setUp(self):
+        self.command = self.named(Organization, OrganizationName, 'Command')
+        self.brigade = self.named(Organization, OrganizationName, 'Brigade')
+        self.juan = self.named(Person, PersonName, 'Juan')
+        self.base = self.named(Geosite, GeositeName, 'Base')
+        refresh_snapshots([self.command, self.brigade, self.juan, self.base])
+
+        composition = Composition.objects.create()
+        CompositionParent.objects.create(object_ref=composition, value=self.command)
+        CompositionChild.objects.create(object_ref=composition, value=self.brigade)
+        CompositionStartDate.objects.create(object_ref=composition,
+                                            value=ApproximateDate(2000))
+        CompositionEndDate.objects.create(object_ref=composition,
+                                          value=ApproximateDate(2005))
+        refresh_composition(composition.id)
+
+        self.commander = Role.objects.create(value='Commander')
+        self.membership = self.membership(self.juan, self.brigade,
+                                          first=ApproximateDate(2001, 3),
+                                          role=self.commander)
+
+        emplacement = Emplacement.objects.create()
+        EmplacementOrganization.objects.create(object_ref=emplacement,
+                                               value=self.brigade)
+        EmplacementSite.objects.create(object_ref=emplacement, value=self.base)
+        EmplacementStartDate.objects.create(object_ref=emplacement,
+                                            value=ApproximateDate(2002))
+        EmplacementEndDate.objects.create(object_ref=emplacement,
+                                          value=ApproximateDate(2003))
+        refresh_periods(Emplacement, [emplacement.id])
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class PeriodTest(PeriodData, TestCase):
+
+    def test_refresh_periods(self):
+        # From the first day of the month, open ended
+        period = MembershipPeriod.objects.get(membership=self.membership)
+        self.assertEqual((period.person, period.organization, period.role),
+                         (self.juan, self.brigade, self.commander))
+        self.assertEqual((period.startdate, period.enddate), (date(2001, 3, 1), None))
+
+        period = EmplacementPeriod.objects.get()
+        self.assertEqual((period.startdate, period.enddate),
+                         (date(2002, 1, 1), date(2003, 12, 31)))
+
+    def test_incomplete_and_reversed(self):
+        # No organization: no period
+        membership = self.membership(self.juan, None, first=ApproximateDate(2001))
+        self.assertFalse(MembershipPeriod.objects.filter(membership=membership).exists())
+
+        membership = self.membership(self.juan, self.command,
+                                     first=ApproximateDate(2010),
+                                     last=ApproximateDate(2005))
+        period = MembershipPeriod.objects.get(membership=membership)
+        self.assertEqual((period.startdate, period.enddate),
+                         (date(2005, 12, 31), date(2010, 1, 1)))
+
+    def test_overlapping(self):
+        periods = MembershipPeriod.objects.all()
+        self.assertFalse(overlapping(periods, date(2000, 1, 1), date(2000, 1, 1)))
+        self.assertTrue(overlapping(periods, date(2030, 1, 1), date(2030, 1, 1)))
+        self.assertTrue(overlapping(periods, None, date(2001, 3, 1)))
+        self.assertTrue(overlapping(periods, None, None))
+
+    def test_search_period(self):
+        self.assertEqual(search_period({'date': '2002-02'}),
+                         (date(2002, 2, 1), date(2002, 2, 28)))
+        self.assertEqual(search_period({'start': '2001', 'end': '2002'}),
+                         (date(2001, 1, 1), date(2002, 12, 31)))
+        self.assertEqual(search_period({'end': '2002'}), (None, date(2002, 12, 31)))
+        for terms in ({'date': '2002-13'}, {'start': '2003', 'end': '2002'}):
+            with self.assertRaises(ValueError):
+                search_period(terms)
+
+    def test_chain_of_command(self):
+        units = chain_of_command([self.command.id], date(2002, 6, 1), date(2002, 6, 1))
+        self.assertEqual([(unit['name'], unit['depth'], unit['parent'])
+                          for unit in units],
+                         [('Command', 0, None), ('Brigade', 1, self.command.id)])
+        self.assertEqual(units[1]['members'], [{
+            'id': self.juan.id, 'name': 'Juan', 'role': 'Commander',
+            'start': '2001-03-01', 'end': None,
+        }])
+        self.assertEqual([site['name'] for site in units[1]['sites']], ['Base'])
+
+        # The Brigade left the Command in 2005
+        units = chain_of_command([self.command.id], date(2010, 1, 1), date(2010, 1, 1))
+        self.assertEqual([unit['name'] for unit in units], ['Command'])
+
+        # Other roles left out
+        other = Role.objects.create(value='Member')
+        units = chain_of_command([self.brigade.id], None, None, other.id)
+        self.assertEqual(units[0]['members'], [])
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class CommandChainViewTest(PeriodData, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        User.objects.create_user('editor', 'editor@example.com', 'secret')
+        self.client.login(username='editor@example.com', password='secret')
+
+    def get(self, status=200, **terms):
+        response = self.client.get('/en/command/', terms)
+        self.assertEqual(response.status_code, status)
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_by_organization(self):
+        content = self.get(organization=self.command.id, date='2002')
+        self.assertEqual((content['start'], content['end']), ('2002-01-01', '2002-12-31'))
+        self.assertEqual([unit['id'] for unit in content['units']],
+                         [self.command.id, self.brigade.id])
+
+    def test_by_person(self):
+        content = self.get(person=self.juan.id, start='2002')
+        self.assertEqual([unit['id'] for unit in content['units']], [self.brigade.id])
+        self.assertIsNone(content['end'])
+
+        # Not a member yet
+        content = self.get(person=self.juan.id, date='2000')
+        self.assertEqual(content['units'], [])
+
+    def test_errors(self):
+        content = self.get(400, organization=self.command.id, date='June')
+        self.assertIn('date', content['errors'])
+
+        content = self.get(400, organization='abc')
+        self.assertIn('organization', content['errors'])
+
+        content = self.get(400, date='2002')
+        self.assertIn('organization', content['errors'])
@@ -0,0 +1,107 @@
+import json
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import translation
+
+from geosite.models import Geosite
+from person.models import Person, PersonName
+from sfm_pc.caching import invalidate_searches
+from sfm_pc.results import cached_search, page_terms
+from sfm_pc.signals import entity_updated
+from violation.models import Violation
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class CachedSearchTest(TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+        def view(request):
+            self.calls.append(request.GET.dict())
+            if 'fail' in request.GET:
+                return HttpResponse('{}', status=400)
+            return HttpResponse(json.dumps({'call': len(self.calls)}),
+                                content_type='application/json')
+
+        self.view = cached_search(Person)(view)
+        self.violation_view = cached_search(Violation)(view)
+
+    def get(self, view=None, **terms):
+        response = (view or self.view)(RequestFactory().get('/search/', terms))
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_cached(self):
+        first = self.get(name='ana')
+        # Blank and surrounding spaces do not make another page
+        self.assertEqual(self.get(name=' ana ', alias=''), first)
+        self.assertEqual(len(self.calls), 1)
+
+        self.assertNotEqual(self.get(name='ana', page='2'), first)
+        self.assertNotEqual(self.get(name='ana', orderby='alias'), first)
+        self.assertNotEqual(self.get(name='ana', cursor=''), first)
+        self.assertEqual(len(self.calls), 4)
+
+    def test_language(self):
+        first = self.get(name='ana')
+        with translation.override('fr'):
+            self.assertNotEqual(self.get(name='ana'), first)
+
+    def test_failures_not_cached(self):
+        self.get(fail='1')
+        self.get(fail='1')
+        self.assertEqual(len(self.calls), 2)
+
+    def test_invalidation(self):
+        first = self.get(name='ana')
+        violations = self.get(self.violation_view, perpetrator='ana')
+
+        invalidate_searches(Geosite)
+        self.assertEqual(self.get(name='ana'), first)
+        self.assertEqual(self.get(self.violation_view, perpetrator='ana'), violations)
+
+        # Violations are searched by the names of people
+        invalidate_searches(Person)
+        self.assertNotEqual(self.get(name='ana'), first)
+        self.assertNotEqual(self.get(self.violation_view, perpetrator='ana'), violations)
+
+    def test_page_terms(self):
+        self.assertEqual(page_terms(Person, {'orderby': 'password', 'page': ' 2 '}),
+                         (('name', False), '2', None, False))
+        self.assertEqual(page_terms(Person, {'cursor': '', 'paginator': 'html'}),
+                         (('name', False), '', '', True))
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM},
+                   SEARCH_COUNT_ESTIMATE_THRESHOLD=None)
+class SearchViewCacheTest(TestCase):
+
+    def setUp(self):
+        User.objects.create_user('editor', 'editor@example.com', 'secret')
+        self.client.login(username='editor@example.com', password='secret')
+
+    def person(self, name):
+        person = Person.objects.create()
+        PersonName.objects.create(object_ref=person, value=name, lang='en')
+        entity_updated.send(sender=Person, instance=person)
+        return person
+
+    def search(self):
+        response = self.client.get('/en/person/search/', {'name': 'an'})
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_updated_entities_shown(self):
+        ana = self.person('Ana')
+        self.assertEqual([person['id'] for person in self.search()['objects']],
+                         [ana.id])
+
+        dan = self.person('Dan')
+        content = self.search()
+        self.assertEqual([person['id'] for person in content['objects']],
+                         [ana.id, dan.id])
+        self.assertEqual(content['result_number'], 2)
@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.test import TestCase, override_settings
+
+from geosite.models import Geosite, GeositeCoordinates
+from person.models import Person, PersonAlias, PersonName, PersonSnapshot
+from sfm_pc.counts import search_count
+from sfm_pc.search import Search, Sort, Term
+from sfm_pc.snapshots import refresh_snapshots, snapshot_languages, snapshot_models
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM},
+                   SEARCH_COUNT_ESTIMATE_THRESHOLD=None)
+class SnapshotSearchParityTest(TestCase):
+
+    def person(self, name):
+        person = Person.objects.create()
+        PersonName.objects.create(object_ref=person, value=name,
+                                  lang=settings.LANGUAGE_CODE)
+        return person
+
+    def setUp(self):
+        self.ana = self.person('Ana')
+        self.bea = self.person('Bea')
+        refresh_snapshots([self.ana, self.bea])
+        # Written without entity_updated: only the empty snapshots made
+        # on creation
+        self.cat = self.person('Cat')
+
+    def test_same_entities(self):
+        terms = {'name': 'a'}
+        unsorted = set(Person.search(terms, ordered=False))
+        self.assertEqual(unsorted, {self.ana, self.bea, self.cat})
+        for direction in ('ASC', 'DESC'):
+            terms = {'name': 'a', 'orderby': 'name', 'direction': direction}
+            self.assertEqual(set(Person.search(terms)), unsorted)
+
+        self.assertEqual(search_count(Person, terms), (3, False))
+
+    def test_snapshots_on_create(self):
+        self.assertEqual(
+            set(PersonSnapshot.objects.filter(object_ref=self.cat)
+                .values_list('lang', flat=True)),
+            set(snapshot_languages())
+        )
+
+    def test_not_snapshotted_last(self):
+        terms = {'orderby': 'name', 'direction': 'ASC'}
+        self.assertEqual(list(Person.search(terms)), [self.ana, self.bea, self.cat])
+
+    def test_one_row_per_entity(self):
+        # Snapshots of other languages do not repeat the entities
+        self.assertEqual(Person.search({'orderby': 'name'}).count(), 3)
+
+    def test_no_group_by(self):
+        # A plain join on the snapshot, so pages can stop at their LIMIT
+        sql = str(Person.search({'orderby': 'name', 'direction': 'DESC'}).query)
+        self.assertNotIn('GROUP BY', sql)
+        self.assertIn('sortkey_name', sql)
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class SearchSpecTest(TestCase):
+
+    def setUp(self):
+        self.juan = Person.objects.create()
+        PersonName.objects.create(object_ref=self.juan, value='Juan', lang='en')
+        PersonName.objects.create(object_ref=self.juan, value='Jean', lang='fr')
+        PersonAlias.objects.create(object_ref=self.juan, value='El Jefe', lang='en')
+
+    def ids(self, query):
+        return list(query.values_list('id', flat=True))
+
+    def test_ordering(self):
+        spec = Person.search_spec
+        self.assertEqual(spec.ordering({}), ('name', False))
+        self.assertEqual(spec.ordering({'orderby': 'password'}), ('name', False))
+        self.assertEqual(spec.ordering({'orderby': 'alias', 'order': 'DESC'}),
+                         ('alias', True))
+        self.assertEqual(spec.ordering({'orderby': 'deathdate', 'direction': 'DESC'}),
+                         ('deathdate', True))
+
+    def test_empty_terms_ignored(self):
+        self.assertEqual(Person.search_spec.conditions({'name': '', 'alias': None}), {})
+
+    def test_one_subquery_per_table(self):
+        # Both names match: still one row
+        self.assertEqual(self.ids(Person.search({'name': 'j', 'alias': 'jefe'})),
+                         [self.juan.id])
+        self.assertEqual(Person.search({'name': 'j'}, ordered=False).count(), 1)
+
+        sql = str(Person.search({'name': 'j', 'alias': 'jefe'}, ordered=False).query)
+        self.assertNotIn('DISTINCT', sql)
+        self.assertEqual(sql.count('IN (SELECT'), 2)
+
+    def test_same_row(self):
+        # The conditions on a table hold for the same row of it
+        spec = Search('name', {'name': Sort('name')}, [
+            Term('name', 'personname__value__icontains'),
+            Term('lang', 'personname__lang'),
+        ])
+        self.assertEqual(self.ids(spec.query(Person, {'name': 'juan', 'lang': 'en'})),
+                         [self.juan.id])
+        self.assertEqual(self.ids(spec.query(Person, {'name': 'juan', 'lang': 'fr'})),
+                         [])
+
+    def test_location(self):
+        site = Geosite.objects.create()
+        GeositeCoordinates.objects.create(object_ref=site, value=Point(-99.1, 19.4))
+        Geosite.objects.create()
+
+        terms = {'latitude': '19.5', 'longitude': '-99.1', 'radius': '20'}
+        self.assertEqual(self.ids(Geosite.search(terms)), [site.id])
+        terms['radius'] = '5'
+        self.assertEqual(self.ids(Geosite.search(terms)), [])
+
+        # Malformed coordinates do not filter
+        terms['latitude'] = 'north'
+        self.assertEqual(Geosite.search(terms).count(), 2)
+
+    def test_every_entity(self):
+        # Each declared ordering sorts, with no term and with unknown ones
+        for snapshot_model in snapshot_models():
+            entity_model = snapshot_model._meta.get_field('object_ref').rel.to
+            spec = entity_model.search_spec
+            self.assertIn(spec.default_order, spec.orderings)
+            for name in spec.orderings:
+                for direction in ('ASC', 'DESC'):
+                    list(entity_model.search({'orderby': name, 'direction': direction,
+                                              'unknown': 'x'}))
@@ -0,0 +1,50 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import translation
+
+from membershipperson.models import (MembershipPerson, MembershipPersonMember,
+                                     MembershipPersonSnapshot)
+from person.models import Person, PersonName
+from sfm_pc.snapshots import refresh_snapshots
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class RelatedNamesTest(TestCase):
+
+    def membership(self):
+        person = Person.objects.create()
+        PersonName.objects.create(object_ref=person, value='Juan', lang='en')
+        PersonName.objects.create(object_ref=person, value='Jean', lang='fr')
+        membership = MembershipPerson.objects.create()
+        MembershipPersonMember.objects.create(object_ref=membership, value=person)
+        return membership
+
+    def member(self, membership, lang):
+        return MembershipPersonSnapshot.objects.get(object_ref=membership,
+                                                    lang=lang).member
+
+    def test_names_in_snapshot_language(self):
+        membership = self.membership()
+
+        # Whatever the editor's language
+        with translation.override('fr'):
+            refresh_snapshots([membership])
+
+        self.assertEqual(self.member(membership, 'en'), 'Juan')
+        self.assertEqual(self.member(membership, 'fr'), 'Jean')
+        # No name in Spanish: the oldest one
+        self.assertEqual(self.member(membership, 'es'), 'Juan')
+
+    def test_queries_independent_of_rows(self):
+        membership = self.membership()
+        with CaptureQueriesContext(connection) as one:
+            refresh_snapshots([membership])
+
+        memberships = [self.membership() for i in range(3)]
+        with CaptureQueriesContext(connection) as three:
+            refresh_snapshots(memberships)
+
+        self.assertEqual(len(three), len(one))
@@ -0,0 +1,102 @@
+import json
+
+from django.contrib.auth.models import User
+from django.contrib.gis.geos import Point, Polygon
+from django.test import TestCase, override_settings
+
+from area.models import Area, AreaGeometry
+from geosite.models import Geosite, GeositeCoordinates, GeositeName
+from sfm_pc.signals import entity_updated
+from sfm_pc.spatial import refresh_area_shapes
+from sfm_pc.tiles import area_shapes, clusters, shape_column, tile_bounds
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class TileTest(TestCase):
+
+    def site(self, name, lng, lat):
+        site = Geosite.objects.create()
+        GeositeName.objects.create(object_ref=site, value=name, lang='en')
+        GeositeCoordinates.objects.create(object_ref=site, value=Point(lng, lat))
+        return site
+
+    def setUp(self):
+        self.near = [self.site('Base Norte', 10, 10), self.site('Base Sur', 10.1, 10.1)]
+        self.far = self.site('Camp Rio', -100, -20)
+
+        User.objects.create_user('editor', 'editor@example.com', 'secret')
+        self.client.login(username='editor@example.com', password='secret')
+
+    def tile(self, z=0, x=0, y=0, query=''):
+        response = self.client.get('/en/geosite/tiles/{}/{}/{}/{}'.format(z, x, y, query))
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content.decode('utf-8'))['features']
+
+    def test_bounds(self):
+        west, south, east, north = tile_bounds(0, 0, 0)
+        self.assertEqual((west, east), (-180, 180))
+        self.assertAlmostEqual(north, 85.0511, places=4)
+        self.assertAlmostEqual(south, -85.0511, places=4)
+
+        self.assertEqual(tile_bounds(1, 1, 0)[:3:2], (0, 180))
+        self.assertAlmostEqual(tile_bounds(1, 1, 0)[1], 0)
+
+    def test_clusters(self):
+        features = sorted(clusters(GeositeCoordinates, None, 0, 0, 0),
+                          key=lambda feature: feature['properties']['count'])
+        self.assertEqual([feature['properties'] for feature in features],
+                         [{'count': 1, 'id': self.far.id}, {'count': 2}])
+
+        # Apart when zoomed in
+        features = clusters(GeositeCoordinates, None, 10, 227, 570)
+        self.assertEqual(len(features), 1)
+        self.assertEqual(features[0]['properties'], {'count': 1, 'id': self.far.id})
+
+    def test_filtered(self):
+        features = self.tile(query='?name=camp')
+        self.assertEqual([feature['properties'] for feature in features],
+                         [{'count': 1, 'id': self.far.id}])
+
+    def test_out_of_range(self):
+        response = self.client.get('/en/geosite/tiles/1/2/0/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_cached_until_update(self):
+        self.assertEqual(len(self.tile()), 2)
+
+        site = self.site('Camp Sierra', 100, 20)
+        self.assertEqual(len(self.tile()), 2)
+
+        entity_updated.send(sender=Geosite, instance=site)
+        self.assertEqual(len(self.tile()), 3)
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class AreaShapeTest(TestCase):
+
+    def setUp(self):
+        self.area = Area.objects.create()
+        AreaGeometry.objects.create(object_ref=self.area, lang='en',
+                                    value=Polygon.from_bbox((10, 10, 12, 12)))
+        refresh_area_shapes([self.area.id])
+
+    def test_shape_column(self):
+        self.assertEqual(shape_column(0), 'shape.low')
+        self.assertEqual(shape_column(8), 'shape.medium')
+        self.assertEqual(shape_column(12), 'shape.high')
+        self.assertEqual(shape_column(16), 'geometry.value')
+
+    def test_area_shapes(self):
+        # Simplified when zoomed out, the geometry itself when zoomed in
+        for z, x, y in ((0, 0, 0), (16, 34770, 30753)):
+            features = area_shapes(None, z, x, y)
+            self.assertEqual(len(features), 1)
+            self.assertEqual(features[0]['properties'], {'id': self.area.id})
+            self.assertEqual(features[0]['geometry']['type'], 'Polygon')
+
+        # Not in a tile on the other side of the world
+        self.assertEqual(area_shapes(None, 1, 0, 1), [])
+        self.assertEqual(area_shapes(Area.objects.filter(id=0).values('id'), 0, 0, 0),
+                         [])
@@ -0,0 +1,149 @@
+import json
+import math
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse, Http404
+
+from .caching import make_key
+from .counts import normalize_terms
+from .spatial import SHAPE_LEVELS
+
+MAX_ZOOM = 20
+TILE_SIZE = 256
+# Points closer than this many pixels at the tile's zoom are merged
+CLUSTER_PIXELS = 40
+TILE_TIMEOUT = 60 * 60 * 24
+
+CLUSTERS = """
+    SELECT COUNT(DISTINCT object_ref_id),
+           MIN(object_ref_id),
+           ST_X(ST_Centroid(ST_Collect(value))),
+           ST_Y(ST_Centroid(ST_Collect(value)))
+    FROM {table}
+    WHERE value && ST_MakeEnvelope(%s, %s, %s, %s, 4326)
+    {filter}
+    GROUP BY ST_SnapToGrid(value, %s)
+"""
+
+
+def tile_bounds(z, x, y):
+    """
+    (west, south, east, north) in degrees of tile x, y at zoom z of the
+    usual web map (XYZ) scheme.
+    """
+    n = 2 ** z
+
+    def latitude(y):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+
+    return (x / n * 360 - 180, latitude(y + 1), (x + 1) / n * 360 - 180, latitude(y))
+
+
+def clusters(field_model, object_ids, z, x, y):
+    """
+    GeoJSON features of the points of `field_model` (a point field table)
+    in tile z/x/y, merged on a grid of CLUSTER_PIXELS. `object_ids` is a
+    queryset of the entity ids to include, or None for all of them.
+    """
+    west, south, east, north = tile_bounds(z, x, y)
+    cell = (east - west) / TILE_SIZE * CLUSTER_PIXELS
+
+    params = [west, south, east, north]
+    id_filter = ''
+    if object_ids is not None:
+        sql, id_params = object_ids.query.sql_with_params()
+        id_filter = 'AND object_ref_id IN ({})'.format(sql)
+        params.extend(id_params)
+    params.append(cell)
+
+    with connection.cursor() as cursor:
+        cursor.execute(CLUSTERS.format(table=field_model._meta.db_table,
+                                       filter=id_filter), params)
+        rows = cursor.fetchall()
+
+    features = []
+    for count, first_id, lng, lat in rows:
+        properties = {'count': count}
+        if count == 1:
+            properties['id'] = first_id
+        features.append({
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [lng, lat]},
+            'properties': properties,
+        })
+
+    return features
+
+
+def tile_response(request, entity_model, features, z, x, y):
+    """
+    GeoJSON tile of `features(object_ids, z, x, y)` for the
+    `entity_model.search()` results of the request's search terms. Tiles
+    are cached until the next change to an entity of that kind.
+    """
+    z, x, y = int(z), int(x), int(y)
+    if z > MAX_ZOOM or x >= 2 ** z or y >= 2 ** z:
+        raise Http404
+
+    terms = request.GET.dict()
+    filters = normalize_terms(terms)
+
+    key = make_key('tiles', entity_model.__name__, z, x, y, filters)
+    content = cache.get(key)
+    if content is None:
+        object_ids = None
+        if len(filters):
+            object_ids = entity_model.search(terms, ordered=False).values('id')
+
+        content = json.dumps({
+            'type': 'FeatureCollection',
+            'features': features(object_ids, z, x, y),
+        })
+        cache.set(key, content, TILE_TIMEOUT)
+
+    return HttpResponse(content, content_type='application/json')
+
+
+AREA_SHAPES = """
+    SELECT shape.area_id, ST_AsGeoJSON({column})
+    FROM area_areashape shape
+    JOIN area_areageometry geometry ON geometry.id = shape.geometry_id
+    WHERE shape.bbox && ST_MakeEnvelope(%s, %s, %s, %s, 4326)
+    {filter}
+"""
+
+
+def shape_column(z):
+    for column, tolerance, max_zoom in SHAPE_LEVELS:
+        if z < max_zoom:
+            return 'shape.' + column
+    return 'geometry.value'
+
+
+def area_shapes(object_ids, z, x, y):
+    """
+    GeoJSON features of the areas overlapping tile z/x/y, drawn with the
+    simplified geometry of AreaShape matching the zoom.
+    """
+    params = list(tile_bounds(z, x, y))
+    id_filter = ''
+    if object_ids is not None:
+        sql, id_params = object_ids.query.sql_with_params()
+        id_filter = 'AND shape.area_id IN ({})'.format(sql)
+        params.extend(id_params)
+
+    with connection.cursor() as cursor:
+        cursor.execute(AREA_SHAPES.format(column=shape_column(z),
+                                          filter=id_filter), params)
+        rows = cursor.fetchall()
+
+    return [
+        {
+            'type': 'Feature',
+            'geometry': json.loads(geometry),
+            'properties': {'id': area_id},
+        }
+        for area_id, geometry in rows
+        if geometry is not None
+    ]
@@ -5,6 +5,8 @@ from django.conf.urls.i18n import i18n_patterns
 from django.conf.urls.static import static
 from django.contrib import admin
 from .views import *
+from .instrumentation import instrumentation_stats
+from .chain import command_chain
 from person.views import *
 
 
@@ -24,10 +26,15 @@ urlpatterns = i18n_patterns(
     url(r'^emplacement/', include('emplacement.urls')),
     url(r'^violation/', include('violation.urls')),
 
+    # Units, members and sites at a date
+    url(r'^command/$', command_chain, name='command_chain'),
+
     # Dashboard
     url(r'^$', Dashboard.as_view(), name='dashboard'),
 
     # Admin panel
+    url(r'^admin/instrumentation/$', instrumentation_stats,
+        name='instrumentation'),
     url(r'^admin/', include(admin.site.urls)),
 
     # Ajax calls
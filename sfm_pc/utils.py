@@ -1,7 +1,11 @@
 import re
 import importlib
+from calendar import monthrange
+from datetime import date
 
+from django.apps import apps
 from django.conf import settings
+from django.db import connection
 from django.utils.translation import ugettext as _
 from django.contrib.auth.decorators import login_required
 
@@ -55,17 +59,113 @@ class RequireLoginMiddleware(object):
         return None
 
 
-def class_for_name(class_name, module_name="person.models"):
-    if class_name == "Membershipperson":
-        class_name = "MembershipPerson"
+def allowed_class_name(class_name):
+    """
+    The ALLOWED_CLASS_FOR_NAME spelling of `class_name`, matched whatever
+    its case (the modals send get_object_name(), e.g. Membershipperson),
+    or None when it is not allowed.
+    """
+    names = {name.lower(): name for name in settings.ALLOWED_CLASS_FOR_NAME}
+    return names.get(str(class_name).lower())
 
-    if class_name not in settings.ALLOWED_CLASS_FOR_NAME:
+
+def class_for_name(class_name, module_name="person.models"):
+    class_name = allowed_class_name(class_name)
+    if class_name is None:
         raise Exception("Unallowed class for name")
     module = importlib.import_module(module_name)
     class_ = getattr(module, class_name)
     return class_
 
 
+def entity_for_name(class_name):
+    # Every entity lives in the app named after it (Person in person, ...)
+    allowed = allowed_class_name(class_name)
+    if allowed is None:
+        raise LookupError('Unallowed class for name {}'.format(class_name))
+    return apps.get_model(allowed.lower(), allowed)
+
+
+def field_model_for(model, attr_name):
+    # Complex field models are named after their entity and the container
+    # attribute: Person.name -> PersonName, Violation.geonameid -> ViolationGeonameId
+    return apps.get_model(model._meta.app_label, model.__name__ + attr_name)
+
+
+def field_models(model):
+    """
+    [(attribute name, field model)] of the complex field tables of an
+    entity: the models of its app with a `value` and an `object_ref` to it.
+    """
+    fields = []
+    prefix = model.__name__
+    for field_model in apps.get_app_config(model._meta.app_label).get_models():
+        names = [field.name for field in field_model._meta.get_fields()]
+        if 'value' not in names or 'object_ref' not in names:
+            continue
+        if field_model._meta.get_field('object_ref').rel.to is not model:
+            continue
+        fields.append((field_model.__name__[len(prefix):].lower(), field_model))
+    return fields
+
+
+def reserve_ids(model, count):
+    # bulk_create() does not return primary keys on Django 1.8, so take
+    # them from the table's sequence beforehand
+    if not count:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) "
+            "FROM generate_series(1, %s)",
+            [model._meta.db_table, count]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def approximate_parts(value):
+    """
+    (year, month, day) of an approximate date ('YYYY-MM-DD' with 00 for
+    unknown parts, or an ApproximateDate), None for the unknown parts.
+    (None, None, None) for empty or malformed values.
+    """
+    if not value:
+        return (None, None, None)
+
+    try:
+        if isinstance(value, str):
+            year, month, day = (int(part) for part in value.split('-'))
+        else:
+            year, month, day = value.year, value.month, value.day
+    except (ValueError, TypeError, AttributeError):
+        return (None, None, None)
+
+    if not year:
+        return (None, None, None)
+    return (year, month or None, (month and day) or None)
+
+
+def approximate_bounds(value):
+    """
+    (first day, last day) an approximate date may stand for: '2010-00-00'
+    covers the whole year, '2010-03-00' the whole month. (None, None) for
+    empty or malformed values.
+    """
+    year, month, day = approximate_parts(value)
+    try:
+        if year is None:
+            return (None, None)
+        if month is None:
+            return (date(year, 1, 1), date(year, 12, 31))
+        if day is None:
+            return (date(year, month, 1),
+                    date(year, month, monthrange(year, month)[1]))
+        return (date(year, month, day), date(year, month, day))
+    except ValueError:
+        return (None, None)
+
+
 def deleted_in_str(objects):
     index = 0
     for obj in objects:
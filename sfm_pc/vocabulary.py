@@ -0,0 +1,86 @@
+import threading
+import time
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .caching import get_generation, is_vocabulary
+
+# Seconds during which a worker trusts its copy without looking at the
+# shared 'vocabulary' generation. Edits made in another worker show up
+# after at most this long, edits made in this one immediately.
+CHECK_INTERVAL = 5
+
+
+class VocabularyCache(object):
+    """
+    Rows of the lookup tables (caching.VOCABULARY_MODELS) held in process
+    memory. The copy is dropped when the 'vocabulary' generation, bumped on
+    every save or delete of one of these tables, has moved.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.rows = {}
+        self.indexes = {}
+        self.generation = None
+        self.checked = 0
+
+    def check(self):
+        now = time.time()
+        if now - self.checked < CHECK_INTERVAL:
+            return
+
+        generation = get_generation('vocabulary')
+        with self.lock:
+            if generation != self.generation:
+                self.clear()
+                self.generation = generation
+            self.checked = now
+
+    def all(self, model):
+        self.check()
+        rows = self.rows.get(model)
+        if rows is None:
+            rows = list(model.objects.order_by('id'))
+            with self.lock:
+                self.rows[model] = rows
+        return rows
+
+    def index(self, model, field):
+        self.check()
+        index = self.indexes.get((model, field))
+        if index is None:
+            index = {getattr(row, field): row for row in self.all(model)}
+            with self.lock:
+                self.indexes[(model, field)] = index
+        return index
+
+
+vocabularies = VocabularyCache()
+
+
+def vocabulary(model):
+    """
+    All rows of lookup table `model`, ordered by id. The list is shared,
+    do not modify it.
+    """
+    return vocabularies.all(model)
+
+
+def vocabulary_lookup(model, field, value):
+    """
+    The row of lookup table `model` whose `field` is `value`, or None.
+    """
+    return vocabularies.index(model, field).get(value)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def clear_vocabularies(sender, **kwargs):
+    if is_vocabulary(sender):
+        with vocabularies.lock:
+            vocabularies.clear()
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('source', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='source_hash',
+            field=models.CharField(max_length=32, unique=True, null=True, editable=False),
+        ),
+        # The oldest of identical sources gets the hash, the other ones
+        # stay as they are (and cited) with none
+        migrations.RunSQL(
+            'UPDATE source_source SET source_hash = md5(source) '
+            'WHERE id IN (SELECT min(id) FROM source_source '
+            'WHERE source IS NOT NULL GROUP BY md5(source))',
+            migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+from sfm_pc.indexes import trigram_extension, trigram_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('source', '0002_source_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Citation',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('entity_type', models.CharField(max_length=50)),
+                ('entity_id', models.PositiveIntegerField()),
+                ('field', models.CharField(max_length=50)),
+                ('field_id', models.PositiveIntegerField()),
+                ('source', models.ForeignKey(to='source.Source', related_name='citations', db_index=False)),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='citation',
+            index_together=set([('source', 'entity_type', 'entity_id'), ('entity_type', 'entity_id')]),
+        ),
+        trigram_extension(),
+        trigram_index('source_source', 'source'),
+    ]
@@ -1,29 +1,101 @@
-from django.db import models
+import hashlib
+
+from django.db import connection, models
+
+# Sources whose text is already taken keep their row and are not returned:
+# they were inserted concurrently and are read back afterwards.
+INSERT_SOURCES = """
+    INSERT INTO source_source (source, source_hash) VALUES {rows}
+    ON CONFLICT (source_hash) DO NOTHING
+    RETURNING id, source, source_hash
+"""
+
+
+def source_hash(text):
+    # Same digest as md5() in Postgres, used to fill the existing rows
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
 
 
 class Source(models.Model):
     source = models.TextField()
+    # Unique: a text is stored once. Duplicates predating the column keep
+    # an empty hash, even when saved again, and are never returned for new
+    # citations.
+    source_hash = models.CharField(max_length=32, unique=True, null=True,
+                                   editable=False)
 
     def __str__(self):
         if self.source is None:
             return ""
         return self.source
 
+    def save(self, *args, **kwargs):
+        self.source_hash = None
+        if self.source is not None:
+            hash_ = source_hash(self.source)
+            if not (Source.objects.filter(source_hash=hash_)
+                    .exclude(id=self.id).exists()):
+                self.source_hash = hash_
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def get_or_create_texts(cls, texts):
+        """
+        Return {text: Source} for `texts`, reading the existing sources with
+        one lookup on their hash and inserting the missing ones with one
+        statement, safe against concurrent inserts of the same text.
+        """
+        hashes = {source_hash(text): text for text in set(texts)}
+        if not hashes:
+            return {}
+
+        found = {source.source_hash: source for source in
+                 cls.objects.filter(source_hash__in=list(hashes))}
+
+        missing = [hash_ for hash_ in hashes if hash_ not in found]
+        if missing:
+            params = []
+            for hash_ in missing:
+                params.extend([hashes[hash_], hash_])
+            sql = INSERT_SOURCES.format(rows=', '.join(['(%s, %s)'] * len(missing)))
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                for id_, text, hash_ in cursor.fetchall():
+                    found[hash_] = cls(id=id_, source=text, source_hash=hash_)
+
+            conflicts = [hash_ for hash_ in missing if hash_ not in found]
+            if conflicts:
+                found.update((source.source_hash, source) for source in
+                             cls.objects.filter(source_hash__in=conflicts))
+
+        return {hashes[hash_]: source for hash_, source in found.items()}
+
     @classmethod
     def create_sources(cls, sources):
-        srcs = []
-        for src in sources:
-            try:
-                existing_source = Source.objects.get(source=src['source'])
-                srcs.append(existing_source)
-            except Source.DoesNotExist:
-                new_source = cls(source=src['source'])
-                new_source.save()
-                srcs.append(new_source)
-
-        return srcs
+        texts = [src['source'] for src in sources]
+        found = cls.get_or_create_texts(texts)
+        return [found[text] for text in texts]
 
     @classmethod
     def get_sources(cls, source_ids):
         sources = cls.objects.filter(id__in=source_ids)
         return sources
+
+
+class Citation(models.Model):
+    """
+    A source cited by a field of an entity (`field_id` being the cited
+    row of its field table, or of ViolationSource), maintained by
+    sfm_pc.citations from every sources table.
+    """
+    source = models.ForeignKey(Source, related_name='citations', db_index=False)
+    entity_type = models.CharField(max_length=50)
+    entity_id = models.PositiveIntegerField()
+    field = models.CharField(max_length=50)
+    field_id = models.PositiveIntegerField()
+
+    class Meta:
+        index_together = [
+            ('source', 'entity_type', 'entity_id'),
+            ('entity_type', 'entity_id'),
+        ]
@@ -0,0 +1,117 @@
+import json
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from person.models import Person, PersonName
+from sfm_pc.signals import entity_updated
+from violation.models import Violation, ViolationSource
+from .models import Citation, Source, source_hash
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+class SourceHashTest(TestCase):
+
+    def test_existing_sources_reused(self):
+        existing = Source.objects.create(source='Report')
+
+        found = Source.get_or_create_texts(['Report', 'Article', 'Article'])
+
+        self.assertEqual(found['Report'].id, existing.id)
+        self.assertEqual(found['Article'].source_hash, source_hash('Article'))
+        self.assertEqual(Source.objects.count(), 2)
+
+        again = Source.get_or_create_texts(['Article'])
+        self.assertEqual(again['Article'].id, found['Article'].id)
+        self.assertEqual(Source.objects.count(), 2)
+
+    def test_create_sources_in_order(self):
+        sources = Source.create_sources([{'source': 'B'}, {'source': 'A'},
+                                         {'source': 'B'}])
+        self.assertEqual([source.source for source in sources], ['B', 'A', 'B'])
+        self.assertEqual(sources[0].id, sources[2].id)
+
+    def test_duplicate_keeps_empty_hash(self):
+        # Duplicates predating the hash column are saved again without one
+        original = Source.objects.create(source='Report')
+        duplicate = Source.objects.create(source='Report')
+        self.assertIsNone(duplicate.source_hash)
+
+        duplicate.save()
+        self.assertIsNone(Source.objects.get(id=duplicate.id).source_hash)
+        self.assertEqual(Source.get_or_create_texts(['Report'])['Report'].id,
+                         original.id)
+
+    def test_hash_freed_by_edit(self):
+        original = Source.objects.create(source='Report')
+        duplicate = Source.objects.create(source='Report')
+
+        original.source = 'Corrected report'
+        original.save()
+        duplicate.save()
+
+        self.assertEqual(Source.objects.get(id=duplicate.id).source_hash,
+                         source_hash('Report'))
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class CitationTest(TestCase):
+
+    def setUp(self):
+        self.report = Source.objects.create(source='Report')
+        self.article = Source.objects.create(source='Article')
+
+        self.person = Person.objects.create()
+        self.name = PersonName.objects.create(object_ref=self.person, value='Juan',
+                                              lang='en')
+        self.name.sources.add(self.report, self.article)
+        entity_updated.send(sender=Person, instance=self.person)
+
+        self.violation = Violation.objects.create()
+        self.cited = ViolationSource.objects.create(violation=self.violation,
+                                                    source=self.report)
+        entity_updated.send(sender=Violation, instance=self.violation)
+
+    def citations(self, source):
+        return [
+            (citation['entity'], citation['id'], citation['field'],
+             citation['field_id'])
+            for citation in json.loads(self.client.get(
+                '/en/source/{}/citations/'.format(source.id)
+            ).content.decode('utf-8'))['citations']
+        ]
+
+    def test_citations_of_source(self):
+        User.objects.create_user('editor', 'editor@example.com', 'secret')
+        self.client.login(username='editor@example.com', password='secret')
+
+        self.assertEqual(self.citations(self.report), [
+            ('Person', self.person.id, 'name', self.name.id),
+            ('Violation', self.violation.id, 'source', self.cited.id),
+        ])
+        self.assertEqual(self.citations(self.article),
+                         [('Person', self.person.id, 'name', self.name.id)])
+
+    def test_refreshed_on_update(self):
+        self.name.sources.remove(self.report)
+        entity_updated.send(sender=Person, instance=self.person)
+        self.assertFalse(Citation.objects.filter(source=self.report,
+                                                 entity_type='Person').exists())
+        self.assertTrue(Citation.objects.filter(source=self.article).exists())
+
+    def test_deleted_with_entity(self):
+        self.person.delete()
+        self.assertEqual(list(Citation.objects.values_list('entity_type', flat=True)),
+                         ['Violation'])
+
+        self.report.delete()
+        self.assertFalse(Citation.objects.exists())
+
+    def test_rebuild_citations(self):
+        Citation.objects.all().delete()
+        call_command('rebuild_citations', stdout=StringIO())
+        self.assertEqual(Citation.objects.filter(source=self.report).count(), 2)
+        self.assertEqual(Citation.objects.filter(source=self.article).count(), 1)
@@ -1,9 +1,12 @@
 from django.conf.urls import patterns, url
 
-from source.views import get_sources
+from source.views import get_sources, source_citations
 
 urlpatterns = patterns(
     '',
+    url(r'^(?P<source_id>[0-9]+)/citations/$',
+        source_citations,
+        name="source_citations"),
     url(r'(?P<object_type>[a-zA-Z]+)/' +
         '(?P<object_id>[0-9]+)/' +
         '(?P<field_name>[a-zA-Z0-9]+)/',
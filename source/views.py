@@ -3,6 +3,7 @@ import json
 from django.http import HttpResponse
 
 from complex_fields.models import ComplexFieldContainer
+from sfm_pc.citations import citations_of
 
 
 def get_sources(request, object_type, object_id, field_name):
@@ -22,3 +23,22 @@ def get_sources(request, object_type, object_id, field_name):
     }
 
     return HttpResponse(json.dumps(sources_json))
+
+
+def source_citations(request, source_id):
+    """
+    JSON list of the entity fields citing a source.
+    """
+    citations = [
+        {
+            "entity": entity_type,
+            "id": entity_id,
+            "field": field,
+            "field_id": field_id,
+        }
+        for entity_type, entity_id, field, field_id in citations_of(source_id)
+    ]
+
+    return HttpResponse(json.dumps({"source": int(source_id),
+                                    "citations": citations}),
+                        content_type="application/json")
@@ -53,7 +53,7 @@ var moduleController = (function(){
                 window.location = $(this).find('a').attr('href');
             });
 
-            $("#paginator-content").html(data.paginator);
+            $("#paginator-content").html(this.renderPaginator(data.pagination));
             this.bindPaginator();
             $("#result-number").html(data.result_number);
         }
@@ -163,6 +163,29 @@ var moduleController = (function(){
         });
     }
 
+    /**
+     * @param {object} pagination
+     * @return {string}
+     * Links to the previous, next and neighbouring pages
+     */
+    this.renderPaginator = function(pagination){
+        html = "<ul class='pagination'>";
+        if(pagination && pagination.num_pages > 1){
+            if(pagination.previous){
+                html += "<li><a data-page-id='" + pagination.previous + "'>&laquo;</a></li>";
+            }
+            $.each(pagination.pages, function(index, page){
+                active = page == pagination.page ? " class='active'" : "";
+                html += "<li" + active + "><a data-page-id='" + page + "'>" + page + "</a></li>";
+            });
+            if(pagination.next){
+                html += "<li><a data-page-id='" + pagination.next + "'>&raquo;</a></li>";
+            }
+        }
+        html += "</ul>";
+        return html;
+    }
+
     /*
      *
      */
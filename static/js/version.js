@@ -4,6 +4,8 @@ var version = (function(){
     verObjArr:[],
     fieldStrArr : [],
     modelArr : [],
+    pageUrls : {},
+    nextPages : {},
     init:function(){
       this.cacheDom();
       this.bindEvents();
@@ -13,6 +15,8 @@ var version = (function(){
       this.verObjArr = [];
       this.fieldStrArr = [];
       this.modelArr = [];
+      this.pageUrls = {};
+      this.nextPages = {};
       var self = this;
       $('.modalBox.version').each(function(){
         var versions = $(this).data('remote').replace('/modal', "");
@@ -40,10 +44,8 @@ var version = (function(){
           dataType: "json",
           // success callback function
           success: function (response) {
-            for (var i in response) {
-              if(patt.test(versions) && typeof response[i] !== 'function'){ //test if path contains versions
-                this.verObjArr[index1][index2][this.verObjArr[index1][index2].length] = response[i];
-              }
+            if(patt.test(versions)){ //test if path contains versions
+              this.addVersions(model, fieldStr, versions, response);
             }
           },
           error: function (request, status, error) {
@@ -59,6 +61,7 @@ var version = (function(){
       this.$el_modal.on('shown.bs.modal', this.dynamicAssignments.bind(this));
       this.$el_modal.on('change', '.--ver-lang', this.changeLanguage.bind(this));
       this.$el_modal.on('click', '.ver_rev', this.revertVersion.bind(this));
+      this.$el_modal.on('click', '.ver_more', this.loadOlder.bind(this));
     },
     render:function(){
       this.$versionList.find('li').empty();//delete old list
@@ -74,6 +77,39 @@ var version = (function(){
 
         this.$versionList.append(this.$rowTemplate);  //append the row to the list
       }
+      //only offer older versions when the history has another page
+      var key = this.dataModId + '/' + this.fieldStr;
+      this.$el_modal.find('.ver_more').toggleClass('hide', !this.nextPages[key]);
+    },
+    addVersions:function(model, fieldStr, url, response){
+      //append a page of versions and remember where the next one is
+      var key = model + '/' + fieldStr;
+      for (var i in response.versions) {
+        this.verObjArr[model][fieldStr].push(response.versions[i]);
+      }
+      this.pageUrls[key] = url;
+      this.nextPages[key] = response.pagination.next;
+    },
+    loadOlder:function(event){
+      event.preventDefault();
+      var key = this.dataModId + '/' + this.fieldStr;
+      if (!this.nextPages[key]){
+        return;
+      }
+      $.ajax({
+        type: "GET",
+        context:this,
+        url: this.pageUrls[key],
+        data: {page: this.nextPages[key]},
+        dataType: "json",
+        success: function (response, status) {
+          this.addVersions(this.dataModId, this.fieldStr, this.pageUrls[key], response);
+          this.render();
+        },
+        error: function (request, status, error) {
+          console.log(error);
+        }
+      });
     },
     dynamicAssignments:function(event){
       this.$modalHeader = this.$el_modal.find('.modal-header');
@@ -134,18 +170,15 @@ var version = (function(){
     changeLanguage:function(){
       var self = this;
       var getURL = window.location;
+      var url = "/" + window.LANG + "/version/" + this.dataModId + "/" + this.$mdObjId + "/" + this.$mdFieldName + "/" + this.$verLanguage.val() + "/";
       this.verObjArr[index1][index2] = [];
       $.ajax({
     		type: "GET",
         context:this,
-    		url:  "/" + window.LANG + "/version/" + this.dataModId + "/" + this.$mdObjId + "/" + this.$mdFieldName + "/" + this.$verLanguage.val() + "/",
+    		url: url,
     		dataType: "json",
     		success: function (response, status) {
-          for (var i in response) {
-            if(typeof response[i] !== 'function'){ //test if path contains versions
-              this.verObjArr[index1][index2][this.verObjArr[index1][index2].length] = response[i];
-            }
-          }
+          this.addVersions(index1, index2, url, response);
           this.render();
     			// separateObjects(response, "version");
     		},
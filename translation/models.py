@@ -1,11 +1,12 @@
 from django.utils.translation import get_language
 from languages_plus.models import Language
 
+from sfm_pc.vocabulary import vocabulary_lookup
+
 
 def get_language_from_iso(iso):
-    try:
-        lang = Language.objects.get(iso_639_1=iso)
-    except Language.DoesNotExist:
+    lang = vocabulary_lookup(Language, 'iso_639_1', iso)
+    if lang is None:
         return "Unknown"
 
     if iso == get_language():
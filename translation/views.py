@@ -1,15 +1,21 @@
 import json
 
 from django.core.exceptions import ValidationError
-from django.http import HttpResponse, HttpResponseServerError
-from django.db.models import Q
+from django.http import HttpResponse, HttpResponseServerError, Http404
 
 from languages_plus.models import Language
 
 from complex_fields.models import ComplexFieldContainer
+from sfm_pc.signals import entity_updated
+from sfm_pc.utils import entity_for_name
+from sfm_pc.autocomplete import autocomplete, containing, ranked
 
 
 def translate(request, object_type, object_id, field_name):
+    try:
+        entity_model = entity_for_name(object_type)
+    except LookupError:
+        raise Http404
 
     field = ComplexFieldContainer.field_from_str_and_id(
         object_type, object_id, field_name
@@ -19,6 +25,8 @@ def translate(request, object_type, object_id, field_name):
         data = json.loads(request.POST.dict()['translation'])
         try:
             field.translate(data['value'], data['lang'])
+            entity = entity_model.objects.get(pk=object_id)
+            entity_updated.send(sender=type(entity), instance=entity)
             return HttpResponse(status=200)
         except ValidationError as error:
             return HttpResponseServerError(str(error))
@@ -31,20 +39,18 @@ def translate(request, object_type, object_id, field_name):
 
 
 def autocomplete_language(request):
-    data = request.GET.dict()['term']
-
-    langs = Language.objects.filter(
-        Q(name_en__icontains=data) |
-        Q(name_native__icontains=data) |
-        Q(name_other__icontains=data) |
-        Q(iso_639_1__icontains=data)
-    )
-    languages = [
-        {
-            "label": lang.name_en + ", " + lang.name_native,
-            "value": lang.iso_639_1
-        }
-        for lang in langs.all()
-    ]
-
-    return HttpResponse(json.dumps(languages))
+    def complete(term, limit):
+        langs = containing(
+            Language.objects.all(),
+            ['name_en', 'name_native', 'name_other', 'iso_639_1'],
+            term
+        )
+        return [
+            {
+                "label": lang.name_en + ", " + lang.name_native,
+                "value": lang.iso_639_1
+            }
+            for lang in ranked(langs, 'name_en', term, limit)
+        ]
+
+    return autocomplete(request, 'language', complete, 'vocabulary')
@@ -0,0 +1,197 @@
+import json
+
+import reversion
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.urlresolvers import reverse
+from django.test import TestCase, override_settings
+from reversion.models import Revision, Version
+
+from membershipperson.models import MembershipPerson
+from person.models import Person, PersonName
+from sfm_pc.history import HISTORY_PER_PAGE, FieldHistory
+from sfm_pc.utils import entity_for_name
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+
+def login(client):
+    # Every page but the login ones requires it (LOGIN_REQUIRED_URLS)
+    User.objects.create_user('editor', 'editor@example.com', 'secret')
+    client.login(username='editor@example.com', password='secret')
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class BatchRevertTest(TestCase):
+
+    def person(self, *names):
+        """
+        A person and the versions of its name, one revision per value.
+        """
+        person = Person.objects.create()
+        row = PersonName(object_ref=person, lang=settings.LANGUAGE_CODE)
+        for name in names:
+            with reversion.create_revision():
+                row.value = name
+                row.save()
+
+        versions = (Version.objects
+                    .filter(content_type=ContentType.objects.get_for_model(PersonName),
+                            object_id_int=row.id)
+                    .order_by('id'))
+        return (person, row, [version.id for version in versions])
+
+    def setUp(self):
+        login(self.client)
+        self.ana, self.ana_name, self.ana_versions = self.person('Ana', 'Anna')
+        self.bea, self.bea_name, self.bea_versions = self.person('Bea', 'Beatrice')
+        self.url = reverse('batch_revert')
+
+    def post(self, items):
+        return self.client.post(self.url, {'revert': json.dumps(items)})
+
+    def name(self, row):
+        return PersonName.objects.get(id=row.id).value
+
+    def test_revert(self):
+        revisions = Revision.objects.count()
+
+        response = self.post([
+            {'object_type': 'Person', 'object_id': self.ana.id,
+             'versions': [self.ana_versions[0]]},
+            {'object_type': 'Person', 'object_id': str(self.bea.id),
+             'versions': [str(self.bea_versions[0])]},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content.decode('utf-8'))['reverted'], 2)
+        self.assertEqual(self.name(self.ana_name), 'Ana')
+        self.assertEqual(self.name(self.bea_name), 'Bea')
+        self.assertEqual(Revision.objects.count(), revisions + 1)
+
+    def test_invalid_item_reverts_nothing(self):
+        revisions = Revision.objects.count()
+
+        response = self.post([
+            {'object_type': 'Person', 'object_id': self.ana.id,
+             'versions': [self.ana_versions[0]]},
+            # A version of another person
+            {'object_type': 'Person', 'object_id': self.bea.id,
+             'versions': [self.ana_versions[0]]},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        errors = json.loads(response.content.decode('utf-8'))['errors']
+        self.assertEqual(list(errors), ['1'])
+        self.assertEqual(self.name(self.ana_name), 'Anna')
+        self.assertEqual(Revision.objects.count(), revisions)
+
+    def test_unknown_entity(self):
+        response = self.post([{'object_type': 'User', 'object_id': 1,
+                               'versions': [self.ana_versions[0]]}])
+        self.assertEqual(response.status_code, 400)
+
+    def test_malformed(self):
+        item = {'object_type': 'Person', 'object_id': self.ana.id}
+        version = self.ana_versions[0]
+        for items in (5, 'abc', item, [1], [dict(item, versions=str(version))],
+                      [dict(item, object_id=True, versions=[version])]):
+            response = self.post(items)
+            self.assertEqual(response.status_code, 400, items)
+
+        self.assertEqual(self.client.post(self.url, {'revert': '['}).status_code, 400)
+        self.assertEqual(self.name(self.ana_name), 'Anna')
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class EntityNameTest(TestCase):
+
+    def setUp(self):
+        login(self.client)
+
+    def test_entity_for_name(self):
+        self.assertIs(entity_for_name('Person'), Person)
+        # As the modals send it
+        self.assertIs(entity_for_name('Membershipperson'), MembershipPerson)
+        self.assertIs(entity_for_name('MembershipPerson'), MembershipPerson)
+        for name in ('User', 'Source', 42):
+            with self.assertRaises(LookupError):
+                entity_for_name(name)
+
+    def test_membership_versions(self):
+        membership = MembershipPerson.objects.create()
+        response = self.client.get(reverse('get_versions', args=[
+            'Membershipperson', membership.id, 'title'
+        ]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content.decode('utf-8'))['versions'], [])
+
+    def test_unknown_entity_at(self):
+        response = self.client.get(reverse('entity_at', args=['User', 1]),
+                                   {'at': '2015-01-01'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_unknown_versions(self):
+        response = self.client.get(reverse('get_versions', args=['User', 1, 'name']))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CACHES={'default': LOCMEM, 'search': LOCMEM})
+class FieldHistoryTest(TestCase):
+
+    def setUp(self):
+        login(self.client)
+        self.person = Person.objects.create()
+        self.row = PersonName(object_ref=self.person, lang='en')
+        self.french = PersonName(object_ref=self.person, lang='fr')
+        for i in range(HISTORY_PER_PAGE + 5):
+            self.save(self.row, 'Name {}'.format(i))
+        self.save(self.french, 'Nom')
+
+    def save(self, row, value):
+        with reversion.create_revision():
+            row.value = value
+            row.save()
+
+    def values(self, page):
+        return [version['value'] for version in page['versions']]
+
+    def test_pages(self):
+        history = FieldHistory('Person', self.person.id, 'name', lang='en')
+        first = history.page(1)
+        self.assertEqual(self.values(first)[:2], ['Name 24', 'Name 23'])
+        self.assertEqual(len(first['versions']), HISTORY_PER_PAGE)
+        self.assertEqual(first['pagination']['count'], HISTORY_PER_PAGE + 5)
+        self.assertEqual(first['pagination']['next'], 2)
+
+        last = history.page(2)
+        self.assertEqual(self.values(last)[-1], 'Name 0')
+        self.assertIsNone(last['pagination']['next'])
+
+        self.assertEqual(history.page('x')['pagination']['page'], 1)
+        self.assertEqual(history.page(99)['pagination']['page'], 2)
+
+    def test_language(self):
+        history = FieldHistory('Person', self.person.id, 'name', lang='fr')
+        self.assertEqual(self.values(history.page(1)), ['Nom'])
+        self.assertEqual([lang['value'] for lang in history.langs()], ['en', 'fr'])
+
+    def test_cached_until_new_version(self):
+        history = FieldHistory('Person', self.person.id, 'name', lang='en')
+        history.page(1)
+        # Only the latest version id is looked up
+        with self.assertNumQueries(1):
+            history.page(1)
+
+        self.save(self.row, 'Renamed')
+        self.assertEqual(self.values(history.page(1))[0], 'Renamed')
+
+    def test_view(self):
+        response = self.client.get(reverse('get_versions_lang', args=[
+            'Person', self.person.id, 'name', 'en'
+        ]), {'page': '2'})
+        content = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(len(content['versions']), 5)
+        self.assertEqual(content['pagination']['page'], 2)
+        self.assertEqual(content['pagination']['previous'], 1)
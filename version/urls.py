@@ -1,9 +1,14 @@
 from django.conf.urls import patterns, url
 
-from version.views import get_versions, revert_field
+from version.views import (batch_revert, get_entity_at, get_versions,
+                           revert_field)
 
 urlpatterns = patterns(
     '',
+    url(r'^revert/$', batch_revert, name="batch_revert"),
+    url(r'^at/(?P<object_type>[a-zA-Z]+)/(?P<object_id>[0-9]+)/$',
+        get_entity_at,
+        name="entity_at"),
     url(r'revert/' +
         '(?P<object_type>[a-zA-Z]+)/' +
         '(?P<object_id>[0-9]+)/' +
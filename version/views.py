@@ -1,25 +1,36 @@
 import json
 
-from django.http import HttpResponse
-from django.utils.translation import get_language
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse, Http404
 
 from complex_fields.models import ComplexFieldContainer
+from sfm_pc.history import (FieldHistory, entity_at, field_versions, parse_moment,
+                            revert_versions, versions_at)
+from sfm_pc.signals import entity_updated
+from sfm_pc.utils import entity_for_name
 
 
 def get_versions(request, object_type, object_id, field_name, field_id=None,
-                 lang=get_language()):
-    field = ComplexFieldContainer.field_from_str_and_id(
-        object_type, object_id, field_name, field_id
-    )
-    if field.translated:
-        versions = field.get_history_for_lang(lang)
-    else:
-        versions = field.get_history()
+                 lang=None):
+    """
+    JSON page (`page` term) of the versions of a field, newest first, in
+    `lang` (the current language by default) for translated fields.
+    """
+    try:
+        history = FieldHistory(object_type, object_id, field_name, field_id, lang)
+    except LookupError:
+        raise Http404
 
-    return HttpResponse(json.dumps(versions))
+    return HttpResponse(json.dumps(history.page(request.GET.get('page', 1))),
+                        content_type="application/json")
 
 
 def revert_field(request, object_type, object_id, field_name):
+    try:
+        entity_model = entity_for_name(object_type)
+    except LookupError:
+        raise Http404
+
     field = ComplexFieldContainer.field_from_str_and_id(
         object_type, object_id, field_name
     )
@@ -27,4 +38,100 @@ def revert_field(request, object_type, object_id, field_name):
     data = json.loads(request.POST.dict()['revert'])
     field.revert_field(data['lang'], data['id'])
 
+    entity = entity_model.objects.get(pk=object_id)
+    entity_updated.send(sender=type(entity), instance=entity)
+
     return HttpResponse(status=200)
+
+
+def _json(data, status=200):
+    return HttpResponse(json.dumps(data), status=status,
+                        content_type="application/json")
+
+
+def get_entity_at(request, object_type, object_id):
+    """
+    JSON fields (values, translations and sources) of an entity as they
+    stood at the `at` term (ISO date or date and time).
+    """
+    try:
+        entity_model = entity_for_name(object_type)
+    except LookupError:
+        raise Http404
+
+    try:
+        moment = parse_moment(request.GET.get('at', ''))
+    except ValueError:
+        return _json({"success": False,
+                      "errors": {"at": "Expected YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"}},
+                     status=400)
+
+    return _json({
+        "success": True,
+        "entity": object_type,
+        "id": int(object_id),
+        "at": moment.isoformat(),
+        "fields": entity_at(entity_model, int(object_id), moment),
+    })
+
+
+def _id(value):
+    # Ids are JSON integers, or strings of digits as forms send them
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise TypeError(value)
+    if not str(value).isdigit():
+        raise ValueError(value)
+    return int(value)
+
+
+def batch_revert(request):
+    """
+    Revert many fields of many entities in one transaction and one
+    revision. `revert` is a JSON list of {"object_type", "object_id"} with
+    either "versions" (version ids of their fields) or "at" (restoring
+    every field as it stood then).
+    """
+    try:
+        items = json.loads(request.POST.dict()['revert'])
+    except (KeyError, ValueError):
+        return _json({"success": False, "errors": {"revert": "Expected a JSON list"}},
+                     status=400)
+
+    if not (isinstance(items, list) and
+            all(isinstance(item, dict) for item in items)):
+        return _json({"success": False,
+                      "errors": {"revert": "Expected a JSON list of objects"}},
+                     status=400)
+
+    versions, entities, errors = [], [], {}
+    for index, item in enumerate(items):
+        try:
+            entity_model = entity_for_name(item['object_type'])
+            object_id = _id(item['object_id'])
+            entity = entity_model.objects.get(pk=object_id)
+            if 'at' in item:
+                found = [version for attr_name, field_model, version
+                         in versions_at(entity_model, object_id, parse_moment(item['at']))]
+            else:
+                if not isinstance(item['versions'], list):
+                    raise TypeError(item['versions'])
+                wanted = [_id(id_) for id_ in item['versions']]
+                found = field_versions(entity_model, object_id, wanted)
+                if len(found) != len(set(wanted)):
+                    errors[index] = "Some versions are not of this entity"
+                    continue
+        except (KeyError, TypeError, ValueError, LookupError,
+                ObjectDoesNotExist):
+            errors[index] = "Invalid entity, versions or date"
+            continue
+        versions.extend(found)
+        entities.append(entity)
+
+    if errors:
+        return _json({"success": False, "errors": errors}, status=400)
+
+    revert_versions(versions)
+    for entity in entities:
+        entity_updated.send(sender=type(entity), instance=entity)
+
+    return _json({"success": True, "reverted": len(versions)})
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('violation', '0002_auto_20151102_2237'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViolationSnapshot',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('lang', models.CharField(max_length=5)),
+                ('startdate', models.TextField(blank=True, null=True, default=None)),
+                ('enddate', models.TextField(blank=True, null=True, default=None)),
+                ('locationdescription', models.TextField(blank=True, null=True, default=None)),
+                ('adminlevel1', models.TextField(blank=True, null=True, default=None)),
+                ('adminlevel2', models.TextField(blank=True, null=True, default=None)),
+                ('geoname', models.TextField(blank=True, null=True, default=None)),
+                ('geonameid', models.TextField(blank=True, null=True, default=None)),
+                ('location', models.TextField(blank=True, null=True, default=None)),
+                ('description', models.TextField(blank=True, null=True, default=None)),
+                ('perpetrator', models.TextField(blank=True, null=True, default=None)),
+                ('perpetratororganization', models.TextField(blank=True, null=True, default=None)),
+                ('object_ref', models.ForeignKey(to='violation.Violation', related_name='snapshots')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='violationsnapshot',
+            unique_together=set([('object_ref', 'lang')]),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from sfm_pc.indexes import trigram_extension, trigram_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('violation', '0003_violationsnapshot'),
+    ]
+
+    operations = [
+        trigram_extension(),
+        trigram_index('violation_violationlocationdescription'),
+        trigram_index('violation_violationadminlevel1'),
+        trigram_index('violation_violationadminlevel2'),
+        trigram_index('violation_violationgeoname'),
+        trigram_index('violation_violationdescription'),
+        trigram_index('violation_violationperpetrator'),
+        trigram_index('violation_violationperpetratororganization'),
+    ]
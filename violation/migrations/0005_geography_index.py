@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from sfm_pc.indexes import geography_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('violation', '0004_trigram_indexes'),
+    ]
+
+    operations = [
+        geography_index('violation_violationlocation'),
+    ]
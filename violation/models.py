@@ -1,13 +1,16 @@
 from django.contrib.gis.db import models
 from django.utils.translation import ugettext as _
-from django.db.models import Max
-from django.contrib.gis import geos
 
 from django_date_extensions.fields import ApproximateDateField
 
 from complex_fields.model_decorators import translated
 from complex_fields.models import ComplexField, ComplexFieldContainer, ComplexFieldListContainer
 from complex_fields.base_models import BaseModel
+from sfm_pc.managers import ComplexFieldQuerySet
+from sfm_pc.dates import NormalizedDate
+from sfm_pc.search import Search, SearchMixin, Dates, Location, Sort, Term
+from sfm_pc.snapshots import Snapshot, SnapshotMixin
+from sfm_pc.spatial import near
 from source.models import Source
 
 CONFIDENCE_LEVELS = (
@@ -17,7 +20,34 @@ CONFIDENCE_LEVELS = (
 )
 
 
-class Violation(models.Model, BaseModel):
+class Violation(SearchMixin, SnapshotMixin, models.Model, BaseModel):
+    objects = ComplexFieldQuerySet.as_manager()
+
+    search_spec = Search(
+        default_order='startdate',
+        orderings={
+            'startdate': Sort('startdate'),
+            'enddate': Sort('enddate'),
+        },
+        filters=[
+            Dates('startdate', 'violationstartdate'),
+            Dates('enddate', 'violationenddate'),
+            Term('adminlevel1', 'violationadminlevel1__value__icontains'),
+            Term('adminlevel2', 'violationadminlevel2__value__icontains'),
+            Term('locationdescription',
+                 'violationlocationdescription__value__icontains'),
+            Location(lambda location: near(ViolationLocation, location)),
+            Term('geoname', 'violationgeoname__value__icontains'),
+            Term('geonameid', 'violationgeonameid__value'),
+            Term('source', 'violationsource__source__source__icontains'),
+            Term('v_type', 'violationtype__value__code__icontains'),
+            Term('description', 'violationdescription__value__icontains'),
+            Term('perpetrator', 'violationperpetrator__value__icontains'),
+            Term('perpetratororganization',
+                 'violationperpetratororganization__value__icontains'),
+        ]
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.startdate = ComplexFieldContainer(self, ViolationStartDate)
@@ -64,155 +94,14 @@ class Violation(models.Model, BaseModel):
 
         return (errors, values)
 
-    @classmethod
-    def search(cls, terms):
-        order_by = terms.get('orderby')
-        if not order_by:
-            order_by = 'violationstartdate__value'
-        elif order_by in ['startdate']:
-            order_by = 'violation' + order_by + '__value'
-
-        direction = terms.get('direction')
-        if not direction:
-            direction = 'ASC'
-
-        dirsym = ''
-        if direction == 'DESC':
-            dirsym = '-'
-
-        violation_query = (Violation.objects
-                           .annotate(Max(order_by))
-                           .order_by(dirsym + order_by + "__max"))
-
-        startdate_year = terms.get('startdate_year')
-        if startdate_year:
-            violation_query = violation_query.filter(
-                violationstartdate__value__startswith=startdate_year
-            )
-
-        startdate_month = terms.get('startdate_month')
-        if startdate_month:
-            violation_query = violation_query.filter(
-                violationstartdate__value__contains="-" + startdate_month + "-"
-            )
-
-        startdate_day = terms.get('startdate_day')
-        if startdate_day:
-            violation_query = violation_query.filter(
-                violationstartdate__value__endswith=startdate_day
-            )
-
-        enddate_year = terms.get('enddate_year')
-        if enddate_year:
-            violation_query = violation_query.filter(
-                violationenddate__value__startswith=enddate_year
-            )
-
-        enddate_month = terms.get('enddate_month')
-        if enddate_month:
-            violation_query = violation_query.filter(
-                violationenddate__value__contains="-" + enddate_month + "-"
-            )
-
-        enddate_day = terms.get('enddate_day')
-        if enddate_day:
-            violation_query = violation_query.filter(
-                violationenddate__value__endswith=enddate_day
-            )
-
-        admin1 = terms.get('adminlevel1')
-        if admin1:
-            violation_query = violation_query.filter(
-                violationadminlevel1__value__icontains=admin1
-            )
-
-        admin2 = terms.get('adminlevel2')
-        if admin2:
-            violation_query = violation_query.filter(
-                violationadminlevel2__value__icontains=admin2
-            )
-
-        loc_desc = terms.get('locationdescription')
-        if loc_desc:
-            violation_query = violation_query.filter(
-                violationlocationdescription__value__icontains=loc_desc
-            )
 
-        latitude = terms.get('latitude')
-        longitude = terms.get('longitude')
-        if latitude and longitude:
-            try:
-                latitude = float(latitude)
-                longitude = float(longitude)
-            except ValueError:
-                latitude = 0
-                longitude = 0
-
-            point = geos.Point(latitude, longitude)
-            radius = terms.get('radius')
-            if radius:
-                try:
-                    radius = float(radius)
-                except ValueError:
-                    radius = 0
-                violation_query = violation_query.filter(
-                    violationlocation__value__dwithin=(point, radius)
-                )
-            else:
-                violation_query = violation_query.filter(
-                    violationlocation__value__bbcontains=point
-                )
-
-        geoname = terms.get('geoname')
-        if geoname:
-            violation_query = violation_query.filter(
-                violationgeoname__value__icontains=geoname
-            )
-
-        geonameid = terms.get('geonameid')
-        if geonameid:
-            violation_query = violation_query.filter(violationgeonameid__value=geonameid)
-
-        source = terms.get('source')
-        if source:
-            violation_query = violation_query.filter(
-                violationsource__source__source__icontains=source
-            )
-
-        v_type = terms.get('v_type')
-        if v_type:
-            violation_query = violation_query.filter(
-                violationtype__value__code__icontains=v_type
-            )
-
-        viol_descr = terms.get('description')
-        if viol_descr:
-            violation_query = violation_query.filter(
-                violationdescription__value__icontains=viol_descr
-            )
-
-        perpetrator = terms.get('perpetrator')
-        if perpetrator:
-            violation_query = violation_query.filter(
-                violationperpetrator__value__icontains=perpetrator
-            )
-
-        perpetratororganization = terms.get('perpetratororganization')
-        if perpetratororganization:
-            violation_query = violation_query.filter(
-                violationperpetratororganization__value__icontains=perpetratororganization
-            )
-
-        return violation_query
-
-
-class ViolationStartDate(models.Model):
+class ViolationStartDate(NormalizedDate):
     object_ref = models.ForeignKey('Violation')
     value = ApproximateDateField(default=None, blank=True, null=True)
     field_name = _("Start date")
 
 
-class ViolationEndDate(models.Model):
+class ViolationEndDate(NormalizedDate):
     object_ref = models.ForeignKey('Violation')
     value = ApproximateDateField(default=None, blank=True, null=True)
     field_name = _("End date")
@@ -285,3 +174,28 @@ class ViolationType(models.Model):
 
 class Type(models.Model):
     code = models.TextField()
+
+
+class ViolationSnapshot(Snapshot):
+    object_ref = models.ForeignKey('Violation', related_name='snapshots')
+    startdate = models.TextField(default=None, blank=True, null=True)
+    enddate = models.TextField(default=None, blank=True, null=True)
+    locationdescription = models.TextField(default=None, blank=True, null=True)
+    adminlevel1 = models.TextField(default=None, blank=True, null=True)
+    adminlevel2 = models.TextField(default=None, blank=True, null=True)
+    geoname = models.TextField(default=None, blank=True, null=True)
+    geonameid = models.TextField(default=None, blank=True, null=True)
+    location = models.TextField(default=None, blank=True, null=True)
+    description = models.TextField(default=None, blank=True, null=True)
+    perpetrator = models.TextField(default=None, blank=True, null=True)
+    perpetratororganization = models.TextField(default=None, blank=True, null=True)
+
+    sortkey_startdate = models.DateField(null=True)
+    sortkey_enddate = models.DateField(null=True)
+
+    class Meta:
+        unique_together = ('object_ref', 'lang')
+        index_together = [
+            ('lang', 'sortkey_startdate', 'object_ref'),
+            ('lang', 'sortkey_enddate', 'object_ref'),
+        ]
@@ -1,13 +1,15 @@
 from django.conf.urls import patterns, url
 
 from .views import (ViolationCreate, ViolationUpdate, ViolationView, violation_search,
-                    violation_csv, ViolationDelete)
+                    violation_csv, violation_tiles, ViolationDelete)
 
 urlpatterns = patterns(
     '',
     url(r'add/$', ViolationCreate.as_view(), name='add_violation'),
     url(r'search/', violation_search, name='violation_search'),
     url(r'csv/', violation_csv, name='violation_csv'),
+    url(r'tiles/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)/$', violation_tiles,
+        name='violation_tiles'),
     url(r'delete/(?P<pk>\d+)/$',
         ViolationDelete.as_view(success_url="/violation/"),
         name='delete_violation'),
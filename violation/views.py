@@ -1,19 +1,23 @@
 import json
-import csv
 from datetime import date
 
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.contrib.admin.util import NestedObjects
 from django.views.generic.edit import DeleteView
 from django.views.generic.base import TemplateView
-from django.template.loader import render_to_string
 from django.http import HttpResponse
 from django.db import DEFAULT_DB_ALIAS
 
-from .models import Violation, Type
+from .models import Violation, ViolationLocation, Type
 from source.models import Source
 from .forms import ZoneForm
 from sfm_pc.utils import deleted_in_str
+from sfm_pc.snapshots import get_snapshots
+from sfm_pc.export import stream_csv
+from sfm_pc.counts import search_count
+from sfm_pc.results import cached_search
+from sfm_pc.pagination import paginate
+from sfm_pc.vocabulary import vocabulary
+from sfm_pc.tiles import tile_response, clusters
 
 
 class ViolationDelete(DeleteView):
@@ -47,76 +51,59 @@ class ViolationView(TemplateView):
 
 
 def violation_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="violations.csv"'
-
     terms = request.GET.dict()
     violation_query = Violation.search(terms)
 
-    writer = csv.writer(response)
-    for violation in violation_query:
-        writer.writerow([
-            violation.id,
-            violation.description.get_value(),
-            repr(violation.startdate.get_value()),
-            repr(violation.enddate.get_value()),
-            violation.locationdescription.get_value(),
-            violation.adminlevel1.get_value(),
-            violation.adminlevel2.get_value(),
-            violation.geoname.get_value(),
-            violation.geonameid.get_value(),
-            violation.location.get_value(),
-            violation.perpetrator.get_value(),
-            violation.perpetratororganization.get_value(),
-        ])
-
-    return response
+    return stream_csv(violation_query, 'violations.csv', [
+        'id', 'description', 'startdate', 'enddate', 'locationdescription',
+        'adminlevel1', 'adminlevel2', 'geoname', 'geonameid', 'location',
+        'perpetrator', 'perpetratororganization'
+    ])
+
+
+def violation_tiles(request, z, x, y):
+    def features(object_ids, z, x, y):
+        return clusters(ViolationLocation, object_ids, z, x, y)
+
+    return tile_response(request, Violation, features, z, x, y)
 
 
+@cached_search(Violation)
 def violation_search(request):
     terms = request.GET.dict()
 
-    page = int(terms.get('page', 1))
     violation_query = Violation.search(terms)
 
     keys = ['startdate', 'enddate', 'geoname', 'perpetrator', 'organization']
 
-    paginator = Paginator(violation_query, 15)
-    try:
-        violation_page = paginator.page(page)
-    except PageNotAnInteger:
-        violation_page = paginator.page(1)
-        page = 1
-    except EmptyPage:
-        violation_page = paginator.page(paginator.num_pages)
-        page = paginator.num_pages
-
-    violations = [
-        {
+    result_number, estimated = search_count(Violation, terms)
+
+    violation_page, paging = paginate(violation_query, terms, result_number)
+
+    snapshots = get_snapshots(violation_page)
+
+    violations = []
+    for violation in violation_page:
+        snapshot = snapshots[violation.id].as_dict()
+        violations.append({
             "id": violation.id,
-            "startdate": str(violation.startdate.get_value().value),
-            "enddate": str(violation.enddate.get_value().value),
-            "geoname": str(violation.geoname.get_value().value),
-            "perpetrator": str(violation.perpetrator.get_value().value),
-            "organization": str(violation.perpetratororganization.get_value().value),
-        }
-        for violation in violation_page
-    ]
-
-    html_paginator = render_to_string(
-        'paginator.html',
-        {'actual': page, 'min': page - 5, 'max': page + 5,
-         'paginator': violation_page,
-         'pages': range(1, paginator.num_pages + 1)}
-    )
-
-    return HttpResponse(json.dumps({
+            "startdate": snapshot['startdate'],
+            "enddate": snapshot['enddate'],
+            "geoname": snapshot['geoname'],
+            "perpetrator": snapshot['perpetrator'],
+            "organization": snapshot['perpetratororganization'],
+        })
+
+    response = {
         'success': True,
         'keys': keys,
         'objects': violations,
-        'paginator': html_paginator,
-        'result_number': len(violation_query)
-    }))
+        'result_number': result_number,
+        'result_number_estimated': estimated,
+    }
+    response.update(paging)
+
+    return HttpResponse(json.dumps(response))
 
 
 class ViolationUpdate(TemplateView):
@@ -176,7 +163,7 @@ class ViolationCreate(TemplateView):
     def get_context_data(self, **kwargs):
         context = super(ViolationCreate, self).get_context_data(**kwargs)
         context['violation'] = Violation()
-        context['violationtypes'] = Type.objects.all()
+        context['violationtypes'] = vocabulary(Type)
         context['sources'] = Source.objects.all()
         context['point'] = ZoneForm()
 